@@ -1,14 +1,48 @@
 from __future__ import annotations
 
+import functools
+import inspect
 import logging
+import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Optional, Sequence
+from datetime import date
+from typing import Any, Callable, Iterable, Mapping, Optional, Sequence
 
+from credit_spread_system.cache import MarketDataCache, SingleFlight, cache_kind
+from credit_spread_system.circuit_breaker import (
+    BreakerState,
+    CircuitBreaker,
+    CircuitOpenError,
+    NegativeCache,
+    is_outage_error,
+)
 from credit_spread_system.config import load_config
+from credit_spread_system.history_store import PriceHistoryStore, normalize_bars, sessions_since
+from credit_spread_system.metrics import ClientMetrics, shared_metrics
+from credit_spread_system.option_chain import (  # noqa: F401
+    ChainSnapshotIndex,
+    OptionChain,
+    OptionContract,
+    StrikeWindow,
+)
+from credit_spread_system.rate_limit import RateLimiter, shared_rate_limiter
+from credit_spread_system.shared_cache import SharedMarketDataCache
 
 logger = logging.getLogger(__name__)
 
+MAX_QUOTE_BATCH = 100
+CHAIN_FETCH_THRESHOLD = 4
+MAX_CHAIN_WINDOWS = 8
+MAX_HISTORY_BATCH = 100
+DEFAULT_CACHE_TTL_SECONDS = 60.0
+
+
+class UnsupportedMethodError(AttributeError):
+    pass
+
 
 @dataclass(frozen=True)
 class Quote:
@@ -19,15 +53,41 @@ class Quote:
 
 
 @dataclass(frozen=True)
-class OptionContract:
+class OptionLeg:
     symbol: str
     expiration: str
     strike: float
-    option_type: str
-    bid: Optional[float]
-    ask: Optional[float]
-    last: Optional[float]
-    open_interest: Optional[int]
+    option_type: str = "put"
+
+    @property
+    def cache_key(self) -> str:
+        return f"option:{self.symbol}:{self.expiration}:{self.strike}:{self.option_type}"
+
+    @property
+    def occ_symbol(self) -> str:
+        expiry = self.expiration.replace("-", "")[2:]
+        right = "C" if self.option_type.lower().startswith("c") else "P"
+        return f"{self.symbol}{expiry}{right}{int(round(self.strike * 1000)):08d}"
+
+
+def _timed(method: Callable[..., Any]) -> Callable[..., Any]:
+    name = method.__name__.lstrip("_")
+
+    @functools.wraps(method)
+    def wrapper(self: "AlpacaClient", *args: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            result = method(self, *args)
+        except CircuitOpenError:
+            self._metrics.record_rejected(name)
+            raise
+        except Exception:
+            self._metrics.record_call(name, time.perf_counter() - start, error=True)
+            raise
+        self._metrics.record_call(name, time.perf_counter() - start)
+        return result
+
+    return wrapper
 
 
 class AlpacaClient:
@@ -35,18 +95,90 @@ class AlpacaClient:
         self,
         options_client: Any | None,
         market_client: Any | None,
-        cache_ttl_seconds: int = 60,
+        cache_ttl_seconds: Optional[float] = None,
+        cache_ttls: Mapping[str, float] | None = None,
+        cache: MarketDataCache | SharedMarketDataCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        history_store: PriceHistoryStore | None = None,
+        stale_while_revalidate_seconds: float = 0.0,
+        refresh_workers: int = 4,
+        chain_workers: int = 4,
+        chain_quote_max_age_seconds: float = 30.0,
+        chain_fetch_threshold: int = CHAIN_FETCH_THRESHOLD,
+        breaker_failure_threshold: int = 5,
+        breaker_reset_seconds: float = 30.0,
+        negative_ttl_seconds: float = 10.0,
+        metrics: ClientMetrics | None = None,
+        metrics_path: str | None = None,
     ) -> None:
         self._options_client = options_client
         self._market_client = market_client
-        self._cache_ttl_seconds = cache_ttl_seconds
-        self._quote_cache: dict[str, tuple[float, Any]] = {}
+        default_ttl, ttl_by_kind = _cache_ttls(cache_ttl_seconds, cache_ttls)
+        self._cache_ttl_seconds = default_ttl
+        self._quote_cache = (
+            cache
+            if cache is not None
+            else MarketDataCache(default_ttl_seconds=default_ttl, ttl_by_kind=ttl_by_kind)
+        )
+        self._metrics = metrics if metrics is not None else ClientMetrics()
+        self._metrics_path = metrics_path
+        self._quote_cache.subscribe(
+            on_expire=self._record_expiration, on_evict=self._forget_stale
+        )
+        self._single_flight = SingleFlight()
+        self._rate_limiter = rate_limiter
+        self._history_store = history_store
+        self._stream_timestamps: dict[str, Any] = {}
+        self._stream_lock = threading.Lock()
+        self._chain_index = ChainSnapshotIndex(
+            max_age_seconds=self._quote_cache.ttl_for("chain:")
+        )
+        self._chain_quote_max_age_seconds = chain_quote_max_age_seconds
+        self._chain_fetch_threshold = chain_fetch_threshold
+        self._stale_while_revalidate_seconds = stale_while_revalidate_seconds
+        if stale_while_revalidate_seconds > 0:
+            self._quote_cache.stale_grace_seconds = max(
+                self._quote_cache.stale_grace_seconds, stale_while_revalidate_seconds
+            )
+        self._refresh_workers = refresh_workers
+        self._refresh_pool: ThreadPoolExecutor | None = None
+        self._chain_workers = chain_workers
+        self._chain_pool: ThreadPoolExecutor | None = None
+        self._chain_windows: dict[tuple[str, str, str], list[StrikeWindow]] = {}
+        self._chain_windows_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing: set[str] = set()
+        self._stale_keys: set[str] = set()
+        self._breaker_failure_threshold = breaker_failure_threshold
+        self._breaker_reset_seconds = breaker_reset_seconds
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._breaker_lock = threading.Lock()
+        self._negative_cache = NegativeCache(ttl_seconds=negative_ttl_seconds)
 
     @classmethod
-    def from_env(cls, cache_ttl_seconds: int = 60) -> "AlpacaClient":
+    def from_env(
+        cls,
+        cache_ttl_seconds: Optional[float] = None,
+        cache_ttls: Mapping[str, float] | None = None,
+        sweep_interval_seconds: float = 60.0,
+        stale_while_revalidate_seconds: Optional[float] = None,
+    ) -> "AlpacaClient":
         config = load_config()
         options_client = None
         market_client = None
+        history_store = None
+        cache = None
+
+        if config.market_data_dir:
+            history_store = PriceHistoryStore(
+                os.path.join(config.market_data_dir, "price_history.sqlite3")
+            )
+            default_ttl, ttl_by_kind = _cache_ttls(cache_ttl_seconds, cache_ttls)
+            cache = SharedMarketDataCache(
+                os.path.join(config.market_data_dir, "market_cache.sqlite3"),
+                default_ttl_seconds=default_ttl,
+                ttl_by_kind=ttl_by_kind,
+            )
 
         try:
             from alpaca.data.historical import (  # type: ignore
@@ -65,33 +197,125 @@ class AlpacaClient:
         except Exception as exc:  # noqa: BLE001
             logger.warning("Failed to initialize Alpaca clients: %s", exc)
 
-        return cls(options_client=options_client, market_client=market_client, cache_ttl_seconds=cache_ttl_seconds)
+        client = cls(
+            options_client=options_client,
+            market_client=market_client,
+            cache_ttl_seconds=cache_ttl_seconds,
+            cache_ttls=cache_ttls,
+            cache=cache,
+            rate_limiter=shared_rate_limiter(),
+            history_store=history_store,
+            stale_while_revalidate_seconds=(
+                stale_while_revalidate_seconds
+                if stale_while_revalidate_seconds is not None
+                else config.stale_while_revalidate_seconds
+            ),
+            metrics=shared_metrics(),
+            metrics_path=(
+                os.path.join(config.market_data_dir, "alpaca_metrics.prom")
+                if config.market_data_dir
+                else None
+            ),
+        )
+        client._quote_cache.start_sweeper(sweep_interval_seconds)
+        return client
 
     def get_option_quote(
         self, symbol: str, expiration: str, strike: float, option_type: str
     ) -> Optional[Quote]:
-        cache_key = f"option:{symbol}:{expiration}:{strike}:{option_type}"
-        cached = self._get_cache(cache_key)
+        leg = OptionLeg(symbol, expiration, strike, option_type)
+        load = self._option_quote_loader(leg)
+        cached = self._get_cache(leg.cache_key, refresh=load)
         if cached is not None:
             return cached
 
+        snapshot_quote = self._quote_from_snapshot(leg)
+        if snapshot_quote is not None:
+            return snapshot_quote
+
         if not self._options_client:
             logger.warning("Option client unavailable; cannot fetch option quote")
             return None
 
-        try:
-            raw = self._fetch_option_quote(symbol, expiration, strike, option_type)
-            quote = _normalize_quote(raw)
-            if quote:
-                self._set_cache(cache_key, quote)
-            return quote
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("Failed to fetch option quote: %s", exc)
-            return None
+        return self._load_or_none(leg.cache_key, load, "option quote")
+
+    def get_option_quotes(self, legs: Iterable[OptionLeg]) -> dict[OptionLeg, Optional[Quote]]:
+        results: dict[OptionLeg, Optional[Quote]] = {}
+        missing: list[OptionLeg] = []
+        stale: list[OptionLeg] = []
+        # Batch-only providers have no per-leg loader, so stale legs are refreshed
+        # together with one batch call instead.
+        per_leg = self._supports_single_quotes()
+        for leg in legs:
+            if leg in results:
+                continue
+            if per_leg:
+                cached = self._get_cache(leg.cache_key, refresh=self._option_quote_loader(leg))
+            else:
+                found = self._cache_lookup(leg.cache_key, serve_stale=True)
+                cached = None if found is None else found[0]
+                if found is not None and found[1]:
+                    stale.append(leg)
+            if cached is None:
+                cached = self._quote_from_snapshot(leg)
+            results[leg] = cached
+            if cached is None and not self._recently_failed(leg.cache_key):
+                missing.append(leg)
+
+        if stale and self._supports_batch_quotes():
+            self._schedule_quote_batch_refresh(stale)
+
+        if not missing:
+            return results
+
+        if not self._options_client:
+            logger.warning("Option client unavailable; cannot fetch option quotes")
+            return results
+
+        if self._supports_chain_fetch():
+            missing = self._quote_from_chains(missing, results)
+            if not missing:
+                return results
+
+        if not self._supports_batch_quotes():
+            # The cache and chain snapshots were already checked above.
+            for leg in missing:
+                results[leg] = self._load_or_none(
+                    leg.cache_key, self._option_quote_loader(leg), "option quote"
+                )
+            return results
+
+        results.update(self._load_quote_batches(missing))
+        return results
+
+    def _load_quote_batches(self, legs: Sequence[OptionLeg]) -> dict[OptionLeg, Optional[Quote]]:
+        results: dict[OptionLeg, Optional[Quote]] = {}
+        for start in range(0, len(legs), MAX_QUOTE_BATCH):
+            batch = legs[start : start + MAX_QUOTE_BATCH]
+            try:
+                aligned = _align_batch(self._fetch_option_quotes(batch), batch)
+            except CircuitOpenError as exc:
+                logger.debug("Skipping option quotes fetch: %s", exc)
+                break
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Failed to fetch option quotes: %s", exc)
+                for leg in batch:
+                    self._negative_cache.add(leg.cache_key, str(exc))
+                continue
+            for leg, raw_quote in zip(batch, aligned):
+                quote = _normalize_quote(raw_quote)
+                if quote:
+                    self._set_cache(leg.cache_key, quote)
+                results[leg] = quote
+        return results
 
     def get_underlying_price(self, symbol: str) -> Optional[float]:
         cache_key = f"underlying:{symbol}"
-        cached = self._get_cache(cache_key)
+
+        def load() -> Optional[float]:
+            return _extract_price(self._fetch_underlying_price(symbol))
+
+        cached = self._get_cache(cache_key, refresh=load)
         if cached is not None:
             return cached
 
@@ -99,19 +323,15 @@ class AlpacaClient:
             logger.warning("Market client unavailable; cannot fetch underlying price")
             return None
 
-        try:
-            raw = self._fetch_underlying_price(symbol)
-            price = _extract_price(raw)
-            if price is not None:
-                self._set_cache(cache_key, price)
-            return price
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("Failed to fetch underlying price: %s", exc)
-            return None
+        return self._load_or_none(cache_key, load, "underlying price")
 
     def get_price_history(self, symbol: str, days: int = 260) -> Optional[Sequence[dict[str, Any]]]:
         cache_key = f"history:{symbol}:{days}"
-        cached = self._get_cache(cache_key)
+
+        def load() -> Any:
+            return self._load_price_history(symbol, days)
+
+        cached = self._get_cache(cache_key, refresh=load)
         if cached is not None:
             return cached
 
@@ -119,54 +339,594 @@ class AlpacaClient:
             logger.warning("Market client unavailable; cannot fetch price history")
             return None
 
-        try:
-            raw = self._fetch_price_history(symbol, days)
-            if raw is not None:
-                self._set_cache(cache_key, raw)
-            return raw
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("Failed to fetch price history: %s", exc)
-            return None
+        return self._load_or_none(cache_key, load, "price history")
+
+    def get_price_histories(
+        self, symbols: Iterable[str], days: int = 260
+    ) -> dict[str, Optional[Sequence[dict[str, Any]]]]:
+        results: dict[str, Optional[Sequence[dict[str, Any]]]] = {}
+        missing: list[str] = []
+        for symbol in dict.fromkeys(symbols):
+            cache_key = f"history:{symbol}:{days}"
+            results[symbol] = self._get_cache(cache_key)
+            if results[symbol] is None and not self._recently_failed(cache_key):
+                missing.append(symbol)
+
+        if not missing:
+            return results
+
+        if not self._market_client:
+            logger.warning("Market client unavailable; cannot fetch price histories")
+            return results
+
+        if not hasattr(self._market_client, "get_price_histories"):
+            for symbol in missing:
+                results[symbol] = self.get_price_history(symbol, days)
+            return results
+
+        # Symbols with stored bars only need their tail; batch them by tail length.
+        by_length: dict[int, list[str]] = {}
+        for symbol in missing:
+            by_length.setdefault(self._history_fetch_days(symbol, days), []).append(symbol)
+
+        for fetch_days, group in by_length.items():
+            for start in range(0, len(group), MAX_HISTORY_BATCH):
+                batch = group[start : start + MAX_HISTORY_BATCH]
+                try:
+                    raw = self._fetch_price_histories(batch, fetch_days)
+                except CircuitOpenError as exc:
+                    logger.debug("Skipping price histories fetch: %s", exc)
+                    return results
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("Failed to fetch price histories: %s", exc)
+                    for symbol in batch:
+                        self._negative_cache.add(f"history:{symbol}:{days}", str(exc))
+                    continue
+                for symbol in batch:
+                    bars = (raw or {}).get(symbol)
+                    history = self._store_history(symbol, days, bars) if bars else None
+                    if history is not None:
+                        self._set_cache(f"history:{symbol}:{days}", history)
+                    results[symbol] = history
+        return results
 
     def get_option_chain(
         self,
         symbol: str,
         expiration: str,
         option_type: str = "put",
-    ) -> Optional[list[OptionContract]]:
-        cache_key = f"chain:{symbol}:{expiration}:{option_type}"
-        cached = self._get_cache(cache_key)
+        strikes: Optional[StrikeWindow] = None,
+        band_pct: Optional[float] = None,
+    ) -> Optional[OptionChain]:
+        window = self._strike_window(symbol, strikes, band_pct)
+        cache_key = _chain_key(symbol, expiration, option_type, window)
+        load = self._option_chain_loader(symbol, expiration, option_type, window)
+        cached = self._get_cache(cache_key, refresh=load)
+        if cached is None and window is not None:
+            cached = self._covering_chain(symbol, expiration, option_type, window)
         if cached is not None:
-            return cached
+            return self._served_chain(symbol, expiration, option_type, cached)
 
         if not self._options_client:
             logger.warning("Option client unavailable; cannot fetch option chain")
             return None
 
+        return self._load_or_none(cache_key, load, "option chain")
+
+    def get_option_chains(
+        self,
+        symbol: str,
+        expirations: Iterable[str],
+        option_type: str = "put",
+        strikes: Optional[StrikeWindow] = None,
+        band_pct: Optional[float] = None,
+    ) -> dict[str, Optional[OptionChain]]:
+        window = self._strike_window(symbol, strikes, band_pct)
+        results: dict[str, Optional[OptionChain]] = {}
+        missing: list[str] = []
+        for expiration in dict.fromkeys(expirations):
+            cache_key = _chain_key(symbol, expiration, option_type, window)
+            cached = self._get_cache(
+                cache_key,
+                refresh=self._option_chain_loader(symbol, expiration, option_type, window),
+            )
+            if cached is None and window is not None:
+                cached = self._covering_chain(symbol, expiration, option_type, window)
+            if cached is not None:
+                self._served_chain(symbol, expiration, option_type, cached)
+            elif not self._recently_failed(cache_key):
+                missing.append(expiration)
+            results[expiration] = cached
+
+        if not missing:
+            return results
+
+        if not self._options_client:
+            logger.warning("Option client unavailable; cannot fetch option chains")
+            return results
+
+        if not hasattr(self._options_client, "get_option_chains"):
+            # No batch endpoint: fetch the expirations side by side instead.
+            pool = self._get_chain_pool()
+            chains = pool.map(
+                lambda expiration: self.get_option_chain(
+                    symbol, expiration, option_type, strikes=window
+                ),
+                missing,
+            )
+            results.update(zip(missing, chains))
+            return results
+
+        try:
+            aligned = _align_chains(
+                self._fetch_option_chains(symbol, missing, option_type, window), missing
+            )
+        except CircuitOpenError as exc:
+            logger.debug("Skipping option chains fetch: %s", exc)
+            return results
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed to fetch option chains: %s", exc)
+            for expiration in missing:
+                self._negative_cache.add(
+                    _chain_key(symbol, expiration, option_type, window), str(exc)
+                )
+            return results
+
+        for expiration, raw_chain in zip(missing, aligned):
+            chain = _normalize_option_chain(raw_chain, window)
+            if chain is not None:
+                self._store_chain(symbol, expiration, option_type, chain, window)
+            results[expiration] = chain
+        return results
+
+    def get_option_expirations(self, symbol: str) -> Optional[list[str]]:
+        # Listed expirations only change overnight, so the key rolls with the date.
+        cache_key = f"expirations:{symbol}:{date.today().isoformat()}"
+
+        def load() -> Optional[list[str]]:
+            return _normalize_expirations(self._fetch_option_expirations(symbol))
+
+        cached = self._get_cache(cache_key, refresh=load)
+        if cached is not None:
+            return cached
+
+        if not self._options_client:
+            logger.warning("Option client unavailable; cannot list option expirations")
+            return None
+
+        if not self._supports_expiration_listing():
+            return None
+
+        return self._load_or_none(cache_key, load, "option expirations")
+
+    def stale_keys(self) -> set[str]:
+        with self._refresh_lock:
+            return set(self._stale_keys)
+
+    def has_stale_quotes(self) -> bool:
+        return any(cache_kind(key) in ("option", "underlying") for key in self.stale_keys())
+
+    def apply_option_quote(self, leg: OptionLeg, quote: Quote) -> bool:
+        if quote.bid is None and quote.ask is None and quote.last is None:
+            return False
+        return self._apply_streamed(leg.cache_key, quote, quote.timestamp)
+
+    def apply_underlying_price(self, symbol: str, price: float, timestamp: Any = None) -> bool:
+        return self._apply_streamed(f"underlying:{symbol}", price, timestamp)
+
+    def forget_streamed(
+        self, legs: Iterable[OptionLeg] = (), symbols: Iterable[str] = ()
+    ) -> None:
+        keys = [leg.cache_key for leg in legs] + [f"underlying:{symbol}" for symbol in symbols]
+        with self._stream_lock:
+            for key in keys:
+                self._stream_timestamps.pop(key, None)
+
+    def _apply_streamed(self, cache_key: str, value: Any, timestamp: Any) -> bool:
+        # Hold the lock across the check and the write so a late update can't
+        # overwrite a newer one that raced past it.
+        with self._stream_lock:
+            previous = self._stream_timestamps.get(cache_key)
+            if timestamp is not None and previous is not None and timestamp < previous:
+                return False
+            if timestamp is not None:
+                self._stream_timestamps[cache_key] = timestamp
+            self._set_cache(cache_key, value)
+        return True
+
+    @property
+    def cache(self) -> MarketDataCache | SharedMarketDataCache:
+        return self._quote_cache
+
+    def circuit_states(self) -> dict[str, str]:
+        with self._breaker_lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.state.value for name, breaker in breakers.items()}
+
+    def open_circuits(self) -> list[str]:
+        return sorted(
+            name
+            for name, state in self.circuit_states().items()
+            if state == BreakerState.OPEN.value
+        )
+
+    def metrics_snapshot(self) -> dict[str, Any]:
+        return self._metrics.snapshot()
+
+    def write_metrics(self, path: str | None = None) -> bool:
+        target = path or self._metrics_path
+        if not target:
+            return False
+        try:
+            self._metrics.write_prometheus(target)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed to write metrics to %s: %s", target, exc)
+            return False
+        return True
+
+    def _record_expiration(self, key: str) -> None:
+        self._metrics.record_cache(cache_kind(key), "expirations")
+        self._forget_stale(key)
+
+    def _forget_stale(self, key: str) -> None:
+        if self._stale_keys:
+            with self._refresh_lock:
+                self._stale_keys.discard(key)
+
+    def rate_limit_stats(self) -> dict[str, dict[str, float]]:
+        if self._rate_limiter is None:
+            return {}
+        return self._rate_limiter.stats()
+
+    def _load_price_history(self, symbol: str, days: int) -> Any:
+        if self._history_store is None:
+            return self._fetch_price_history(symbol, days)
+        fetch_days = self._history_fetch_days(symbol, days)
+        return self._store_history(symbol, days, self._fetch_price_history(symbol, fetch_days))
+
+    def _history_fetch_days(self, symbol: str, days: int) -> int:
+        store = self._history_store
+        if store is None:
+            return days
+        last = store.last_date(symbol)
+        if last is None or store.count(symbol) < days:
+            return days
+        # Re-fetch the newest stored bar too, in case it was captured intraday.
+        return min(days, sessions_since(last, date.today()) + 1)
+
+    def _store_history(self, symbol: str, days: int, raw: Any) -> Any:
+        store = self._history_store
+        if store is None:
+            return raw
+        bars = normalize_bars(raw)
+        if bars is None:
+            logger.warning("Price history for %s lacks bar dates; not persisting", symbol)
+            return raw
+        store.upsert(symbol, bars)
+        return store.load(symbol, days) or None
+
+    def _load_or_none(
+        self, cache_key: str, loader: Callable[[], Any], description: str
+    ) -> Any:
+        if self._recently_failed(cache_key):
+            return None
         try:
-            raw = self._fetch_option_chain(symbol, expiration, option_type)
-            contracts = _normalize_option_chain(raw)
-            if contracts is not None:
-                self._set_cache(cache_key, contracts)
-            return contracts
+            return self._coalesced_load(cache_key, loader)
+        except CircuitOpenError as exc:
+            logger.debug("Skipping %s fetch: %s", description, exc)
+            return None
         except Exception as exc:  # noqa: BLE001
-            logger.warning("Failed to fetch option chain: %s", exc)
+            logger.warning("Failed to fetch %s: %s", description, exc)
             return None
 
-    def _get_cache(self, key: str) -> Any | None:
-        now = time.monotonic()
-        cached = self._quote_cache.get(key)
-        if not cached:
+    def _recently_failed(self, cache_key: str) -> bool:
+        reason = self._negative_cache.get(cache_key)
+        if reason is None:
+            return False
+        logger.debug("Skipping %s; it failed recently: %s", cache_key, reason)
+        return True
+
+    def _coalesced_load(self, cache_key: str, loader: Callable[[], Any]) -> Any:
+        def load() -> Any:
+            # Another caller may have filled the key between our cache miss and
+            # becoming the single-flight leader.
+            fresh = self._fresh_cached(cache_key)
+            if fresh is not None:
+                return fresh
+            token, shared = self._claim_fetch(cache_key)
+            if shared is not None:
+                return shared
+            try:
+                value = loader()
+                if value is not None:
+                    self._set_cache(cache_key, value)
+            except (CircuitOpenError, UnsupportedMethodError):
+                raise
+            except Exception as exc:
+                self._negative_cache.add(cache_key, str(exc))
+                raise
+            finally:
+                if token is not None:
+                    self._quote_cache.release_lease(cache_key, token)  # type: ignore[union-attr]
+            return value
+
+        return self._single_flight.do(cache_key, load)
+
+    def _fresh_cached(self, cache_key: str) -> Any:
+        if cache_key not in self._quote_cache:
             return None
-        timestamp, value = cached
-        if now - timestamp > self._cache_ttl_seconds:
-            self._quote_cache.pop(key, None)
+        found = self._quote_cache.lookup(cache_key)
+        return found[0] if found is not None and not found[1] else None
+
+    def _claim_fetch(self, cache_key: str) -> tuple[Optional[str], Any]:
+        # A shared cache hands out a lease so only one process on the host fetches a
+        # key; the others wait for it to land in the cache.
+        cache = self._quote_cache
+        if not hasattr(cache, "claim"):
+            return None, None
+        return cache.claim(cache_key)
+
+    def _get_cache(self, key: str, refresh: Callable[[], Any] | None = None) -> Any | None:
+        found = self._cache_lookup(key, serve_stale=refresh is not None)
+        if found is None:
             return None
+        value, stale = found
+        if stale and refresh is not None:
+            self._schedule_refresh(key, refresh)
         return value
 
+    def _cache_lookup(self, key: str, serve_stale: bool) -> tuple[Any, bool] | None:
+        kind = cache_kind(key)
+        found = self._quote_cache.lookup(key)
+        if found is None:
+            self._metrics.record_cache(kind, "misses")
+            return None
+        value, stale = found
+        if not stale:
+            self._metrics.record_cache(kind, "hits")
+            return found
+        if not serve_stale or self._stale_while_revalidate_seconds <= 0:
+            self._metrics.record_cache(kind, "misses")
+            return None
+        self._metrics.record_cache(kind, "stale_hits")
+        return found
+
+    def _schedule_refresh(self, key: str, loader: Callable[[], Any]) -> None:
+        if self._claim_refresh([key]):
+            self._refresh_executor().submit(self._refresh, key, loader)
+
+    def _schedule_quote_batch_refresh(self, legs: Sequence[OptionLeg]) -> None:
+        claimed = set(self._claim_refresh([leg.cache_key for leg in legs]))
+        batch = [leg for leg in legs if leg.cache_key in claimed]
+        if batch:
+            self._refresh_executor().submit(self._refresh_quote_batch, batch)
+
+    def _claim_refresh(self, keys: Sequence[str]) -> list[str]:
+        # Flags every key stale and returns the ones no refresh is already running for.
+        with self._refresh_lock:
+            self._stale_keys.update(keys)
+            claimed = [key for key in keys if key not in self._refreshing]
+            self._refreshing.update(claimed)
+        return claimed
+
+    def _refresh_executor(self) -> ThreadPoolExecutor:
+        with self._refresh_lock:
+            if self._refresh_pool is None:
+                self._refresh_pool = ThreadPoolExecutor(
+                    max_workers=self._refresh_workers, thread_name_prefix="alpaca-refresh"
+                )
+            return self._refresh_pool
+
+    def _refresh_quote_batch(self, legs: Sequence[OptionLeg]) -> None:
+        try:
+            quotes = self._load_quote_batches(legs)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Background quote batch refresh failed: %s", exc)
+            quotes = {}
+        with self._refresh_lock:
+            for leg in legs:
+                self._refreshing.discard(leg.cache_key)
+                if quotes.get(leg) is None:
+                    self._stale_keys.discard(leg.cache_key)
+
+    def _refresh(self, key: str, loader: Callable[[], Any]) -> None:
+        try:
+            value = self._coalesced_load(key, loader)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Background refresh failed for %s: %s", key, exc)
+            value = None
+        with self._refresh_lock:
+            self._refreshing.discard(key)
+            if value is None:
+                # The next stale read schedules another refresh and flags the key again.
+                self._stale_keys.discard(key)
+        if value is None:
+            logger.debug("Background refresh for %s returned no data; keeping stale value", key)
+
+    def chain_version(
+        self, symbol: str, expiration: str, option_type: str = "put"
+    ) -> Optional[int]:
+        return self._chain_index.version(symbol, expiration, option_type)
+
+    def _quote_from_snapshot(self, leg: OptionLeg) -> Optional[Quote]:
+        contract = self._chain_index.find(
+            leg.symbol,
+            leg.expiration,
+            leg.strike,
+            leg.option_type,
+            max_age_seconds=self._chain_quote_max_age_seconds,
+        )
+        if contract is None:
+            return None
+        quote = Quote(bid=contract.bid, ask=contract.ask, last=contract.last)
+        if quote.bid is None and quote.ask is None and quote.last is None:
+            return None
+        self._set_cache(leg.cache_key, quote)
+        return quote
+
+    def _quote_from_chains(
+        self, legs: list[OptionLeg], results: dict[OptionLeg, Optional[Quote]]
+    ) -> list[OptionLeg]:
+        groups: dict[tuple[str, str, str], list[OptionLeg]] = {}
+        for leg in legs:
+            groups.setdefault((leg.symbol, leg.expiration, leg.option_type), []).append(leg)
+
+        remaining: list[OptionLeg] = []
+        for (symbol, expiration, option_type), group in groups.items():
+            if len(group) < self._chain_fetch_threshold:
+                remaining.extend(group)
+                continue
+            self.get_option_chain(symbol, expiration, option_type)
+            for leg in group:
+                quote = self._quote_from_snapshot(leg)
+                if quote is None:
+                    remaining.append(leg)
+                else:
+                    results[leg] = quote
+        return remaining
+
+    def _option_chain_loader(
+        self,
+        symbol: str,
+        expiration: str,
+        option_type: str,
+        window: Optional[StrikeWindow] = None,
+    ) -> Callable[[], Optional[OptionChain]]:
+        def load() -> Optional[OptionChain]:
+            chain = _normalize_option_chain(
+                self._fetch_option_chain(symbol, expiration, option_type, window), window
+            )
+            if chain is not None:
+                self._index_chain(symbol, expiration, option_type, chain, window)
+            return chain
+
+        return load
+
+    def _store_chain(
+        self,
+        symbol: str,
+        expiration: str,
+        option_type: str,
+        chain: OptionChain,
+        window: Optional[StrikeWindow] = None,
+    ) -> None:
+        self._index_chain(symbol, expiration, option_type, chain, window)
+        self._set_cache(_chain_key(symbol, expiration, option_type, window), chain)
+
+    def _served_chain(
+        self, symbol: str, expiration: str, option_type: str, chain: OptionChain
+    ) -> OptionChain:
+        # A cached chain, possibly fetched by another process sharing the cache, still
+        # needs a snapshot version so callers can tell it has not changed.
+        self._chain_index.ensure(symbol, expiration, option_type, chain)
+        return chain
+
+    def _index_chain(
+        self,
+        symbol: str,
+        expiration: str,
+        option_type: str,
+        chain: OptionChain,
+        window: Optional[StrikeWindow],
+    ) -> None:
+        if window is None:
+            self._chain_index.put(symbol, expiration, option_type, chain)
+            return
+        # A windowed chain must not replace a full snapshot that leg quotes rely on,
+        # but it is still new data, so the version moves on either way.
+        if self._chain_index.bump(symbol, expiration, option_type) is None:
+            self._chain_index.put(symbol, expiration, option_type, chain)
+        with self._chain_windows_lock:
+            windows = self._chain_windows.setdefault((symbol, expiration, option_type), [])
+            if window not in windows:
+                windows.append(window)
+                del windows[:-MAX_CHAIN_WINDOWS]
+
+    def _covering_chain(
+        self, symbol: str, expiration: str, option_type: str, window: StrikeWindow
+    ) -> Optional[OptionChain]:
+        # Serve a narrower window by slicing the full chain or any wider cached window.
+        with self._chain_windows_lock:
+            wider = [
+                cached
+                for cached in self._chain_windows.get((symbol, expiration, option_type), ())
+                if cached != window and cached.contains(window)
+            ]
+        for candidate in (None, *wider):
+            chain = self._fresh_cached(_chain_key(symbol, expiration, option_type, candidate))
+            if chain is not None:
+                return chain.within(window)
+        return None
+
+    def _strike_window(
+        self,
+        symbol: str,
+        strikes: Optional[StrikeWindow],
+        band_pct: Optional[float],
+    ) -> Optional[StrikeWindow]:
+        if strikes is not None and band_pct is not None:
+            raise ValueError("Pass either strikes or band_pct, not both")
+        if band_pct is not None:
+            price = self.get_underlying_price(symbol)
+            if price is None:
+                logger.debug("No underlying price for %s; fetching the full chain", symbol)
+                return None
+            strikes = StrikeWindow.around(price, band_pct)
+        if strikes is None or strikes.unbounded:
+            return None
+        return strikes
+
+    def _get_chain_pool(self) -> ThreadPoolExecutor:
+        with self._refresh_lock:
+            if self._chain_pool is None:
+                self._chain_pool = ThreadPoolExecutor(
+                    max_workers=self._chain_workers, thread_name_prefix="alpaca-chains"
+                )
+            return self._chain_pool
+
+    def _option_quote_loader(self, leg: OptionLeg) -> Callable[[], Optional[Quote]]:
+        def load() -> Optional[Quote]:
+            return _normalize_quote(
+                self._fetch_option_quote(leg.symbol, leg.expiration, leg.strike, leg.option_type)
+            )
+
+        return load
+
     def _set_cache(self, key: str, value: Any) -> None:
-        self._quote_cache[key] = (time.monotonic(), value)
+        self._quote_cache.set(key, value)
+        self._forget_stale(key)
+
+    def _call_provider(self, endpoint: str, fn: Callable[..., Any], *args: Any) -> Any:
+        name = getattr(fn, "__name__", endpoint)
+        breaker = self._breaker(name)
+        if not breaker.allow():
+            raise CircuitOpenError(f"{name} circuit is open")
+        try:
+            if self._rate_limiter is None:
+                result = fn(*args)
+            else:
+                result = self._rate_limiter.call(endpoint, fn, *args)
+        except Exception as exc:
+            if is_outage_error(exc):
+                breaker.record_failure()
+            else:
+                breaker.record_ignored()
+            raise
+        breaker.record_success()
+        return result
+
+    def _breaker(self, name: str) -> CircuitBreaker:
+        with self._breaker_lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    failure_threshold=self._breaker_failure_threshold,
+                    reset_timeout_seconds=self._breaker_reset_seconds,
+                )
+                self._breakers[name] = breaker
+            return breaker
 
+    @_timed
     def _fetch_option_quote(
         self, symbol: str, expiration: str, strike: float, option_type: str
     ) -> Any:
@@ -174,44 +934,161 @@ class AlpacaClient:
         if client is None:
             raise RuntimeError("Options client is not configured")
         if hasattr(client, "get_latest_option_quote"):
-            return client.get_latest_option_quote(symbol, expiration, strike, option_type)
+            return self._call_provider(
+                "options", client.get_latest_option_quote, symbol, expiration, strike, option_type
+            )
         if hasattr(client, "get_option_quote"):
-            return client.get_option_quote(symbol, expiration, strike, option_type)
+            return self._call_provider(
+                "options", client.get_option_quote, symbol, expiration, strike, option_type
+            )
         if hasattr(client, "get_quote"):
-            return client.get_quote(symbol, expiration, strike, option_type)
-        raise AttributeError("Options client does not expose a supported quote method")
+            return self._call_provider(
+                "options", client.get_quote, symbol, expiration, strike, option_type
+            )
+        raise UnsupportedMethodError("Options client does not expose a supported quote method")
+
+    def _supports_single_quotes(self) -> bool:
+        client = self._options_client
+        return any(
+            hasattr(client, name)
+            for name in ("get_latest_option_quote", "get_option_quote", "get_quote")
+        )
+
+    def _supports_batch_quotes(self) -> bool:
+        client = self._options_client
+        return (
+            hasattr(client, "get_option_snapshots")
+            or hasattr(client, "get_latest_option_quotes")
+        )
+
+    def _supports_expiration_listing(self) -> bool:
+        client = self._options_client
+        return hasattr(client, "get_option_expirations") or hasattr(client, "get_expirations")
+
+    def _supports_chain_fetch(self) -> bool:
+        client = self._options_client
+        return hasattr(client, "get_option_chain") or hasattr(client, "get_options")
+
+    @_timed
+    def _fetch_option_quotes(self, legs: Sequence[OptionLeg]) -> Any:
+        client = self._options_client
+        if client is None:
+            raise RuntimeError("Options client is not configured")
+        if hasattr(client, "get_option_snapshots"):
+            return self._call_provider("options", client.get_option_snapshots, list(legs))
+        if hasattr(client, "get_latest_option_quotes"):
+            return self._call_provider("options", client.get_latest_option_quotes, list(legs))
+        raise UnsupportedMethodError(
+            "Options client does not expose a supported batch quote method"
+        )
 
+    @_timed
     def _fetch_underlying_price(self, symbol: str) -> Any:
         client = self._market_client
         if client is None:
             raise RuntimeError("Market client is not configured")
         if hasattr(client, "get_latest_trade"):
-            return client.get_latest_trade(symbol)
+            return self._call_provider("stocks", client.get_latest_trade, symbol)
         if hasattr(client, "get_latest_quote"):
-            return client.get_latest_quote(symbol)
+            return self._call_provider("stocks", client.get_latest_quote, symbol)
         if hasattr(client, "get_price"):
-            return client.get_price(symbol)
-        raise AttributeError("Market client does not expose a supported price method")
+            return self._call_provider("stocks", client.get_price, symbol)
+        raise UnsupportedMethodError("Market client does not expose a supported price method")
 
+    @_timed
     def _fetch_price_history(self, symbol: str, days: int) -> Any:
         client = self._market_client
         if client is None:
             raise RuntimeError("Market client is not configured")
         if hasattr(client, "get_price_history"):
-            return client.get_price_history(symbol, days)
+            return self._call_provider("stocks", client.get_price_history, symbol, days)
         if hasattr(client, "get_bars"):
-            return client.get_bars(symbol, days)
-        raise AttributeError("Market client does not expose a supported history method")
+            return self._call_provider("stocks", client.get_bars, symbol, days)
+        raise UnsupportedMethodError("Market client does not expose a supported history method")
 
-    def _fetch_option_chain(self, symbol: str, expiration: str, option_type: str) -> Any:
+    @_timed
+    def _fetch_price_histories(self, symbols: Sequence[str], days: int) -> Any:
+        client = self._market_client
+        if client is None:
+            raise RuntimeError("Market client is not configured")
+        if hasattr(client, "get_price_histories"):
+            return self._call_provider("stocks", client.get_price_histories, list(symbols), days)
+        raise UnsupportedMethodError(
+            "Market client does not expose a supported batch history method"
+        )
+
+    @_timed
+    def _fetch_option_chain(
+        self,
+        symbol: str,
+        expiration: str,
+        option_type: str,
+        window: Optional[StrikeWindow] = None,
+    ) -> Any:
         client = self._options_client
         if client is None:
             raise RuntimeError("Options client is not configured")
         if hasattr(client, "get_option_chain"):
-            return client.get_option_chain(symbol, expiration, option_type)
+            return self._call_provider(
+                "options",
+                _with_strike_filter(client.get_option_chain, window),
+                symbol,
+                expiration,
+                option_type,
+            )
         if hasattr(client, "get_options"):
-            return client.get_options(symbol, expiration, option_type)
-        raise AttributeError("Options client does not expose a supported chain method")
+            return self._call_provider(
+                "options",
+                _with_strike_filter(client.get_options, window),
+                symbol,
+                expiration,
+                option_type,
+            )
+        raise UnsupportedMethodError("Options client does not expose a supported chain method")
+
+    @_timed
+    def _fetch_option_chains(
+        self,
+        symbol: str,
+        expirations: Sequence[str],
+        option_type: str,
+        window: Optional[StrikeWindow] = None,
+    ) -> Any:
+        client = self._options_client
+        if client is None:
+            raise RuntimeError("Options client is not configured")
+        if hasattr(client, "get_option_chains"):
+            return self._call_provider(
+                "options",
+                _with_strike_filter(client.get_option_chains, window),
+                symbol,
+                list(expirations),
+                option_type,
+            )
+        raise UnsupportedMethodError(
+            "Options client does not expose a supported batch chain method"
+        )
+
+    @_timed
+    def _fetch_option_expirations(self, symbol: str) -> Any:
+        client = self._options_client
+        if client is None:
+            raise RuntimeError("Options client is not configured")
+        if hasattr(client, "get_option_expirations"):
+            return self._call_provider("options", client.get_option_expirations, symbol)
+        if hasattr(client, "get_expirations"):
+            return self._call_provider("options", client.get_expirations, symbol)
+        raise UnsupportedMethodError("Options client does not expose a supported expiration method")
+
+
+def _cache_ttls(
+    cache_ttl_seconds: Optional[float], cache_ttls: Mapping[str, float] | None
+) -> tuple[float, Mapping[str, float] | None]:
+    # An explicit flat TTL still applies to every kind the caller didn't list in
+    # cache_ttls; only when it is omitted do the per-kind defaults kick in.
+    if cache_ttl_seconds is None:
+        return DEFAULT_CACHE_TTL_SECONDS, cache_ttls
+    return cache_ttl_seconds, cache_ttls if cache_ttls is not None else {}
 
 
 def _normalize_quote(raw: Any) -> Optional[Quote]:
@@ -237,6 +1114,64 @@ def _normalize_quote(raw: Any) -> Optional[Quote]:
     return Quote(bid=bid, ask=ask, last=last, timestamp=timestamp)
 
 
+def _align_batch(raw: Any, legs: Sequence[OptionLeg]) -> list[Any]:
+    if raw is None:
+        return [None] * len(legs)
+    if hasattr(raw, "data") and not isinstance(raw, (Mapping, list)):
+        raw = raw.data  # type: ignore[attr-defined]
+    if isinstance(raw, Mapping):
+        aligned = []
+        for leg in legs:
+            keys = (leg, (leg.symbol, leg.expiration, leg.strike, leg.option_type), leg.occ_symbol)
+            for key in keys:
+                if key in raw:
+                    aligned.append(_snapshot_quote(raw[key]))
+                    break
+            else:
+                aligned.append(None)
+        return aligned
+    items = list(raw)
+    if len(items) != len(legs):
+        raise ValueError("Batch quote response does not match requested legs")
+    return [_snapshot_quote(item) for item in items]
+
+
+def _align_chains(raw: Any, expirations: Sequence[str]) -> list[Any]:
+    if raw is None:
+        return [None] * len(expirations)
+    if isinstance(raw, Mapping):
+        return [raw.get(expiration) for expiration in expirations]
+    items = list(raw)
+    if len(items) != len(expirations):
+        raise ValueError("Batch chain response does not match requested expirations")
+    return items
+
+
+def _normalize_expirations(raw: Any) -> Optional[list[str]]:
+    if raw is None:
+        return None
+    if not isinstance(raw, (list, tuple, set)):
+        raw = getattr(raw, "option_contracts", None) or getattr(raw, "data", None) or []
+    found: set[str] = set()
+    for item in raw:
+        if isinstance(item, dict):
+            item = item.get("expiration_date", item.get("expiration"))
+        elif not isinstance(item, (str, date)):
+            item = getattr(item, "expiration_date", getattr(item, "expiration", None))
+        if isinstance(item, date):
+            found.add(item.isoformat())
+        elif isinstance(item, str) and item:
+            found.add(item[:10])
+    return sorted(found)
+
+
+def _snapshot_quote(raw: Any) -> Any:
+    # Snapshot payloads nest the quote under ``latest_quote``; plain quotes pass through.
+    if isinstance(raw, dict):
+        return raw.get("latest_quote", raw)
+    return getattr(raw, "latest_quote", None) or raw
+
+
 def _extract_price(raw: Any) -> Optional[float]:
     if raw is None:
         return None
@@ -250,44 +1185,43 @@ def _extract_price(raw: Any) -> Optional[float]:
     return None
 
 
-def _normalize_option_chain(raw: Any) -> Optional[list[OptionContract]]:
-    if raw is None:
-        return None
-    contracts: list[OptionContract] = []
-    if isinstance(raw, list):
-        iterable = raw
-    elif hasattr(raw, "data"):
-        iterable = raw.data  # type: ignore[attr-defined]
-    else:
-        iterable = []
-    for item in iterable:
-        if isinstance(item, dict):
-            contracts.append(
-                OptionContract(
-                    symbol=str(item.get("symbol", "")),
-                    expiration=str(item.get("expiration", "")),
-                    strike=float(item.get("strike", 0.0)),
-                    option_type=str(item.get("option_type", "put")),
-                    bid=_parse_optional_float(item.get("bid_price", item.get("bid"))),
-                    ask=_parse_optional_float(item.get("ask_price", item.get("ask"))),
-                    last=_parse_optional_float(item.get("last_price", item.get("last"))),
-                    open_interest=_parse_optional_int(item.get("open_interest")),
-                )
-            )
-        else:
-            contracts.append(
-                OptionContract(
-                    symbol=str(getattr(item, "symbol", "")),
-                    expiration=str(getattr(item, "expiration", "")),
-                    strike=float(getattr(item, "strike", 0.0)),
-                    option_type=str(getattr(item, "option_type", "put")),
-                    bid=_parse_optional_float(getattr(item, "bid_price", getattr(item, "bid", None))),
-                    ask=_parse_optional_float(getattr(item, "ask_price", getattr(item, "ask", None))),
-                    last=_parse_optional_float(getattr(item, "last_price", getattr(item, "last", None))),
-                    open_interest=_parse_optional_int(getattr(item, "open_interest", None)),
-                )
-            )
-    return contracts
+def _normalize_option_chain(
+    raw: Any, window: Optional[StrikeWindow] = None
+) -> Optional[OptionChain]:
+    return OptionChain.from_raw(raw, window)
+
+
+def _chain_key(
+    symbol: str, expiration: str, option_type: str, window: Optional[StrikeWindow] = None
+) -> str:
+    key = f"chain:{symbol}:{expiration}:{option_type}"
+    return key if window is None else f"{key}:{window.key}"
+
+
+def _with_strike_filter(
+    fn: Callable[..., Any], window: Optional[StrikeWindow]
+) -> Callable[..., Any]:
+    # Push the strike window into the provider request when its method accepts
+    # Alpaca's strike_price_gte / strike_price_lte filters.
+    if window is None:
+        return fn
+    try:
+        params = inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return fn
+    filters = {
+        name: bound
+        for name, bound in (("strike_price_gte", window.low), ("strike_price_lte", window.high))
+        if bound is not None and name in params
+    }
+    if not filters:
+        return fn
+
+    @functools.wraps(fn)
+    def call(*args: Any) -> Any:
+        return fn(*args, **filters)
+
+    return call
 
 
 def _parse_optional_float(value: Any) -> Optional[float]:
@@ -295,8 +1229,3 @@ def _parse_optional_float(value: Any) -> Optional[float]:
         return None
     return float(value)
 
-
-def _parse_optional_int(value: Any) -> Optional[int]:
-    if value is None:
-        return None
-    return int(value)
@@ -10,6 +10,8 @@ from credit_spread_system.config import load_config
 from credit_spread_system.data_service import DataService
 from credit_spread_system.iv_rank import IvRankService
 from credit_spread_system.sheets_client import SheetsClient
+from credit_spread_system.trade_suggestions import TopSuggestions, TradeSuggestion
+from credit_spread_system.universe_index import UniverseIndex
 
 logger = logging.getLogger(__name__)
 
@@ -40,12 +42,19 @@ def _build_header() -> None:
         )
 
 
+# Streamlit reruns the script on every interaction; keeping one client and engine
+# per process lets caches, chain versions and reused scan results carry over.
+@st.cache_resource
+def _build_services() -> tuple[DataService, AlpacaClient]:
+    load_config()
+    sheets = SheetsClient.from_env()
+    alpaca = AlpacaClient.from_env()
+    return DataService(sheets, alpaca, universe_index=UniverseIndex.from_env()), alpaca
+
+
 def _load_services() -> tuple[DataService | None, AlpacaClient | None]:
     try:
-        load_config()
-        sheets = SheetsClient.from_env()
-        alpaca = AlpacaClient.from_env()
-        return DataService(sheets, alpaca), alpaca
+        return _build_services()
     except Exception as exc:  # noqa: BLE001
         st.warning("Configuration missing or invalid. Showing empty dashboard.")
         logger.warning("Failed to initialize services: %s", exc)
@@ -89,7 +98,7 @@ def _render_iv_rank(alpaca: AlpacaClient | None) -> None:
         st.info("Enter a symbol to view IV Rank.")
         return
 
-    service = IvRankService()
+    service = IvRankService(cache=alpaca.cache)
     result = service.get_iv_rank(symbol.upper(), alpaca)
 
     if result.iv_rank is None:
@@ -106,28 +115,19 @@ def _render_trade_suggestions(data_service: DataService | None) -> None:
         st.write("Configure data sources to load suggestions.")
         return
 
-    suggestions = data_service.get_daily_trade_suggestions()
+    # Show setups as symbols finish scanning instead of after the whole universe.
+    table = st.empty()
+    top = TopSuggestions()
+    with st.spinner("Scanning universe..."):
+        for rank, suggestion in data_service.iter_daily_trade_suggestions():
+            if top.push(suggestion, rank=rank):
+                table.dataframe(_suggestion_rows(top.items()), use_container_width=True)
+
+    suggestions = top.items()
     if not suggestions:
-        st.write("No qualifying setups today.")
+        table.write("No qualifying setups today.")
         return
 
-    rows = []
-    for suggestion in suggestions:
-        rows.append(
-            {
-                "Symbol": suggestion.symbol,
-                "Short Strike": suggestion.short_strike,
-                "Long Strike": suggestion.long_strike,
-                "Expiration": suggestion.expiration,
-                "Credit": suggestion.credit,
-                "Support": suggestion.support_level,
-                "Trend Score": suggestion.trend_score,
-                "Risk": suggestion.risk_label,
-            }
-        )
-
-    st.dataframe(rows, use_container_width=True)
-
     selected_symbol = st.selectbox("Suggestion Detail", [s.symbol for s in suggestions])
     selected = next((s for s in suggestions if s.symbol == selected_symbol), None)
     if selected:
@@ -135,12 +135,32 @@ def _render_trade_suggestions(data_service: DataService | None) -> None:
         st.write(selected.reasoning)
 
 
+def _suggestion_rows(suggestions: list[TradeSuggestion]) -> list[dict[str, object]]:
+    return [
+        {
+            "Symbol": suggestion.symbol,
+            "Short Strike": suggestion.short_strike,
+            "Long Strike": suggestion.long_strike,
+            "Expiration": suggestion.expiration,
+            "Credit": suggestion.credit,
+            "Support": suggestion.support_level,
+            "Trend Score": suggestion.trend_score,
+            "Risk": suggestion.risk_label,
+        }
+        for suggestion in suggestions
+    ]
+
+
 def _render_market_context(data_service: DataService | None) -> None:
     st.subheader("Market Context")
     context = data_service.get_market_context() if data_service else {"market_status": {"message": "Unknown"}}
     status = context.get("market_status") if isinstance(context, dict) else {"message": "Unknown"}
     message = status.get("message", "Unknown") if isinstance(status, dict) else "Unknown"
     st.info(message)
+    if isinstance(context, dict) and context.get("quotes_stale"):
+        st.warning("Some quotes are stale; refreshing in the background.")
+    if isinstance(context, dict) and context.get("degraded_endpoints"):
+        st.warning("Market data provider is degraded; showing cached data where available.")
 
 
 def _render_positions_table(data_service: DataService | None) -> list:
@@ -209,6 +229,9 @@ def main() -> None:
     positions = _render_positions_table(data_service)
     _render_position_detail(positions)
 
+    if alpaca:
+        alpaca.write_metrics()
+
 
 if __name__ == "__main__":
     main()
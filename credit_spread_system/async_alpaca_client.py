@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from typing import Any, Callable, Iterable, Optional, Sequence, TypeVar
+
+from credit_spread_system.alpaca_client import AlpacaClient, OptionLeg, Quote
+from credit_spread_system.option_chain import OptionChain, StrikeWindow
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+class AsyncAlpacaClient:
+    def __init__(
+        self, client: AlpacaClient, max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    ) -> None:
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        self._client = client
+        self._max_concurrency = max_concurrency
+        self._semaphore: asyncio.Semaphore | None = None
+
+    @classmethod
+    def from_env(cls, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> "AsyncAlpacaClient":
+        return cls(AlpacaClient.from_env(), max_concurrency=max_concurrency)
+
+    @property
+    def sync_client(self) -> AlpacaClient:
+        return self._client
+
+    async def get_option_quote(
+        self, symbol: str, expiration: str, strike: float, option_type: str
+    ) -> Optional[Quote]:
+        return await self.run(
+            self._client.get_option_quote, symbol, expiration, strike, option_type
+        )
+
+    async def get_option_quotes(
+        self, legs: Iterable[OptionLeg]
+    ) -> dict[OptionLeg, Optional[Quote]]:
+        return await self.run(self._client.get_option_quotes, list(legs))
+
+    async def get_underlying_price(self, symbol: str) -> Optional[float]:
+        return await self.run(self._client.get_underlying_price, symbol)
+
+    async def get_price_history(
+        self, symbol: str, days: int = 260
+    ) -> Optional[Sequence[dict[str, Any]]]:
+        return await self.run(self._client.get_price_history, symbol, days)
+
+    async def get_option_chain(
+        self,
+        symbol: str,
+        expiration: str,
+        option_type: str = "put",
+        strikes: Optional[StrikeWindow] = None,
+        band_pct: Optional[float] = None,
+    ) -> Optional[OptionChain]:
+        fetch = _with_window(self._client.get_option_chain, strikes, band_pct)
+        return await self.run(fetch, symbol, expiration, option_type)
+
+    async def get_option_chains(
+        self,
+        symbol: str,
+        expirations: Iterable[str],
+        option_type: str = "put",
+        strikes: Optional[StrikeWindow] = None,
+        band_pct: Optional[float] = None,
+    ) -> dict[str, Optional[OptionChain]]:
+        fetch = _with_window(self._client.get_option_chains, strikes, band_pct)
+        return await self.run(fetch, symbol, list(expirations), option_type)
+
+    async def get_option_expirations(self, symbol: str) -> Optional[list[str]]:
+        return await self.run(self._client.get_option_expirations, symbol)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        # The provider SDKs block, so each call runs on a worker thread while the
+        # semaphore caps how many are in flight against the API at once.
+        async with self._get_semaphore():
+            return await asyncio.to_thread(fn, *args)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._semaphore
+
+
+def _with_window(
+    fn: Callable[..., T], strikes: Optional[StrikeWindow], band_pct: Optional[float]
+) -> Callable[..., T]:
+    # Only pass window options that were set, so clients without them keep working.
+    options = {
+        name: value
+        for name, value in (("strikes", strikes), ("band_pct", band_pct))
+        if value is not None
+    }
+    return functools.partial(fn, **options) if options else fn
@@ -0,0 +1,423 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+from credit_spread_system.config import MIN_IV_RANK
+from credit_spread_system.exit_rules import Action, first_exit
+from credit_spread_system.expirations import MAX_DTE, MIN_DTE
+from credit_spread_system.features import MIN_LIQUID_VOLUME, SUPPORT_VOLUME_MULTIPLE
+from credit_spread_system.history_store import PriceHistoryStore
+from credit_spread_system.indicators import MA_WINDOWS, SLOPE_LAG, VOLUME_WINDOW, rolling_mean
+from credit_spread_system.option_chain import OptionChain
+from credit_spread_system.pricing import calculate_pl
+from credit_spread_system.spread_search import (
+    DEFAULT_STRIKE_BAND,
+    SpreadCandidate,
+    search_spreads,
+    search_window,
+)
+
+logger = logging.getLogger(__name__)
+
+SUPPORT_WINDOWS = (50, 100, 200)
+RECENT_LOW_WINDOW = 20
+HIGHER_LOWS_BARS = 4
+MIN_SUPPORT_BARS = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chains (
+    symbol TEXT NOT NULL,
+    as_of TEXT NOT NULL,
+    expiration TEXT NOT NULL,
+    option_type TEXT NOT NULL,
+    strike REAL NOT NULL,
+    bid REAL,
+    ask REAL,
+    last REAL,
+    open_interest REAL,
+    PRIMARY KEY (symbol, as_of, expiration, option_type, strike)
+) WITHOUT ROWID
+"""
+
+
+class ChainArchive:
+    # Daily option chain snapshots, stored one row per contract so a position's two
+    # legs can be read across its whole holding period in a single query.
+    def __init__(self, path: str | Path = ":memory:") -> None:
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(_SCHEMA)
+
+    def save(self, symbol: str, as_of: date, chain: OptionChain) -> int:
+        rows = [
+            (
+                symbol,
+                as_of.isoformat(),
+                str(chain.expirations[idx]),
+                str(chain.option_types[idx]),
+                float(chain.strikes[idx]),
+                _nullable(chain.bids[idx]),
+                _nullable(chain.asks[idx]),
+                _nullable(chain.lasts[idx]),
+                _nullable(chain.open_interest[idx]),
+            )
+            for idx in range(len(chain))
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO chains VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def expirations(self, symbol: str, as_of: date) -> list[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT expiration FROM chains WHERE symbol = ? AND as_of = ? "
+                "ORDER BY expiration",
+                (symbol, as_of.isoformat()),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def load(
+        self, symbol: str, as_of: date, expiration: str, option_type: str = "put"
+    ) -> Optional[OptionChain]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT strike, bid, ask, last, open_interest FROM chains "
+                "WHERE symbol = ? AND as_of = ? AND expiration = ? AND option_type = ?",
+                (symbol, as_of.isoformat(), expiration, option_type),
+            ).fetchall()
+        if not rows:
+            return None
+        strikes, bids, asks, lasts, open_interest = zip(*rows)
+        return OptionChain.from_columns(
+            symbols=[symbol] * len(rows),
+            expirations=[expiration] * len(rows),
+            strikes=strikes,
+            option_types=[option_type] * len(rows),
+            bids=bids,
+            asks=asks,
+            lasts=lasts,
+            open_interest=open_interest,
+        )
+
+    def spread_values(
+        self,
+        symbol: str,
+        expiration: str,
+        short_strike: float,
+        long_strike: float,
+        dates: np.ndarray,
+        option_type: str = "put",
+    ) -> np.ndarray:
+        # Short minus long leg price for each date in `dates`; NaN where either leg
+        # has no usable price, which evaluate_position treats as missing data.
+        values = np.full(len(dates), np.nan)
+        if not len(dates):
+            return values
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT as_of, strike, bid, ask, last FROM chains "
+                "WHERE symbol = ? AND expiration = ? AND option_type = ? "
+                "AND strike IN (?, ?) AND as_of BETWEEN ? AND ?",
+                (
+                    symbol,
+                    expiration,
+                    option_type,
+                    short_strike,
+                    long_strike,
+                    str(dates[0]),
+                    str(dates[-1]),
+                ),
+            ).fetchall()
+        if not rows:
+            return values
+        as_of = np.array([row[0] for row in rows], dtype="datetime64[D]")
+        columns = np.array([row[1:] for row in rows], dtype=np.float64)
+        strikes = columns[:, 0]
+        prices = _leg_prices(columns[:, 1], columns[:, 2], columns[:, 3])
+        # Snapshots taken on days without a bar are ignored.
+        positions = np.searchsorted(dates, as_of)
+        on_bar = (positions < len(dates)) & (dates[np.minimum(positions, len(dates) - 1)] == as_of)
+        legs = {strike: np.full(len(dates), np.nan) for strike in (short_strike, long_strike)}
+        for strike, leg in legs.items():
+            rows_for_leg = on_bar & (strikes == strike)
+            leg[positions[rows_for_leg]] = prices[rows_for_leg]
+        return legs[short_strike] - legs[long_strike]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@dataclass(frozen=True, eq=False)
+class ScreenSeries:
+    liquid: np.ndarray
+    trend_any: np.ndarray
+    support: np.ndarray
+
+    @property
+    def candidates(self) -> np.ndarray:
+        return self.liquid & self.trend_any & ~np.isnan(self.support)
+
+
+@dataclass(frozen=True)
+class BacktestTrade:
+    symbol: str
+    entry_date: date
+    exit_date: Optional[date]
+    expiration: date
+    short_strike: float
+    long_strike: float
+    entry_credit: float
+    exit_value: float
+    action: str
+    pl: float
+
+
+@dataclass(frozen=True)
+class BacktestResult:
+    trades: tuple[BacktestTrade, ...]
+
+    @property
+    def closed(self) -> list[BacktestTrade]:
+        return [trade for trade in self.trades if trade.exit_date is not None]
+
+    @property
+    def total_pl(self) -> float:
+        return float(sum(trade.pl for trade in self.closed))
+
+    @property
+    def win_rate(self) -> float:
+        closed = self.closed
+        return sum(trade.pl > 0 for trade in closed) / len(closed) if closed else 0.0
+
+    def summary(self) -> dict[str, object]:
+        actions: dict[str, int] = {}
+        for trade in self.trades:
+            actions[trade.action] = actions.get(trade.action, 0) + 1
+        return {
+            "trades": len(self.trades),
+            "closed": len(self.closed),
+            "total_pl": self.total_pl,
+            "win_rate": self.win_rate,
+            "actions": actions,
+        }
+
+
+def screen_series(closes: np.ndarray, volumes: np.ndarray) -> ScreenSeries:
+    # SymbolFeatures evaluated at every bar at once: element i equals
+    # SymbolFeatures.build(history[: i + 1]) for the liquidity, trend and support checks.
+    count = len(closes)
+    index = np.arange(count)
+    ma = {window: _padded(rolling_mean(closes, window), count) for window in MA_WINDOWS}
+    avg_volume = _padded(rolling_mean(volumes, VOLUME_WINDOW), count)
+
+    with np.errstate(invalid="ignore"):
+        liquid = (index >= VOLUME_WINDOW - 1) & (avg_volume >= MIN_LIQUID_VOLUME)
+
+        has_trend_inputs = ~np.isnan(ma[20]) & ~np.isnan(ma[50])
+        slope = ma[50] - _shifted(ma[50], SLOPE_LAG)
+        above_50_and_rising = (closes > ma[50]) & (slope > 0)
+        above_20_and_50 = (closes > ma[20]) & (closes > ma[50])
+        trend_any = has_trend_inputs & (
+            above_50_and_rising | above_20_and_50 | _nondecreasing(closes, HIGHER_LOWS_BARS)
+        )
+
+        recent_low = _rolling_min(closes, RECENT_LOW_WINDOW)
+        candidates = np.vstack([ma[window] for window in SUPPORT_WINDOWS])
+        distance = np.where(np.isnan(candidates), np.inf, np.abs(candidates - recent_low))
+        nearest = candidates[np.argmin(distance, axis=0), index]
+        volume_ok = volumes >= avg_volume * SUPPORT_VOLUME_MULTIPLE
+        has_support = (index >= MIN_SUPPORT_BARS - 1) & volume_ok
+        support = np.where(has_support & np.isfinite(distance.min(axis=0)), nearest, np.nan)
+
+    return ScreenSeries(liquid=liquid, trend_any=trend_any, support=support)
+
+
+class Backtester:
+    def __init__(
+        self,
+        history: PriceHistoryStore,
+        archive: ChainArchive,
+        iv_rank: Callable[[str, date], Optional[float]] | None = None,
+        min_dte: int = MIN_DTE,
+        max_dte: int = MAX_DTE,
+        contracts: int = 1,
+        strike_band: Optional[float] = DEFAULT_STRIKE_BAND,
+    ) -> None:
+        if strike_band is not None and not 0 <= strike_band < 1:
+            raise ValueError("strike_band must be in [0, 1)")
+        self.history = history
+        self.archive = archive
+        # Without an IV source the IV rank screen is skipped.
+        self.iv_rank = iv_rank
+        self.min_dte = min_dte
+        self.max_dte = max_dte
+        self.contracts = contracts
+        # Matches the live engine's strike band; None searches the whole chain.
+        self.strike_band = strike_band
+
+    def run(
+        self, symbols: Iterable[str], start: date, end: date, max_bars: int = 100_000
+    ) -> BacktestResult:
+        trades: list[BacktestTrade] = []
+        for symbol in symbols:
+            trades.extend(self.run_symbol(symbol, start, end, max_bars))
+        return BacktestResult(trades=tuple(trades))
+
+    def run_symbol(
+        self, symbol: str, start: date, end: date, max_bars: int = 100_000
+    ) -> list[BacktestTrade]:
+        bars = [
+            bar
+            for bar in self.history.load(symbol, max_bars)
+            if bar.get("close") is not None and bar["date"] <= end.isoformat()
+        ]
+        if not bars:
+            return []
+        dates = np.array([bar["date"] for bar in bars], dtype="datetime64[D]")
+        closes = np.array([bar["close"] for bar in bars], dtype=np.float64)
+        volumes = np.array([bar.get("volume") or 0.0 for bar in bars], dtype=np.float64)
+
+        screen = screen_series(closes, volumes)
+        candidates = np.flatnonzero(screen.candidates & (dates >= np.datetime64(start)))
+        trades: list[BacktestTrade] = []
+        pointer = 0
+        while pointer < len(candidates):
+            entry_idx = int(candidates[pointer])
+            entry_date = dates[entry_idx].item()
+            opened = self._open(symbol, entry_date, float(screen.support[entry_idx]))
+            if opened is None:
+                pointer += 1
+                continue
+            expiration, spread = opened
+            trade, exit_idx = self._manage(symbol, entry_idx, expiration, spread, dates, closes)
+            trades.append(trade)
+            if trade.exit_date is None:
+                break
+            # One open spread per symbol: the next entry comes after this exit.
+            pointer = int(np.searchsorted(candidates, exit_idx, side="right"))
+        return trades
+
+    def _open(
+        self, symbol: str, day: date, support: float
+    ) -> Optional[tuple[date, SpreadCandidate]]:
+        if self.iv_rank is not None:
+            iv_rank = self.iv_rank(symbol, day)
+            if iv_rank is None or iv_rank < MIN_IV_RANK:
+                return None
+        best: Optional[tuple[date, SpreadCandidate]] = None
+        for listed in self.archive.expirations(symbol, day):
+            expiration = date.fromisoformat(listed)
+            if not self.min_dte <= (expiration - day).days <= self.max_dte:
+                continue
+            chain = self.archive.load(symbol, day, listed)
+            if chain is not None and self.strike_band is not None:
+                chain = chain.within(search_window(support, self.strike_band))
+            found = search_spreads(chain, support, top_k=1) if chain is not None else []
+            if found and (best is None or found[0].score > best[1].score):
+                best = (expiration, found[0])
+        return best
+
+    def _manage(
+        self,
+        symbol: str,
+        entry_idx: int,
+        expiration: date,
+        spread: SpreadCandidate,
+        dates: np.ndarray,
+        closes: np.ndarray,
+    ) -> tuple[BacktestTrade, int]:
+        stop = int(np.searchsorted(dates, np.datetime64(expiration), side="right"))
+        path = slice(entry_idx + 1, stop)
+        path_dates = dates[path]
+        values = self.archive.spread_values(
+            symbol, expiration.isoformat(), spread.short_strike, spread.long_strike, path_dates
+        )
+        dte = (np.datetime64(expiration) - path_dates).astype(np.int64)
+        offset, action = first_exit(spread.credit, spread.short_strike, values, closes[path], dte)
+
+        if action is not None:
+            exit_idx = entry_idx + 1 + offset
+            exit_value = float(values[offset])
+            label = action.value
+            exit_date: Optional[date] = dates[exit_idx].item()
+        elif len(path_dates) and dates[-1] >= np.datetime64(expiration):
+            # Held to expiration: settle at intrinsic value on the last session.
+            exit_idx = stop - 1
+            exit_value = float(
+                np.clip(spread.short_strike - closes[exit_idx], 0.0, spread.width)
+            )
+            label = "EXPIRED"
+            exit_date = expiration
+        else:
+            # Still open when the data ends; marked at the last known value.
+            exit_idx = stop - 1
+            priced = values[~np.isnan(values)]
+            exit_value = float(priced[-1]) if len(priced) else spread.credit
+            label = Action.HOLD.value
+            exit_date = None
+
+        trade = BacktestTrade(
+            symbol=symbol,
+            entry_date=dates[entry_idx].item(),
+            exit_date=exit_date,
+            expiration=expiration,
+            short_strike=spread.short_strike,
+            long_strike=spread.long_strike,
+            entry_credit=spread.credit,
+            exit_value=exit_value,
+            action=label,
+            pl=calculate_pl(spread.credit, exit_value, self.contracts),
+        )
+        return trade, exit_idx
+
+
+def _padded(series: np.ndarray, count: int) -> np.ndarray:
+    padded = np.full(count, np.nan)
+    if len(series):
+        padded[count - len(series) :] = series
+    return padded
+
+
+def _shifted(series: np.ndarray, lag: int) -> np.ndarray:
+    shifted = np.full(len(series), np.nan)
+    shifted[lag:] = series[:-lag]
+    return shifted
+
+
+def _rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    # Matches closes[-window:].min(), which uses fewer bars near the start.
+    padded = np.concatenate([np.full(window - 1, np.inf), values])
+    return np.lib.stride_tricks.sliding_window_view(padded, window).min(axis=1)
+
+
+def _nondecreasing(values: np.ndarray, count: int) -> np.ndarray:
+    # Whether each bar closes the run of `count` bars ending there without a drop.
+    with np.errstate(invalid="ignore"):
+        steps = np.diff(values, prepend=np.nan) >= 0
+    padded = np.concatenate([np.zeros(count - 2, dtype=bool), steps])
+    return np.lib.stride_tricks.sliding_window_view(padded, count - 1).all(axis=1)
+
+
+def _leg_prices(bids: np.ndarray, asks: np.ndarray, lasts: np.ndarray) -> np.ndarray:
+    # Same rule as OptionChain.prices: mid, falling back to last.
+    mids = (bids + asks) / 2
+    usable = ~np.isnan(mids) & (mids != 0)
+    return np.where(usable, mids, lasts)
+
+
+def _nullable(value: float) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
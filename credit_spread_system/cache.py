@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import inspect
+import logging
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_TTLS: dict[str, float] = {
+    "option": 15.0,
+    "underlying": 15.0,
+    "chain": 60.0,
+    "history": 86400.0,
+    "expirations": 86400.0,
+}
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_SHARDS = 16
+MIN_SHARD_ENTRIES = 64
+MIN_SHARD_BYTES = 1024 * 1024
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    expires_at: float
+    size: int
+
+
+class _Shard:
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+    def remove(self, key: str) -> _CacheEntry | None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+        return entry
+
+
+class MarketDataCache:
+    def __init__(
+        self,
+        default_ttl_seconds: float = 60.0,
+        ttl_by_kind: Mapping[str, float] | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        stale_grace_seconds: float = 0.0,
+        shards: int = DEFAULT_SHARDS,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        if shards <= 0:
+            raise ValueError("shards must be positive")
+        self._default_ttl_seconds = default_ttl_seconds
+        self._ttl_by_kind = dict(DEFAULT_CACHE_TTLS if ttl_by_kind is None else ttl_by_kind)
+        self.stale_grace_seconds = stale_grace_seconds
+        self._expire_listeners = _Listeners()
+        self._evict_listeners = _Listeners()
+        # Each shard has its own lock and a slice of the budgets, so concurrent
+        # sessions rarely contend. Small caches stay unsharded to keep exact LRU
+        # order and avoid fragmenting a tiny budget.
+        count = max(
+            1,
+            min(shards, max_entries // MIN_SHARD_ENTRIES, max_bytes // MIN_SHARD_BYTES),
+        )
+        self._shards = [
+            _Shard(
+                max_entries=max_entries // count + (index < max_entries % count),
+                max_bytes=max_bytes // count,
+            )
+            for index in range(count)
+        ]
+        self._sweeper: threading.Thread | None = None
+        self._sweeper_stop = threading.Event()
+
+    def ttl_for(self, key: str) -> float:
+        return self._ttl_by_kind.get(cache_kind(key), self._default_ttl_seconds)
+
+    def get(self, key: str) -> Any | None:
+        found = self.lookup(key)
+        if found is None or found[1]:
+            return None
+        return found[0]
+
+    def lookup(self, key: str) -> tuple[Any, bool] | None:
+        now = time.monotonic()
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is None:
+                return None
+            stale = now > entry.expires_at
+            expired = stale and now > entry.expires_at + self.stale_grace_seconds
+            if expired:
+                shard.remove(key)
+            else:
+                shard.entries.move_to_end(key)
+        if expired:
+            self._notify_expired([key])
+            return None
+        return entry.value, stale
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        now = time.monotonic()
+        ttl = self.ttl_for(key) if ttl_seconds is None else ttl_seconds
+        size = estimate_size(value)
+        shard = self._shard(key)
+        evicted: list[str] = []
+        with shard.lock:
+            shard.remove(key)
+            if size > shard.max_bytes:
+                logger.warning("Cache entry %s exceeds byte budget; not cached", key)
+                return
+            shard.entries[key] = _CacheEntry(value=value, expires_at=now + ttl, size=size)
+            shard.bytes += size
+            while len(shard.entries) > shard.max_entries or shard.bytes > shard.max_bytes:
+                evicted.append(next(iter(shard.entries)))
+                shard.remove(evicted[-1])
+        self._evict_listeners.notify(evicted)
+
+    def pop(self, key: str) -> Any | None:
+        shard = self._shard(key)
+        with shard.lock:
+            entry = shard.remove(key)
+            return entry.value if entry else None
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.bytes = 0
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        current = time.monotonic() if now is None else now
+        cutoff = current - self.stale_grace_seconds
+        expired: list[str] = []
+        for shard in self._shards:
+            with shard.lock:
+                keys = [key for key, entry in shard.entries.items() if cutoff > entry.expires_at]
+                for key in keys:
+                    shard.remove(key)
+            expired.extend(keys)
+        self._notify_expired(expired)
+        return len(expired)
+
+    def start_sweeper(self, interval_seconds: float = 60.0) -> None:
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        self._sweeper_stop.clear()
+        self._sweeper = threading.Thread(
+            target=_sweep_loop,
+            args=(weakref.ref(self), self._sweeper_stop, interval_seconds),
+            name="market-data-cache-sweeper",
+            daemon=True,
+        )
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        self._sweeper_stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=1.0)
+            self._sweeper = None
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._shards)
+
+    @property
+    def bytes_used(self) -> int:
+        return sum(shard.bytes for shard in self._shards)
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and key in self._shard(key).entries
+
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def subscribe(
+        self,
+        on_expire: Callable[[str], None] | None = None,
+        on_evict: Callable[[str], None] | None = None,
+    ) -> None:
+        if on_expire is not None:
+            self._expire_listeners.add(on_expire)
+        if on_evict is not None:
+            self._evict_listeners.add(on_evict)
+
+    def _notify_expired(self, keys: list[str]) -> None:
+        self._expire_listeners.notify(keys)
+
+
+class _Listeners:
+    # Bound methods are held weakly, so a cache shared between clients doesn't
+    # keep every client that ever subscribed alive.
+    def __init__(self) -> None:
+        self._refs: list[Callable[[], Callable[[str], None] | None]] = []
+        self._lock = threading.Lock()
+
+    def add(self, callback: Callable[[str], None]) -> None:
+        ref = weakref.WeakMethod(callback) if inspect.ismethod(callback) else lambda: callback
+        with self._lock:
+            self._refs.append(ref)
+
+    def notify(self, keys: Iterable[str]) -> None:
+        if not self._refs:
+            return
+        with self._lock:
+            live = [(ref, ref()) for ref in self._refs]
+            self._refs = [ref for ref, callback in live if callback is not None]
+        callbacks = [callback for _ref, callback in live if callback is not None]
+        for key in keys:
+            for callback in callbacks:
+                callback(key)
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = _Flight()
+                self._flights[key] = flight
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+        return flight.result
+
+    def in_flight(self, key: str) -> bool:
+        with self._lock:
+            return key in self._flights
+
+
+def cache_kind(key: str) -> str:
+    return key.split(":", 1)[0]
+
+
+def estimate_size(value: Any, _seen: set[int] | None = None) -> int:
+    seen = _seen if _seen is not None else set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, (str, bytes, bytearray, int, float, bool)) or value is None:
+        return size
+    if isinstance(value, Mapping):
+        return size + sum(
+            estimate_size(key, seen) + estimate_size(item, seen) for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(estimate_size(item, seen) for item in value)
+    if is_dataclass(value):
+        return size + sum(
+            estimate_size(getattr(value, field.name), seen) for field in fields(value)
+        )
+    if hasattr(value, "__dict__"):
+        return size + estimate_size(vars(value), seen)
+    return size
+
+
+def _sweep_loop(
+    cache_ref: "weakref.ref[MarketDataCache]", stop: threading.Event, interval_seconds: float
+) -> None:
+    while not stop.wait(interval_seconds):
+        cache = cache_ref()
+        if cache is None:
+            return
+        removed = cache.sweep()
+        if removed:
+            logger.debug("Swept %d expired cache entries", removed)
+        del cache
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import threading
+import time
+from enum import Enum
+from typing import Callable
+
+from credit_spread_system.rate_limit import is_throttling_error
+
+
+class BreakerState(str, Enum):
+    CLOSED = "CLOSED"
+    OPEN = "OPEN"
+    HALF_OPEN = "HALF_OPEN"
+
+
+class CircuitOpenError(RuntimeError):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold <= 0:
+            raise ValueError("failure_threshold must be positive")
+        self._failure_threshold = failure_threshold
+        self._reset_timeout_seconds = reset_timeout_seconds
+        self._clock = clock
+        self._state = BreakerState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> BreakerState:
+        with self._lock:
+            if self._state is BreakerState.OPEN and self._reset_elapsed():
+                return BreakerState.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state is BreakerState.CLOSED:
+                return True
+            if self._state is BreakerState.OPEN:
+                if not self._reset_elapsed():
+                    return False
+                self._state = BreakerState.HALF_OPEN
+                self._probe_in_flight = False
+            # Half-open lets a single probe through; everyone else fails fast
+            # until it reports back.
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = BreakerState.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+            if self._state is BreakerState.HALF_OPEN:
+                self._open()
+                return
+            self._failures += 1
+            if self._failures >= self._failure_threshold:
+                self._open()
+
+    def record_ignored(self) -> None:
+        # The provider answered, just not usefully; free a half-open probe slot
+        # without counting toward either outcome.
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _open(self) -> None:
+        self._state = BreakerState.OPEN
+        self._opened_at = self._clock()
+        self._failures = 0
+
+    def _reset_elapsed(self) -> bool:
+        return self._clock() - self._opened_at >= self._reset_timeout_seconds
+
+
+def is_outage_error(exc: BaseException) -> bool:
+    # Only transport failures, timeouts, throttling and 5xx responses say the
+    # endpoint is unhealthy; a bad symbol or a rejected request does not.
+    if is_throttling_error(exc) or isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    if "Timeout" in type(exc).__name__:
+        return True
+    for source in (exc, getattr(exc, "response", None)):
+        status = getattr(source, "status_code", None) or getattr(source, "status", None)
+        try:
+            if status is not None and int(status) >= 500:
+                return True
+        except (TypeError, ValueError):
+            continue
+    if "Connection" in type(exc).__name__:
+        return True
+    message = str(exc).lower()
+    return "timeout" in message or "timed out" in message or "connection" in message
+
+
+class NegativeCache:
+    def __init__(
+        self,
+        ttl_seconds: float = 10.0,
+        max_entries: int = 1_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._failures: dict[str, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, key: str, reason: str) -> None:
+        if self._ttl_seconds <= 0:
+            return
+        with self._lock:
+            if len(self._failures) >= self._max_entries:
+                self._failures.pop(next(iter(self._failures)))
+            self._failures[key] = (self._clock() + self._ttl_seconds, reason)
+
+    def get(self, key: str) -> str | None:
+        if not self._failures:
+            return None
+        with self._lock:
+            found = self._failures.get(key)
+            if found is None:
+                return None
+            expires_at, reason = found
+            if self._clock() > expires_at:
+                del self._failures[key]
+                return None
+            return reason
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._failures.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._failures)
@@ -27,6 +27,8 @@ class Config:
     alpaca_secret_key: str
     google_sheets_creds_path: str
     spreadsheet_id: str
+    market_data_dir: str | None = None
+    stale_while_revalidate_seconds: float = 0.0
 
 
 def _missing_vars(required: Iterable[str]) -> list[str]:
@@ -49,4 +51,6 @@ def load_config(env_path: str | None = None) -> Config:
         alpaca_secret_key=os.environ["ALPACA_SECRET_KEY"],
         google_sheets_creds_path=os.environ["GOOGLE_SHEETS_CREDS_PATH"],
         spreadsheet_id=os.environ["SPREADSHEET_ID"],
+        market_data_dir=os.getenv("MARKET_DATA_DIR") or None,
+        stale_while_revalidate_seconds=float(os.getenv("STALE_WHILE_REVALIDATE_SECONDS") or 0),
     )
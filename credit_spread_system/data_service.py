@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from dataclasses import dataclass
+from typing import Iterator
 
-from credit_spread_system.alpaca_client import AlpacaClient
+from credit_spread_system.alpaca_client import AlpacaClient, OptionLeg, Quote
+from credit_spread_system.async_alpaca_client import AsyncAlpacaClient
 from credit_spread_system.exit_rules import evaluate_position
 from credit_spread_system.market_state import get_market_status
 from credit_spread_system.models import Position
@@ -16,7 +19,13 @@ from credit_spread_system.portfolio_risk import (
 )
 from credit_spread_system.pricing import get_option_price, get_spread_value
 from credit_spread_system.sheets_client import SheetsClient
-from credit_spread_system.trade_suggestions import SuggestionEngine, TradeSuggestion
+from credit_spread_system.spread_search import DEFAULT_STRIKE_BAND
+from credit_spread_system.trade_suggestions import (
+    DEFAULT_SCAN_WORKERS,
+    SuggestionEngine,
+    TradeSuggestion,
+)
+from credit_spread_system.universe_index import UniverseIndex
 
 logger = logging.getLogger(__name__)
 
@@ -35,57 +44,57 @@ class EnrichedPosition:
 
 
 class DataService:
-    def __init__(self, sheets: SheetsClient, alpaca: AlpacaClient) -> None:
+    def __init__(
+        self,
+        sheets: SheetsClient,
+        alpaca: AlpacaClient,
+        universe_index: UniverseIndex | None = None,
+    ) -> None:
         self.sheets = sheets
         self.alpaca = alpaca
+        self.suggestion_engine = SuggestionEngine(
+            alpaca,
+            max_workers=DEFAULT_SCAN_WORKERS,
+            strike_band=DEFAULT_STRIKE_BAND,
+            universe_index=universe_index,
+        )
 
     def get_enriched_positions(self) -> list[EnrichedPosition]:
         positions = [Position.from_sheet_row(row) for row in self.sheets.get_all_positions()]
         enriched: list[EnrichedPosition] = []
 
+        legs = [leg for position in positions for leg in _position_legs(position)]
+        quotes = self.alpaca.get_option_quotes(legs) if legs else {}
+
         for position in positions:
             try:
-                symbol = position.symbol
-                expiration = position.expiration.isoformat()
-                short_quote = self.alpaca.get_option_quote(
-                    symbol, expiration, position.short_strike, "put"
-                )
-                long_quote = self.alpaca.get_option_quote(
-                    symbol, expiration, position.long_strike, "put"
-                )
-                short_price = get_option_price(short_quote)
-                long_price = get_option_price(long_quote)
-                spread_value = get_spread_value(short_price.price, long_price.price)
-
-                current_pl = (
-                    (position.entry_credit - spread_value) * 100 * position.contracts
-                    if spread_value is not None
-                    else None
-                )
+                underlying_price = self.alpaca.get_underlying_price(position.symbol)
+                enriched.append(_enrich_position(position, quotes, underlying_price))
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Failed to enrich position %s: %s", position, exc)
+                continue
 
-                underlying_price = self.alpaca.get_underlying_price(symbol)
+        return enriched
 
-                exit_action, exit_details = evaluate_position(
-                    position=position,
-                    current_spread_value=spread_value,
-                    underlying_price=underlying_price,
-                )
+    async def get_enriched_positions_async(
+        self, client: AsyncAlpacaClient | None = None
+    ) -> list[EnrichedPosition]:
+        positions = [Position.from_sheet_row(row) for row in self.sheets.get_all_positions()]
+        async_client = client or AsyncAlpacaClient(self.alpaca)
 
+        legs = [leg for position in positions for leg in _position_legs(position)]
+        symbols = list(dict.fromkeys(position.symbol for position in positions))
+        quotes, *prices = await asyncio.gather(
+            async_client.get_option_quotes(legs) if legs else _no_quotes(),
+            *(async_client.get_underlying_price(symbol) for symbol in symbols),
+        )
+        underlying_prices = dict(zip(symbols, prices))
+
+        enriched: list[EnrichedPosition] = []
+        for position in positions:
+            try:
                 enriched.append(
-                    EnrichedPosition(
-                        position=position,
-                        short_leg_price=short_price.price,
-                        long_leg_price=long_price.price,
-                        spread_value=spread_value,
-                        current_pl=current_pl,
-                        underlying_price=underlying_price,
-                        pricing_methods={
-                            "short": short_price.method,
-                            "long": long_price.method,
-                        },
-                        exit_action=str(exit_action),
-                        exit_details=exit_details,
-                    )
+                    _enrich_position(position, quotes, underlying_prices.get(position.symbol))
                 )
             except Exception as exc:  # noqa: BLE001
                 logger.warning("Failed to enrich position %s: %s", position, exc)
@@ -127,8 +136,70 @@ class DataService:
 
     def get_market_context(self) -> dict[str, object]:
         market_status = get_market_status()
-        return {"market_status": market_status, "quotes_stale": False}
+        return {
+            "market_status": market_status,
+            "quotes_stale": self.alpaca.has_stale_quotes(),
+            "stale_keys": len(self.alpaca.stale_keys()),
+            "degraded_endpoints": self.alpaca.open_circuits(),
+        }
 
     def get_daily_trade_suggestions(self) -> list[TradeSuggestion]:
-        engine = SuggestionEngine(self.alpaca)
-        return engine.generate_suggestions()
+        return self.suggestion_engine.generate_suggestions()
+
+    def iter_daily_trade_suggestions(self) -> Iterator[tuple[int, TradeSuggestion]]:
+        return self.suggestion_engine.generate_suggestions_iter()
+
+    async def get_daily_trade_suggestions_async(
+        self, client: AsyncAlpacaClient | None = None
+    ) -> list[TradeSuggestion]:
+        return await self.suggestion_engine.generate_suggestions_async(client=client)
+
+
+def _enrich_position(
+    position: Position,
+    quotes: dict[OptionLeg, Quote | None],
+    underlying_price: float | None,
+) -> EnrichedPosition:
+    short_leg, long_leg = _position_legs(position)
+    short_price = get_option_price(quotes.get(short_leg))
+    long_price = get_option_price(quotes.get(long_leg))
+    spread_value = get_spread_value(short_price.price, long_price.price)
+
+    current_pl = (
+        (position.entry_credit - spread_value) * 100 * position.contracts
+        if spread_value is not None
+        else None
+    )
+
+    exit_action, exit_details = evaluate_position(
+        position=position,
+        current_spread_value=spread_value,
+        underlying_price=underlying_price,
+    )
+
+    return EnrichedPosition(
+        position=position,
+        short_leg_price=short_price.price,
+        long_leg_price=long_price.price,
+        spread_value=spread_value,
+        current_pl=current_pl,
+        underlying_price=underlying_price,
+        pricing_methods={
+            "short": short_price.method,
+            "long": long_price.method,
+        },
+        exit_action=str(exit_action),
+        exit_details=exit_details,
+    )
+
+
+async def _no_quotes() -> dict[OptionLeg, Quote | None]:
+    return {}
+
+
+def _position_legs(position: Position) -> tuple[OptionLeg, OptionLeg]:
+    expiration = position.expiration.isoformat()
+    return (
+        OptionLeg(position.symbol, expiration, position.short_strike, "put"),
+        OptionLeg(position.symbol, expiration, position.long_strike, "put"),
+    )
@@ -5,6 +5,8 @@ from datetime import date
 from enum import Enum
 from typing import Optional
 
+import numpy as np
+
 from credit_spread_system.config import DTE_WARNING_DAYS, NEAR_BREACH_PCT, PROFIT_TARGET_PCT, STOP_LOSS_MULTIPLE
 from credit_spread_system.models import Position
 
@@ -38,7 +40,10 @@ def evaluate_stop_loss(entry_credit: float, current_spread_value: float) -> Exit
 
 
 def evaluate_dte(expiration: date, today: date) -> ExitSignal:
-    dte = (expiration - today).days
+    return _days_to_expiry_signal((expiration - today).days)
+
+
+def _days_to_expiry_signal(dte: int) -> ExitSignal:
     triggered = dte <= DTE_WARNING_DAYS
     return ExitSignal(triggered=triggered, reason="DTE_WARNING", threshold=DTE_WARNING_DAYS)
 
@@ -54,6 +59,15 @@ def evaluate_near_breach(underlying_price: float, short_strike: float) -> ExitSi
     return ExitSignal(triggered=triggered, reason="NEAR_BREACH", threshold=warning_level)
 
 
+# Closing rules in priority order, keyed by their evaluate_position detail name.
+_CLOSE_RULES = (
+    ("breach", Action.CLOSE_BREACH),
+    ("stop_loss", Action.STOP_LOSS),
+    ("profit_target", Action.TAKE_PROFIT),
+    ("dte_warning", Action.CLOSE_DTE),
+)
+
+
 def evaluate_position(
     position: Position,
     current_spread_value: Optional[float],
@@ -81,25 +95,48 @@ def evaluate_position(
     dte_signal = evaluate_dte(position.expiration, current_day)
     near_breach_signal = evaluate_near_breach(underlying_price, position.short_strike)
 
-    details.update(
-        {
-            "breach": breach_signal,
-            "stop_loss": stop_signal,
-            "profit_target": profit_signal,
-            "dte_warning": dte_signal,
-            "near_breach": near_breach_signal,
-        }
-    )
-
-    if breach_signal.triggered:
-        return Action.CLOSE_BREACH, details
-    if stop_signal.triggered:
-        return Action.STOP_LOSS, details
-    if profit_signal.triggered:
-        return Action.TAKE_PROFIT, details
-    if dte_signal.triggered:
-        return Action.CLOSE_DTE, details
+    signals = {
+        "breach": breach_signal,
+        "stop_loss": stop_signal,
+        "profit_target": profit_signal,
+        "dte_warning": dte_signal,
+        "near_breach": near_breach_signal,
+    }
+    details.update(signals)
+
+    for name, action in _CLOSE_RULES:
+        if signals[name].triggered:
+            return action, details
     if near_breach_signal.triggered:
         return Action.EVALUATE, details
 
     return Action.HOLD, details
+
+
+def first_exit(
+    entry_credit: float,
+    short_strike: float,
+    spread_values: np.ndarray,
+    underlying_prices: np.ndarray,
+    days_to_expiry: np.ndarray,
+) -> tuple[int, Optional[Action]]:
+    # evaluate_position over a whole daily path at once. Returns the index of the
+    # first day that closes the position and its action, or (-1, None).
+    values = np.asarray(spread_values, dtype=np.float64)
+    prices = np.asarray(underlying_prices, dtype=np.float64)
+    priced = ~np.isnan(values) & ~np.isnan(prices)
+    # The evaluate_* helpers compare elementwise, so they build the masks directly.
+    with np.errstate(invalid="ignore"):
+        signals = {
+            "breach": evaluate_breach(prices, short_strike),  # type: ignore[arg-type]
+            "stop_loss": evaluate_stop_loss(entry_credit, values),  # type: ignore[arg-type]
+            "profit_target": evaluate_profit_target(entry_credit, values),  # type: ignore[arg-type]
+            "dte_warning": _days_to_expiry_signal(np.asarray(days_to_expiry)),  # type: ignore[arg-type]
+        }
+    masks = [(np.asarray(signals[name].triggered), action) for name, action in _CLOSE_RULES]
+    triggered = priced & np.logical_or.reduce([mask for mask, _action in masks])
+    if not triggered.any():
+        return -1, None
+    idx = int(np.argmax(triggered))
+    action = next(action for mask, action in masks if mask[idx])
+    return idx, action
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import logging
+from datetime import date, timedelta
+from typing import Any, Callable, Iterable
+
+from credit_spread_system.market_state import trading_days
+
+logger = logging.getLogger(__name__)
+
+MIN_DTE = 30
+MAX_DTE = 45
+
+
+class ExpirationService:
+    def __init__(
+        self,
+        alpaca: Any,
+        min_dte: int = MIN_DTE,
+        max_dte: int = MAX_DTE,
+        today: Callable[[], date] = date.today,
+    ) -> None:
+        if min_dte < 0 or max_dte < min_dte:
+            raise ValueError("DTE window must satisfy 0 <= min_dte <= max_dte")
+        self.alpaca = alpaca
+        self.min_dte = min_dte
+        self.max_dte = max_dte
+        self._today = today
+
+    def window(self) -> tuple[date, date]:
+        today = self._today()
+        return today + timedelta(days=self.min_dte), today + timedelta(days=self.max_dte)
+
+    def select(self, symbol: str) -> list[str]:
+        start, end = self.window()
+        sessions = trading_days(start, end)
+        listed = self._listed(symbol)
+        if listed is None:
+            return _standard_expirations(start, end, sessions)
+
+        selected = []
+        for value in listed:
+            expiration = _parse(value)
+            if expiration is not None and start <= expiration <= end and expiration in sessions:
+                selected.append(expiration.isoformat())
+        return sorted(set(selected))
+
+    def _listed(self, symbol: str) -> list[str] | None:
+        if not hasattr(self.alpaca, "get_option_expirations"):
+            return None
+        try:
+            return self.alpaca.get_option_expirations(symbol)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed to list expirations for %s: %s", symbol, exc)
+            return None
+
+
+def _standard_expirations(start: date, end: date, sessions: Iterable[date]) -> list[str]:
+    # Without a listing endpoint, assume weekly Friday expirations, moved to the
+    # prior session when the Friday is a market holiday.
+    open_days = frozenset(sessions)
+    expirations = []
+    friday = start + timedelta(days=(4 - start.weekday()) % 7)
+    while friday <= end:
+        day = friday
+        while day not in open_days and day >= start and day > friday - timedelta(days=4):
+            day -= timedelta(days=1)
+        if day in open_days:
+            expirations.append(day.isoformat())
+        friday += timedelta(days=7)
+    return expirations
+
+
+def _parse(value: Any) -> date | None:
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
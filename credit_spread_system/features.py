@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Hashable, Mapping, Optional, Sequence
+
+import numpy as np
+
+from credit_spread_system.indicators import Indicators, compute_indicators
+
+MIN_LIQUID_VOLUME = 1_000_000
+SUPPORT_VOLUME_MULTIPLE = 1.2
+DEFAULT_FEATURE_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class TrendSignals:
+    above_50_and_rising: bool
+    above_20_and_50: bool
+    higher_lows: bool
+
+    @property
+    def score(self) -> int:
+        return int(self.above_50_and_rising) + int(self.above_20_and_50) + int(self.higher_lows)
+
+    @property
+    def any(self) -> bool:
+        return self.above_50_and_rising or self.above_20_and_50 or self.higher_lows
+
+
+@dataclass(frozen=True, eq=False)
+class SymbolFeatures:
+    symbol: str
+    last_date: Optional[date]
+    indicators: Indicators
+    liquid: bool
+    trend: TrendSignals
+    support_candidates: tuple[float, ...]
+    support: Optional[float]
+
+    @property
+    def closes(self) -> np.ndarray:
+        return self.indicators.closes
+
+    @property
+    def volumes(self) -> np.ndarray:
+        return self.indicators.volumes
+
+    @property
+    def moving_averages(self) -> Mapping[int, np.ndarray]:
+        return self.indicators.moving_averages
+
+    @classmethod
+    def build(cls, symbol: str, history: Sequence[Mapping[str, object]]) -> "SymbolFeatures":
+        indicators = compute_indicators(history)
+        candidates = tuple(
+            ma
+            for ma in (indicators.ma(50), indicators.ma(100), indicators.ma(200))
+            if ma is not None
+        )
+        return cls(
+            symbol=symbol,
+            last_date=indicators.last_date,
+            indicators=indicators,
+            liquid=_liquid(indicators),
+            trend=_trend(indicators),
+            support_candidates=candidates,
+            support=_support(indicators, candidates),
+        )
+
+
+class FeatureCache:
+    def __init__(self, max_entries: int = DEFAULT_FEATURE_CACHE_SIZE) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self._max_entries = max_entries
+        self._entries: OrderedDict[Hashable, SymbolFeatures] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(
+        self, symbol: str, history: Sequence[Mapping[str, object]]
+    ) -> SymbolFeatures:
+        key = _history_key(symbol, history)
+        if key is not None:
+            with self._lock:
+                features = self._entries.get(key)
+                if features is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return features
+                self.misses += 1
+
+        features = SymbolFeatures.build(symbol, history)
+        if key is not None:
+            with self._lock:
+                self._entries[key] = features
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+        return features
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_shared_cache: FeatureCache | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_feature_cache() -> FeatureCache:
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = FeatureCache()
+        return _shared_cache
+
+
+def _history_key(symbol: str, history: Sequence[Mapping[str, object]]) -> Optional[Hashable]:
+    # Keyed by the last bar's date. Its close and volume are included too, since
+    # the newest bar can still be updated intraday.
+    if not history:
+        return None
+    last = history[-1]
+    bar_date = last.get("date")
+    if bar_date is None:
+        return None
+    key = (symbol, str(bar_date), len(history), last.get("close"), last.get("volume"))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _liquid(indicators: Indicators) -> bool:
+    if indicators.bar_count < 20:
+        return False
+    avg_volume = indicators.average_volume()
+    return avg_volume is not None and avg_volume >= MIN_LIQUID_VOLUME
+
+
+def _trend(indicators: Indicators) -> TrendSignals:
+    last = indicators.last_close
+    ma20 = indicators.ma(20)
+    ma50 = indicators.ma(50)
+    if last is None or ma20 is None or ma50 is None:
+        return TrendSignals(False, False, False)
+
+    above_20_and_50 = last > ma20 and last > ma50
+    slope = indicators.ma_slope(50)
+    above_50_and_rising = last > ma50 and slope is not None and slope > 0
+    higher_lows = indicators.closes_nondecreasing(4)
+    return TrendSignals(above_50_and_rising, above_20_and_50, higher_lows)
+
+
+def _support(indicators: Indicators, candidates: tuple[float, ...]) -> Optional[float]:
+    recent_low = indicators.recent_low(20)
+    if len(indicators.closes) < 50 or recent_low is None or not candidates:
+        return None
+
+    support = min(candidates, key=lambda ma: abs(ma - recent_low))
+    avg_volume = indicators.average_volume() or 0.0
+    if indicators.last_volume < avg_volume * SUPPORT_VOLUME_MULTIPLE:
+        return None
+    return support
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+BAR_FIELDS = ("open", "high", "low", "close", "volume")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    symbol TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    volume REAL,
+    PRIMARY KEY (symbol, date)
+) WITHOUT ROWID
+"""
+
+
+class PriceHistoryStore:
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        if str(path) != ":memory:":
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(_SCHEMA)
+
+    def last_date(self, symbol: str) -> Optional[date]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(date) FROM bars WHERE symbol = ?", (symbol,)
+            ).fetchone()
+        return date.fromisoformat(row[0]) if row and row[0] else None
+
+    def count(self, symbol: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM bars WHERE symbol = ?", (symbol,)
+            ).fetchone()
+        return int(row[0]) if row else 0
+
+    def upsert(self, symbol: str, bars: Iterable[dict[str, Any]]) -> int:
+        rows = [
+            (symbol, bar["date"], *(bar.get(field) for field in BAR_FIELDS)) for bar in bars
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO bars (symbol, date, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def load(self, symbol: str, limit: int) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT date, open, high, low, close, volume FROM bars "
+                "WHERE symbol = ? ORDER BY date DESC LIMIT ?",
+                (symbol, limit),
+            ).fetchall()
+        bars: list[dict[str, Any]] = []
+        for row in reversed(rows):
+            bar: dict[str, Any] = {"date": row[0]}
+            for field, value in zip(BAR_FIELDS, row[1:]):
+                if value is not None:
+                    bar[field] = value
+            bars.append(bar)
+        return bars
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def normalize_bars(raw: Any) -> Optional[list[dict[str, Any]]]:
+    if raw is None:
+        return None
+    if isinstance(raw, dict):
+        items: Iterable[Any] = next(iter(raw.values()), []) if raw else []
+    elif hasattr(raw, "data") and not isinstance(raw, list):
+        data = raw.data  # type: ignore[attr-defined]
+        items = next(iter(data.values()), []) if isinstance(data, dict) else data
+    else:
+        items = raw
+
+    bars: list[dict[str, Any]] = []
+    for item in items:
+        bar_date = _bar_date(_field(item, "date") or _field(item, "timestamp"))
+        if bar_date is None:
+            return None
+        bar: dict[str, Any] = {"date": bar_date.isoformat()}
+        for field in BAR_FIELDS:
+            value = _field(item, field)
+            if value is not None:
+                bar[field] = float(value)
+        bars.append(bar)
+    return bars
+
+
+def sessions_since(last: date, today: date) -> int:
+    # Weekday count only; exchange holidays just cause a one-bar overlap.
+    count = 0
+    current = last + timedelta(days=1)
+    while current <= today:
+        if current.weekday() < 5:
+            count += 1
+        current += timedelta(days=1)
+    return count
+
+
+def _field(item: Any, name: str) -> Any:
+    if isinstance(item, dict):
+        return item.get(name)
+    return getattr(item, name, None)
+
+
+def _bar_date(value: Any) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).date()
+        except ValueError:
+            return None
+    return None
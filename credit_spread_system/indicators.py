@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+
+MA_WINDOWS = (20, 50, 100, 200)
+VOLUME_WINDOW = 20
+SLOPE_LAG = 5
+
+
+@dataclass(frozen=True, eq=False)
+class Indicators:
+    bar_count: int
+    closes: np.ndarray
+    volumes: np.ndarray
+    moving_averages: Mapping[int, np.ndarray]
+    volume_averages: np.ndarray
+    last_date: Optional[date]
+
+    @property
+    def last_close(self) -> Optional[float]:
+        return float(self.closes[-1]) if len(self.closes) else None
+
+    @property
+    def last_volume(self) -> float:
+        return float(self.volumes[-1]) if len(self.volumes) else 0.0
+
+    def ma(self, window: int) -> Optional[float]:
+        series = self.moving_averages.get(window)
+        return float(series[-1]) if series is not None and len(series) else None
+
+    def ma_slope(self, window: int, lag: int = SLOPE_LAG) -> Optional[float]:
+        series = self.moving_averages.get(window)
+        if series is None or len(series) <= lag:
+            return None
+        return float(series[-1] - series[-1 - lag])
+
+    def average_volume(self) -> Optional[float]:
+        return float(self.volume_averages[-1]) if len(self.volume_averages) else None
+
+    def recent_low(self, window: int = 20) -> Optional[float]:
+        return float(self.closes[-window:].min()) if len(self.closes) else None
+
+    def closes_nondecreasing(self, count: int) -> bool:
+        tail = self.closes[-count:]
+        return bool(np.all(tail[1:] >= tail[:-1]))
+
+
+def compute_indicators(
+    history: Sequence[Mapping[str, object]], windows: Iterable[int] = MA_WINDOWS
+) -> Indicators:
+    # Convert the bar dicts once; everything after this works on float arrays.
+    closes = _float_array([bar.get("close") for bar in history])
+    closes = closes[~np.isnan(closes)]
+    volumes = _float_array([bar.get("volume") for bar in history])
+    volumes[np.isnan(volumes)] = 0.0
+    close_sums = _prefix_sums(closes)
+
+    return Indicators(
+        bar_count=len(history),
+        closes=closes,
+        volumes=volumes,
+        moving_averages={window: _windowed(close_sums, window) for window in windows},
+        volume_averages=_windowed(_prefix_sums(volumes), VOLUME_WINDOW),
+        last_date=_parse_date(history[-1].get("date")) if history else None,
+    )
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    return _windowed(_prefix_sums(values), window)
+
+
+def _prefix_sums(values: np.ndarray) -> np.ndarray:
+    sums = np.empty(len(values) + 1, dtype=np.float64)
+    sums[0] = 0.0
+    np.cumsum(values, out=sums[1:])
+    return sums
+
+
+def _windowed(prefix_sums: np.ndarray, window: int) -> np.ndarray:
+    # Every window's mean from one cumulative sum instead of re-summing slices.
+    if window <= 0:
+        raise ValueError("window must be positive")
+    if len(prefix_sums) - 1 < window:
+        return np.empty(0, dtype=np.float64)
+    return (prefix_sums[window:] - prefix_sums[:-window]) / window
+
+
+def _float_array(values: list[object]) -> np.ndarray:
+    # NumPy converts numbers, numeric strings and None (as NaN) natively; only
+    # fall back to per-value parsing when a bar holds something unparseable.
+    try:
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        parsed = [_to_float(value) for value in values]
+        return np.array([np.nan if value is None else value for value in parsed], dtype=np.float64)
+
+
+def _parse_date(value: object) -> Optional[date]:
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).date()
+        except ValueError:
+            return None
+    return None
+
+
+def _to_float(value: object) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import logging
-import time
 from dataclasses import dataclass
-from typing import Iterable, Optional
+from typing import Any, Iterable, Optional
 
+from credit_spread_system.cache import MarketDataCache, SingleFlight
 from credit_spread_system.config import MIN_IV_RANK
 from credit_spread_system.event_log import log_event
 
@@ -20,9 +20,16 @@ class IvRankResult:
 
 
 class IvRankService:
-    def __init__(self, cache_ttl_seconds: int = 3600) -> None:
+    def __init__(self, cache_ttl_seconds: int = 3600, cache: Any | None = None) -> None:
         self._cache_ttl_seconds = cache_ttl_seconds
-        self._cache: dict[str, tuple[float, IvRankResult]] = {}
+        # Pass the client's MarketDataCache/SharedMarketDataCache to share results
+        # with other sessions; otherwise each service keeps its own.
+        self._cache = (
+            cache
+            if cache is not None
+            else MarketDataCache(default_ttl_seconds=cache_ttl_seconds, ttl_by_kind={})
+        )
+        self._single_flight = SingleFlight()
 
     def get_iv_rank(
         self,
@@ -30,6 +37,14 @@ class IvRankService:
         alpaca_client: object,
         min_iv_rank: int = MIN_IV_RANK,
     ) -> IvRankResult:
+        cached = self._get_cache(symbol)
+        if cached is not None:
+            return cached
+        return self._single_flight.do(
+            f"ivrank:{symbol}", lambda: self._compute(symbol, alpaca_client, min_iv_rank)
+        )
+
+    def _compute(self, symbol: str, alpaca_client: object, min_iv_rank: int) -> IvRankResult:
         cached = self._get_cache(symbol)
         if cached is not None:
             return cached
@@ -68,17 +83,10 @@ class IvRankService:
         return result
 
     def _get_cache(self, symbol: str) -> Optional[IvRankResult]:
-        cached = self._cache.get(symbol)
-        if not cached:
-            return None
-        timestamp, value = cached
-        if time.monotonic() - timestamp > self._cache_ttl_seconds:
-            self._cache.pop(symbol, None)
-            return None
-        return value
+        return self._cache.get(f"ivrank:{symbol}")
 
     def _set_cache(self, symbol: str, result: IvRankResult) -> None:
-        self._cache[symbol] = (time.monotonic(), result)
+        self._cache.set(f"ivrank:{symbol}", result, ttl_seconds=self._cache_ttl_seconds)
 
 
 def compute_iv_rank(iv_history: Iterable[float]) -> float:
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import functools
 import logging
-from datetime import datetime, time, timezone
+from datetime import date, datetime, time, timedelta, timezone
 from typing import Any
 
 import pandas_market_calendars as mcal
@@ -63,6 +64,24 @@ def get_market_status(now: datetime | None = None) -> dict[str, Any]:
     }
 
 
+def trading_days(start: date, end: date) -> frozenset[date]:
+    try:
+        return _calendar_trading_days(start, end)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Failed to load market calendar: %s", exc)
+        # Conservative fallback: treat weekdays as trading days
+        days = (start + timedelta(days=offset) for offset in range((end - start).days + 1))
+        return frozenset(day for day in days if day.weekday() < 5)
+
+
+# Only successful lookups are cached; a failed calendar load is retried next call.
+@functools.lru_cache(maxsize=64)
+def _calendar_trading_days(start: date, end: date) -> frozenset[date]:
+    calendar = mcal.get_calendar("NYSE")
+    schedule = calendar.schedule(start_date=start, end_date=end)
+    return frozenset(timestamp.date() for timestamp in schedule.index)
+
+
 def _normalize_now(now: datetime | None) -> datetime:
     current = now or datetime.now(timezone.utc)
     if current.tzinfo is None:
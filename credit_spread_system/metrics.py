@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import bisect
+import os
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Sequence
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_CACHE_EVENTS = ("hits", "misses", "stale_hits", "expirations")
+_PROVIDER_EVENTS = ("calls", "errors", "rejected")
+
+
+class LatencyHistogram:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        running = 0
+        rows = []
+        for bound, count in zip([*map(_format_bound, self.buckets), "+Inf"], self.counts):
+            running += count
+            rows.append((bound, running))
+        return rows
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "buckets": dict(self.cumulative()),
+        }
+
+
+class ClientMetrics:
+    def __init__(
+        self, prefix: str = "alpaca", buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+    ) -> None:
+        self._prefix = prefix
+        self._buckets = buckets
+        self._cache: dict[str, dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(_CACHE_EVENTS, 0)
+        )
+        self._provider: dict[str, dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(_PROVIDER_EVENTS, 0)
+        )
+        self._latency: dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record_cache(self, kind: str, event: str) -> None:
+        with self._lock:
+            self._cache[kind][event] += 1
+
+    def record_call(self, method: str, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            counters = self._provider[method]
+            counters["calls"] += 1
+            if error:
+                counters["errors"] += 1
+            histogram = self._latency.get(method)
+            if histogram is None:
+                histogram = self._latency[method] = LatencyHistogram(self._buckets)
+            histogram.observe(seconds)
+
+    def record_rejected(self, method: str) -> None:
+        with self._lock:
+            self._provider[method]["rejected"] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            cache = {}
+            for kind, counters in self._cache.items():
+                lookups = counters["hits"] + counters["stale_hits"] + counters["misses"]
+                served = counters["hits"] + counters["stale_hits"]
+                cache[kind] = {**counters, "hit_ratio": served / lookups if lookups else 0.0}
+            provider = {
+                method: {
+                    **counters,
+                    "latency_seconds": self._latency[method].snapshot()
+                    if method in self._latency
+                    else LatencyHistogram(self._buckets).snapshot(),
+                }
+                for method, counters in self._provider.items()
+            }
+        return {"cache": cache, "provider": provider}
+
+    def to_prometheus(self) -> str:
+        snapshot = self.snapshot()
+        lines: list[str] = []
+        for event in _CACHE_EVENTS:
+            name = f"{self._prefix}_cache_{event}_total"
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(
+                f'{name}{{kind="{kind}"}} {counters[event]}'
+                for kind, counters in sorted(snapshot["cache"].items())
+            )
+        for event in _PROVIDER_EVENTS:
+            name = f"{self._prefix}_provider_{event}_total"
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(
+                f'{name}{{method="{method}"}} {counters[event]}'
+                for method, counters in sorted(snapshot["provider"].items())
+            )
+        name = f"{self._prefix}_provider_latency_seconds"
+        lines.append(f"# TYPE {name} histogram")
+        for method, counters in sorted(snapshot["provider"].items()):
+            latency = counters["latency_seconds"]
+            lines.extend(
+                f'{name}_bucket{{method="{method}",le="{bound}"}} {count}'
+                for bound, count in latency["buckets"].items()
+            )
+            lines.append(f'{name}_sum{{method="{method}"}} {latency["sum"]:.6f}')
+            lines.append(f'{name}_count{{method="{method}"}} {latency["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str | Path) -> None:
+        # Write-then-rename so a textfile collector never scrapes a half-written file.
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        tmp.write_text(self.to_prometheus(), encoding="utf-8")
+        os.replace(tmp, target)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._provider.clear()
+            self._latency.clear()
+
+
+_shared_metrics: ClientMetrics | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_metrics() -> ClientMetrics:
+    global _shared_metrics
+    with _shared_lock:
+        if _shared_metrics is None:
+            _shared_metrics = ClientMetrics()
+        return _shared_metrics
+
+
+def _format_bound(bound: float) -> str:
+    return f"{bound:g}"
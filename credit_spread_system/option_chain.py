@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class OptionContract:
+    symbol: str
+    expiration: str
+    strike: float
+    option_type: str
+    bid: Optional[float]
+    ask: Optional[float]
+    last: Optional[float]
+    open_interest: Optional[int]
+
+
+@dataclass(frozen=True)
+class StrikeWindow:
+    low: Optional[float] = None
+    high: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.low is not None and self.high is not None and self.low > self.high:
+            raise ValueError("Strike window low must not exceed high")
+
+    @classmethod
+    def around(cls, price: float, band_pct: float) -> "StrikeWindow":
+        if band_pct < 0:
+            raise ValueError("band_pct must be non-negative")
+        return cls(low=price * (1 - band_pct), high=price * (1 + band_pct))
+
+    @property
+    def unbounded(self) -> bool:
+        return self.low is None and self.high is None
+
+    @property
+    def key(self) -> str:
+        return f"{_bound(self.low)}-{_bound(self.high)}"
+
+    def contains(self, other: "StrikeWindow") -> bool:
+        below = self.low is None or (other.low is not None and other.low >= self.low)
+        above = self.high is None or (other.high is not None and other.high <= self.high)
+        return below and above
+
+    def includes(self, strike: float) -> bool:
+        return (self.low is None or strike >= self.low) and (
+            self.high is None or strike <= self.high
+        )
+
+
+class OptionChain:
+    def __init__(
+        self,
+        symbols: np.ndarray,
+        expirations: np.ndarray,
+        strikes: np.ndarray,
+        option_types: np.ndarray,
+        bids: np.ndarray,
+        asks: np.ndarray,
+        lasts: np.ndarray,
+        open_interest: np.ndarray,
+    ) -> None:
+        order = np.argsort(strikes, kind="stable")
+        self.symbols = symbols[order]
+        self.expirations = expirations[order]
+        self.strikes = strikes[order]
+        self.option_types = option_types[order]
+        self.bids = bids[order]
+        self.asks = asks[order]
+        self.lasts = lasts[order]
+        self.open_interest = open_interest[order]
+
+    @classmethod
+    def from_columns(
+        cls,
+        symbols: Iterable[str],
+        expirations: Iterable[str],
+        strikes: Iterable[float],
+        option_types: Iterable[str],
+        bids: Iterable[Optional[float]],
+        asks: Iterable[Optional[float]],
+        lasts: Iterable[Optional[float]],
+        open_interest: Iterable[Optional[float]],
+    ) -> "OptionChain":
+        return cls(
+            symbols=np.asarray(list(symbols), dtype=str),
+            expirations=np.asarray(list(expirations), dtype=str),
+            strikes=np.asarray(list(strikes), dtype=np.float64),
+            option_types=np.char.lower(np.asarray(list(option_types), dtype=str)),
+            bids=_float_column(bids),
+            asks=_float_column(asks),
+            lasts=_float_column(lasts),
+            open_interest=_float_column(open_interest),
+        )
+
+    @classmethod
+    def from_contracts(cls, contracts: Iterable[OptionContract]) -> "OptionChain":
+        items = list(contracts)
+        return cls.from_columns(
+            symbols=[c.symbol for c in items],
+            expirations=[c.expiration for c in items],
+            strikes=[c.strike for c in items],
+            option_types=[c.option_type for c in items],
+            bids=[c.bid for c in items],
+            asks=[c.ask for c in items],
+            lasts=[c.last for c in items],
+            open_interest=[c.open_interest for c in items],
+        )
+
+    @classmethod
+    def from_raw(
+        cls, raw: Any, window: Optional[StrikeWindow] = None
+    ) -> Optional["OptionChain"]:
+        if raw is None:
+            return None
+        if isinstance(raw, list):
+            items = raw
+        elif hasattr(raw, "data"):
+            items = list(raw.data)  # type: ignore[attr-defined]
+        else:
+            items = []
+        if window is not None and not window.unbounded:
+            # Drop out-of-window rows before the per-field parsing below.
+            items = [item for item in items if window.includes(float(_field(item, "strike", 0.0)))]
+        return cls.from_columns(
+            symbols=[str(_field(item, "symbol", "")) for item in items],
+            expirations=[str(_field(item, "expiration", "")) for item in items],
+            strikes=[float(_field(item, "strike", 0.0)) for item in items],
+            option_types=[str(_field(item, "option_type", "put")) for item in items],
+            bids=[_priced_field(item, "bid") for item in items],
+            asks=[_priced_field(item, "ask") for item in items],
+            lasts=[_priced_field(item, "last") for item in items],
+            open_interest=[_field(item, "open_interest", None) for item in items],
+        )
+
+    @classmethod
+    def empty(cls) -> "OptionChain":
+        return cls.from_columns([], [], [], [], [], [], [], [])
+
+    def __len__(self) -> int:
+        return int(self.strikes.shape[0])
+
+    def __iter__(self) -> Iterator[OptionContract]:
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def __getitem__(self, idx: int) -> OptionContract:
+        return OptionContract(
+            symbol=str(self.symbols[idx]),
+            expiration=str(self.expirations[idx]),
+            strike=float(self.strikes[idx]),
+            option_type=str(self.option_types[idx]),
+            bid=_optional_float(self.bids[idx]),
+            ask=_optional_float(self.asks[idx]),
+            last=_optional_float(self.lasts[idx]),
+            open_interest=_optional_int(self.open_interest[idx]),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            column.nbytes
+            for column in (
+                self.symbols,
+                self.expirations,
+                self.strikes,
+                self.option_types,
+                self.bids,
+                self.asks,
+                self.lasts,
+                self.open_interest,
+            )
+        )
+
+    def select(self, mask: np.ndarray | slice) -> "OptionChain":
+        return OptionChain(
+            symbols=self.symbols[mask],
+            expirations=self.expirations[mask],
+            strikes=self.strikes[mask],
+            option_types=self.option_types[mask],
+            bids=self.bids[mask],
+            asks=self.asks[mask],
+            lasts=self.lasts[mask],
+            open_interest=self.open_interest[mask],
+        )
+
+    def within(self, window: StrikeWindow) -> "OptionChain":
+        if window.unbounded:
+            return self
+        start = 0 if window.low is None else np.searchsorted(self.strikes, window.low, "left")
+        stop = (
+            len(self)
+            if window.high is None
+            else np.searchsorted(self.strikes, window.high, "right")
+        )
+        if start == 0 and stop == len(self):
+            return self
+        return self.select(slice(int(start), int(stop)))
+
+    def of_type(self, option_type: str) -> "OptionChain":
+        mask = self.option_types == option_type.lower()
+        return self if bool(mask.all()) else self.select(mask)
+
+    def index_of(self, strikes: np.ndarray | float) -> np.ndarray:
+        targets = np.asarray(strikes, dtype=np.float64)
+        positions = np.searchsorted(self.strikes, targets, side="left")
+        clipped = np.minimum(positions, max(len(self) - 1, 0))
+        found = (positions < len(self)) & (self.strikes[clipped] == targets) if len(self) else False
+        return np.where(found, clipped, -1)
+
+    def find(self, strike: float) -> Optional[OptionContract]:
+        idx = int(self.index_of(strike))
+        return self[idx] if idx >= 0 else None
+
+    def mids(self) -> np.ndarray:
+        return (self.bids + self.asks) / 2
+
+    def prices(self) -> np.ndarray:
+        # Mid price with last as the fallback, matching pricing.get_option_price.
+        mids = self.mids()
+        usable = ~np.isnan(mids) & (mids != 0)
+        return np.where(usable, mids, self.lasts)
+
+
+@dataclass(frozen=True)
+class ChainSnapshot:
+    chain: OptionChain
+    fetched_at: float
+    version: int
+
+
+class ChainSnapshotIndex:
+    def __init__(
+        self,
+        max_age_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_age_seconds = max_age_seconds
+        self._clock = clock
+        self._snapshots: dict[tuple[str, str, str], ChainSnapshot] = {}
+        self._next_version = 1
+        self._lock = threading.Lock()
+
+    def put(self, symbol: str, expiration: str, option_type: str, chain: OptionChain) -> int:
+        now = self._clock()
+        with self._lock:
+            version = self._next_version
+            self._next_version += 1
+            self._snapshots[(symbol, expiration, option_type.lower())] = ChainSnapshot(
+                chain=chain, fetched_at=now, version=version
+            )
+            self._prune(now)
+        return version
+
+    def ensure(self, symbol: str, expiration: str, option_type: str, chain: OptionChain) -> int:
+        # Keeps the version of a live snapshot so re-serving a cached chain does not
+        # look like a new fetch.
+        now = self._clock()
+        key = (symbol, expiration, option_type.lower())
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and now - snapshot.fetched_at <= self._max_age_seconds:
+                return snapshot.version
+            version = self._next_version
+            self._next_version += 1
+            self._snapshots[key] = ChainSnapshot(chain=chain, fetched_at=now, version=version)
+            self._prune(now)
+        return version
+
+    def bump(self, symbol: str, expiration: str, option_type: str) -> Optional[int]:
+        # Marks new data for the key while keeping the snapshot's chain.
+        now = self._clock()
+        key = (symbol, expiration, option_type.lower())
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is None or now - snapshot.fetched_at > self._max_age_seconds:
+                return None
+            version = self._next_version
+            self._next_version += 1
+            self._snapshots[key] = replace(snapshot, version=version)
+        return version
+
+    def get(
+        self,
+        symbol: str,
+        expiration: str,
+        option_type: str,
+        max_age_seconds: Optional[float] = None,
+    ) -> Optional[ChainSnapshot]:
+        max_age = self._max_age_seconds if max_age_seconds is None else max_age_seconds
+        with self._lock:
+            snapshot = self._snapshots.get((symbol, expiration, option_type.lower()))
+        if snapshot is None or self._clock() - snapshot.fetched_at > max_age:
+            return None
+        return snapshot
+
+    def find(
+        self,
+        symbol: str,
+        expiration: str,
+        strike: float,
+        option_type: str,
+        max_age_seconds: Optional[float] = None,
+    ) -> Optional[OptionContract]:
+        snapshot = self.get(symbol, expiration, option_type, max_age_seconds)
+        if snapshot is None:
+            return None
+        return snapshot.chain.of_type(option_type).find(strike)
+
+    def version(self, symbol: str, expiration: str, option_type: str) -> Optional[int]:
+        snapshot = self.get(symbol, expiration, option_type)
+        return snapshot.version if snapshot else None
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def _prune(self, now: float) -> None:
+        expired = [
+            key
+            for key, snapshot in self._snapshots.items()
+            if now - snapshot.fetched_at > self._max_age_seconds
+        ]
+        for key in expired:
+            del self._snapshots[key]
+
+
+def _bound(value: Optional[float]) -> str:
+    return "*" if value is None else repr(float(value))
+
+
+def _float_column(values: Iterable[Any]) -> np.ndarray:
+    return np.asarray(
+        [np.nan if value is None else float(value) for value in values], dtype=np.float64
+    )
+
+
+def _field(item: Any, name: str, default: Any) -> Any:
+    if isinstance(item, dict):
+        return item.get(name, default)
+    return getattr(item, name, default)
+
+
+def _priced_field(item: Any, name: str) -> Any:
+    if isinstance(item, dict):
+        return item.get(f"{name}_price", item.get(name))
+    return getattr(item, f"{name}_price", getattr(item, name, None))
+
+
+def _optional_float(value: float) -> Optional[float]:
+    return None if math.isnan(value) else float(value)
+
+
+def _optional_int(value: float) -> Optional[int]:
+    return None if math.isnan(value) else int(value)
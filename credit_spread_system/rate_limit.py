@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    requests_per_second: float
+    burst: int
+
+
+# Alpaca's basic data plan allows roughly 200 requests per minute; split it
+# between option and stock endpoints.
+DEFAULT_RATE_LIMITS: dict[str, RateLimit] = {
+    "options": RateLimit(requests_per_second=1.6, burst=5),
+    "stocks": RateLimit(requests_per_second=1.6, burst=5),
+}
+THROTTLE_STATUS_CODES = {429, 503}
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        limit: RateLimit,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        min_rate_fraction: float = 0.1,
+    ) -> None:
+        if limit.requests_per_second <= 0 or limit.burst <= 0:
+            raise ValueError("rate limit must be positive")
+        self._base_rate = limit.requests_per_second
+        self._min_rate = limit.requests_per_second * min_rate_fraction
+        self._rate = limit.requests_per_second
+        self._capacity = float(limit.burst)
+        self._tokens = float(limit.burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    def acquire(self) -> float:
+        with self._lock:
+            self._refill()
+            # Reserve the token up front so concurrent callers queue behind each
+            # other instead of all waking at the same instant.
+            self._tokens -= 1.0
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def on_throttled(self) -> None:
+        with self._lock:
+            self._refill()
+            self._rate = max(self._min_rate, self._rate / 2)
+
+    def on_success(self) -> None:
+        with self._lock:
+            if self._rate < self._base_rate:
+                self._refill()
+                self._rate = min(self._base_rate, self._rate + self._base_rate * 0.1)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = max(0.0, now - self._updated_at)
+        self._tokens = min(self._capacity, self._tokens + elapsed * self._rate)
+        self._updated_at = now
+
+
+@dataclass
+class EndpointStats:
+    calls: int = 0
+    waits: int = 0
+    wait_seconds: float = 0.0
+    retries: int = 0
+    throttled: int = 0
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        limits: Mapping[str, RateLimit] | None = None,
+        max_retries: int = 4,
+        base_delay_seconds: float = 0.5,
+        max_delay_seconds: float = 16.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        jitter: Callable[[], float] = random.random,
+    ) -> None:
+        self._limits = dict(DEFAULT_RATE_LIMITS if limits is None else limits)
+        self._max_retries = max_retries
+        self._base_delay_seconds = base_delay_seconds
+        self._max_delay_seconds = max_delay_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._jitter = jitter
+        self._buckets: dict[str, TokenBucket] = {}
+        self._stats: dict[str, EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def call(self, endpoint: str, fn: Callable[..., T], *args: Any) -> T:
+        bucket = self._bucket(endpoint)
+        attempt = 0
+        while True:
+            waited = bucket.acquire() if bucket else 0.0
+            self._record(endpoint, waited=waited)
+            try:
+                result = fn(*args)
+            except Exception as exc:
+                if not is_throttling_error(exc) or attempt >= self._max_retries:
+                    raise
+                if bucket:
+                    bucket.on_throttled()
+                delay = self._backoff_delay(attempt)
+                self._record(endpoint, retried=True)
+                logger.info(
+                    "Provider throttled %s (%s); retrying in %.2fs", endpoint, exc, delay
+                )
+                self._sleep(delay)
+                attempt += 1
+                continue
+            if bucket:
+                bucket.on_success()
+            return result
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {
+                endpoint: {
+                    "calls": stats.calls,
+                    "waits": stats.waits,
+                    "wait_seconds": stats.wait_seconds,
+                    "retries": stats.retries,
+                    "throttled": stats.throttled,
+                }
+                for endpoint, stats in self._stats.items()
+            }
+
+    def _bucket(self, endpoint: str) -> TokenBucket | None:
+        with self._lock:
+            bucket = self._buckets.get(endpoint)
+            if bucket is None and endpoint in self._limits:
+                bucket = TokenBucket(self._limits[endpoint], clock=self._clock, sleep=self._sleep)
+                self._buckets[endpoint] = bucket
+            return bucket
+
+    def _backoff_delay(self, attempt: int) -> float:
+        ceiling = min(self._max_delay_seconds, self._base_delay_seconds * (2**attempt))
+        return ceiling * (0.5 + self._jitter() / 2)
+
+    def _record(self, endpoint: str, waited: float = 0.0, retried: bool = False) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(endpoint, EndpointStats())
+            if retried:
+                stats.retries += 1
+                stats.throttled += 1
+                return
+            stats.calls += 1
+            if waited > 0:
+                stats.waits += 1
+                stats.wait_seconds += waited
+
+
+_shared_limiter: RateLimiter | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_rate_limiter() -> RateLimiter:
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter()
+        return _shared_limiter
+
+
+def is_throttling_error(exc: BaseException) -> bool:
+    for source in (exc, getattr(exc, "response", None)):
+        status = getattr(source, "status_code", None) or getattr(source, "status", None)
+        try:
+            if status is not None and int(status) in THROTTLE_STATUS_CODES:
+                return True
+        except (TypeError, ValueError):
+            continue
+    message = str(exc).lower()
+    return "429" in message or "too many requests" in message or "rate limit" in message
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import IO, Any, Callable, Iterable, Mapping
+
+logger = logging.getLogger(__name__)
+
+
+class SessionRecorder:
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle: IO[str] = _open(self._path, "wt")
+        self._lock = threading.Lock()
+        self.records_written = 0
+
+    def wrap(self, provider: Any, name: str) -> "RecordingProvider":
+        return RecordingProvider(provider, self, name)
+
+    def record(
+        self,
+        provider: str,
+        method: str,
+        args: tuple[Any, ...],
+        result: Any,
+        latency: float,
+        error: str | None = None,
+        kwargs: Mapping[str, Any] | None = None,
+    ) -> None:
+        line = json.dumps(
+            {
+                "provider": provider,
+                "method": method,
+                "args": to_jsonable(args),
+                "kwargs": to_jsonable(dict(kwargs) if kwargs is not None else {}),
+                "result": to_jsonable(result),
+                "error": error,
+                "latency": round(latency, 6),
+            },
+            separators=(",", ":"),
+        )
+        with self._lock:
+            self._handle.write(line + "\n")
+            self.records_written += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._handle.close()
+
+    def __enter__(self) -> "SessionRecorder":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+
+class RecordingProvider:
+    def __init__(self, inner: Any, recorder: SessionRecorder, name: str) -> None:
+        self._inner = inner
+        self._recorder = recorder
+        self._name = name
+
+    def __getattr__(self, method: str) -> Any:
+        attr = getattr(self._inner, method)
+        if not callable(attr):
+            return attr
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                result = attr(*args, **kwargs)
+            except Exception as exc:
+                self._recorder.record(
+                    self._name,
+                    method,
+                    args,
+                    None,
+                    time.perf_counter() - start,
+                    error=repr(exc),
+                    kwargs=kwargs,
+                )
+                raise
+            self._recorder.record(
+                self._name, method, args, result, time.perf_counter() - start, kwargs=kwargs
+            )
+            return result
+
+        call.__name__ = method
+        return call
+
+
+class ReplayError(LookupError):
+    pass
+
+
+class ReplayProvider:
+    def __init__(
+        self,
+        name: str,
+        records: Iterable[Mapping[str, Any]],
+        honor_latency: bool = False,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._name = name
+        self._honor_latency = honor_latency
+        self._sleep = sleep
+        self._responses: dict[tuple[str, str], deque[Mapping[str, Any]]] = defaultdict(deque)
+        self._last: dict[tuple[str, str], Mapping[str, Any]] = {}
+        self._lock = threading.Lock()
+        for record in records:
+            key = _args_key(record["args"], record.get("kwargs") or {})
+            self._responses[(record["method"], key)].append(record)
+        self._methods = {method for method, _args in self._responses}
+
+    def __getattr__(self, method: str) -> Any:
+        if method.startswith("_") or method not in self._methods:
+            raise AttributeError(f"{self._name} replay has no recorded calls to {method}")
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            key = (method, _args_key(to_jsonable(args), to_jsonable(kwargs)))
+            with self._lock:
+                queue = self._responses.get(key)
+                if queue:
+                    record = queue.popleft()
+                    self._last[key] = record
+                elif key in self._last:
+                    # Replays loop over the last response so benchmarks can repeat a session.
+                    record = self._last[key]
+                else:
+                    raise ReplayError(
+                        f"No recorded {self._name}.{method} call for {args!r} {kwargs!r}"
+                    )
+            if self._honor_latency:
+                self._sleep(float(record.get("latency", 0.0)))
+            if record.get("error"):
+                raise ReplayError(f"Recorded failure: {record['error']}")
+            return from_jsonable(record["result"])
+
+        call.__name__ = method
+        return call
+
+
+class ReplaySession:
+    def __init__(
+        self,
+        records: list[Mapping[str, Any]],
+        honor_latency: bool = False,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._records = records
+        self._honor_latency = honor_latency
+        self._sleep = sleep
+
+    @classmethod
+    def load(
+        cls,
+        path: str | Path,
+        honor_latency: bool = False,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> "ReplaySession":
+        with _open(Path(path), "rt") as handle:
+            records = [json.loads(line) for line in handle if line.strip()]
+        return cls(records, honor_latency=honor_latency, sleep=sleep)
+
+    def provider(self, name: str) -> ReplayProvider:
+        return ReplayProvider(
+            name,
+            (record for record in self._records if record["provider"] == name),
+            honor_latency=self._honor_latency,
+            sleep=self._sleep,
+        )
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+def to_jsonable(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if is_dataclass(value) and not isinstance(value, type):
+        return to_jsonable(asdict(value))
+    if isinstance(value, Mapping):
+        if all(isinstance(key, str) for key in value):
+            return {key: to_jsonable(item) for key, item in value.items()}
+        return {"__pairs__": [[to_jsonable(key), to_jsonable(item)] for key, item in value.items()]}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [to_jsonable(item) for item in value]
+    if hasattr(value, "model_dump"):
+        return to_jsonable(value.model_dump())
+    if hasattr(value, "__dict__"):
+        return to_jsonable({k: v for k, v in vars(value).items() if not k.startswith("_")})
+    return str(value)
+
+
+def from_jsonable(value: Any) -> Any:
+    if isinstance(value, list):
+        return [from_jsonable(item) for item in value]
+    if isinstance(value, dict):
+        if set(value) == {"__pairs__"}:
+            return {_hashable(key): from_jsonable(item) for key, item in value["__pairs__"]}
+        return {key: from_jsonable(item) for key, item in value.items()}
+    return value
+
+
+def _hashable(value: Any) -> Any:
+    if isinstance(value, dict):
+        return tuple(_hashable(item) for item in value.values())
+    if isinstance(value, list):
+        return tuple(_hashable(item) for item in value)
+    return value
+
+
+def _args_key(args: Any, kwargs: Any) -> str:
+    return json.dumps([args, kwargs], sort_keys=True, separators=(",", ":"))
+
+
+def _open(path: Path, mode: str) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode, encoding="utf-8")  # type: ignore[return-value]
+    return open(path, mode.replace("t", ""), encoding="utf-8")
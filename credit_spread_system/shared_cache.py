@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+from pathlib import Path
+from typing import Any, Callable, Mapping, Optional
+
+from credit_spread_system.cache import (
+    DEFAULT_CACHE_TTLS,
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_ENTRIES,
+    _Listeners,
+    _sweep_loop,
+    cache_kind,
+)
+
+logger = logging.getLogger(__name__)
+
+# Trims free a tenth of each budget.
+TRIM_HEADROOM = 10
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS entries (
+        key TEXT PRIMARY KEY,
+        value BLOB NOT NULL,
+        expires_at REAL NOT NULL,
+        size INTEGER NOT NULL,
+        accessed_at REAL NOT NULL DEFAULT 0
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS leases (
+        key TEXT PRIMARY KEY,
+        holder TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    ) WITHOUT ROWID
+    """,
+)
+
+
+class SharedMarketDataCache:
+    # Same interface as MarketDataCache, but entries live in a SQLite file in WAL
+    # mode so every dashboard process on the host reads and fills one cache. Expiry
+    # and LRU order use wall-clock time because monotonic clocks are not comparable
+    # across processes.
+    def __init__(
+        self,
+        path: str | Path,
+        default_ttl_seconds: float = 60.0,
+        ttl_by_kind: Mapping[str, float] | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        stale_grace_seconds: float = 0.0,
+        lease_seconds: float = 30.0,
+        poll_interval_seconds: float = 0.05,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._default_ttl_seconds = default_ttl_seconds
+        self._ttl_by_kind = dict(DEFAULT_CACHE_TTLS if ttl_by_kind is None else ttl_by_kind)
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        # Upper bound on this process's view of the table since the last exact
+        # count, so most writes skip the full-table size query.
+        self._estimated_entries = max_entries + 1
+        self._estimated_bytes = 0
+        self.stale_grace_seconds = stale_grace_seconds
+        self._expire_listeners = _Listeners()
+        self._evict_listeners = _Listeners()
+        self._lease_seconds = lease_seconds
+        self._poll_interval_seconds = poll_interval_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._conn = sqlite3.connect(
+            str(self._path), timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        self._sweeper: threading.Thread | None = None
+        self._sweeper_stop = threading.Event()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(entries)")}
+            if "accessed_at" not in columns:
+                self._conn.execute(
+                    "ALTER TABLE entries ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0"
+                )
+
+    def ttl_for(self, key: str) -> float:
+        return self._ttl_by_kind.get(cache_kind(key), self._default_ttl_seconds)
+
+    def get(self, key: str) -> Any | None:
+        found = self.lookup(key)
+        if found is None or found[1]:
+            return None
+        return found[0]
+
+    def lookup(self, key: str) -> tuple[Any, bool] | None:
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        blob, expires_at = row
+        stale = now > expires_at
+        if stale and now > expires_at + self.stale_grace_seconds:
+            self._delete(key)
+            self._expire_listeners.notify([key])
+            return None
+        value = self._load(key, blob)
+        if value is None:
+            return None
+        with self._lock:
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return value, stale
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = self.ttl_for(key) if ttl_seconds is None else ttl_seconds
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self._max_bytes:
+            logger.warning("Cache entry %s exceeds byte budget; not cached", key)
+            return
+        now = self._clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at, size, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, blob, now + ttl, len(blob), now),
+            )
+            self._estimated_entries += 1
+            self._estimated_bytes += len(blob)
+            evicted: list[str] = []
+            if (
+                self._estimated_entries > self._max_entries
+                or self._estimated_bytes > self._max_bytes
+            ):
+                evicted = self._trim()
+        self._evict_listeners.notify(evicted)
+
+    def pop(self, key: str) -> Any | None:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        return None if row is None else self._load(key, row[0])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM leases")
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        current = self._clock() if now is None else now
+        cutoff = current - self.stale_grace_seconds
+        with self._lock:
+            expired = [
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT key FROM entries WHERE expires_at < ?", (cutoff,)
+                ).fetchall()
+            ]
+            self._conn.execute("DELETE FROM entries WHERE expires_at < ?", (cutoff,))
+            self._conn.execute("DELETE FROM leases WHERE expires_at < ?", (current,))
+            trimmed = self._trim()
+        self._expire_listeners.notify(expired)
+        self._evict_listeners.notify(trimmed)
+        return len(expired) + len(trimmed)
+
+    def subscribe(
+        self,
+        on_expire: Callable[[str], None] | None = None,
+        on_evict: Callable[[str], None] | None = None,
+    ) -> None:
+        if on_expire is not None:
+            self._expire_listeners.add(on_expire)
+        if on_evict is not None:
+            self._evict_listeners.add(on_evict)
+
+    def acquire_lease(self, key: str) -> Optional[str]:
+        token = uuid.uuid4().hex
+        now = self._clock()
+        with self._lock:
+            acquired = self._conn.execute(
+                "INSERT INTO leases (key, holder, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET holder = excluded.holder, "
+                "expires_at = excluded.expires_at WHERE leases.expires_at < ?",
+                (key, token, now + self._lease_seconds, now),
+            ).rowcount
+        return token if acquired else None
+
+    def release_lease(self, key: str, token: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM leases WHERE key = ? AND holder = ?", (key, token)
+            )
+
+    def claim(self, key: str) -> tuple[Optional[str], Any]:
+        # Returns a lease token when the caller should fetch, or the value another
+        # process stored while we waited. If the holder never delivers within the
+        # lease window, the caller gets (None, None) and fetches without a lease.
+        deadline = self._clock() + self._lease_seconds
+        while True:
+            token = self.acquire_lease(key)
+            if token is not None:
+                # The previous holder may have filled the key just before releasing.
+                value = self.get(key)
+                if value is None:
+                    return token, None
+                self.release_lease(key, token)
+                return None, value
+            value = self.get(key)
+            if value is not None:
+                return None, value
+            if self._clock() >= deadline:
+                return None, None
+            self._sleep(self._poll_interval_seconds)
+
+    def start_sweeper(self, interval_seconds: float = 60.0) -> None:
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        self._sweeper_stop.clear()
+        self._sweeper = threading.Thread(
+            target=_sweep_loop,
+            args=(weakref.ref(self), self._sweeper_stop, interval_seconds),
+            name="shared-market-data-cache-sweeper",
+            daemon=True,
+        )
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        self._sweeper_stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=1.0)
+            self._sweeper = None
+
+    def close(self) -> None:
+        self.stop_sweeper()
+        with self._lock:
+            self._conn.close()
+
+    @property
+    def bytes_used(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return int(row[0])
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        return int(row[0])
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def _load(self, key: str, blob: bytes) -> Any | None:
+        try:
+            return pickle.loads(blob)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Dropping unreadable shared cache entry %s: %s", key, exc)
+            self._delete(key)
+            return None
+
+    def _trim(self) -> list[str]:
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        removed: list[str] = []
+        if count > self._max_entries or total > self._max_bytes:
+            # Trim below the budgets so the next few writes don't each pay for a recount.
+            max_entries = self._max_entries - self._max_entries // TRIM_HEADROOM
+            max_bytes = self._max_bytes - self._max_bytes // TRIM_HEADROOM
+            cursor = self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at")
+            for key, size in cursor:
+                if count <= max_entries and total <= max_bytes:
+                    break
+                removed.append(key)
+                count -= 1
+                total -= size
+            cursor.close()
+            self._conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in removed])
+        self._estimated_entries = count
+        self._estimated_bytes = total
+        return removed
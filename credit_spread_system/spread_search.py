@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Iterable, Sequence
+
+import numpy as np
+
+from credit_spread_system.option_chain import OptionChain, OptionContract, StrikeWindow
+
+DEFAULT_WIDTHS = (5.0, 10.0)
+MAX_BID_ASK_SPREAD = 0.10
+MIN_OPEN_INTEREST = 500
+MIN_CREDIT_FRACTION = 1 / 3
+DEFAULT_STRIKE_BAND = 0.15
+
+# (credits, widths, short_strikes, support) -> scores, all broadcast to (widths, strikes).
+ScoreFn = Callable[[np.ndarray, np.ndarray, np.ndarray, float], np.ndarray]
+
+
+@dataclass(frozen=True)
+class SpreadCandidate:
+    short_strike: float
+    long_strike: float
+    credit: float
+    score: float
+
+    @property
+    def width(self) -> float:
+        return self.short_strike - self.long_strike
+
+
+def credit_and_cushion_score(
+    credits: np.ndarray, widths: np.ndarray, short_strikes: np.ndarray, support: float
+) -> np.ndarray:
+    # Return on risk plus the short strike's distance below support, both as fractions.
+    cushion = (support - short_strikes) / support if support else 0.0
+    return credits / widths + cushion
+
+
+def search_window(
+    support: float, band_pct: float = DEFAULT_STRIKE_BAND, widths: Iterable[float] = DEFAULT_WIDTHS
+) -> StrikeWindow:
+    # Short strikes sit below support; long legs need up to one width beneath the band.
+    return StrikeWindow(low=support * (1 - band_pct) - max(widths, default=0.0), high=support)
+
+
+def search_spreads(
+    chain: OptionChain | Sequence[OptionContract],
+    support: float,
+    widths: Iterable[float] = DEFAULT_WIDTHS,
+    top_k: int = 1,
+    score: ScoreFn = credit_and_cushion_score,
+) -> list[SpreadCandidate]:
+    table = chain if isinstance(chain, OptionChain) else OptionChain.from_contracts(chain)
+    puts = table.of_type("put")
+    width_list = [float(width) for width in widths]
+    if not len(puts) or not width_list or top_k <= 0:
+        return []
+
+    strikes = puts.strikes
+    prices = puts.prices()
+    quoted = ~np.isnan(puts.bids) & ~np.isnan(puts.asks)
+    wide = quoted & (np.round(puts.asks - puts.bids, 2) > MAX_BID_ASK_SPREAD)
+    thin = ~np.isnan(puts.open_interest) & (puts.open_interest < MIN_OPEN_INTEREST)
+    eligible = (strikes < support) & ~np.isnan(prices) & ~wide & ~thin
+
+    # One (widths x strikes) grid: row w holds every short strike paired with the
+    # long leg `width` below it, located through the chain's sorted strike index.
+    width_grid = np.asarray(width_list, dtype=np.float64)[:, None]
+    long_idx = puts.index_of(strikes[None, :] - width_grid)
+    has_long = long_idx >= 0
+    long_prices = np.where(has_long, prices[np.where(has_long, long_idx, 0)], np.nan)
+    credits = prices[None, :] - long_prices
+    with np.errstate(invalid="ignore"):
+        acceptable = (
+            eligible[None, :]
+            & has_long
+            & ~np.isnan(long_prices)
+            & (credits > width_grid * MIN_CREDIT_FRACTION)
+        )
+    if not acceptable.any():
+        return []
+
+    rows, cols = np.nonzero(acceptable)
+    scores = np.asarray(
+        score(credits, np.broadcast_to(width_grid, credits.shape), strikes[None, :], support),
+        dtype=np.float64,
+    )
+    scores = np.broadcast_to(scores, credits.shape)[rows, cols]
+    # Highest score first; ties go to the lower short strike, then the narrower width.
+    order = np.lexsort((rows, strikes[cols], -scores))[:top_k]
+    return [
+        SpreadCandidate(
+            short_strike=float(strikes[cols[i]]),
+            long_strike=float(strikes[cols[i]] - width_list[rows[i]]),
+            credit=float(credits[rows[i], cols[i]]),
+            score=float(scores[i]),
+        )
+        for i in order
+    ]
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Iterable, Optional, Protocol
+
+from credit_spread_system.alpaca_client import AlpacaClient, OptionLeg, Quote
+from credit_spread_system.models import Position
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class QuoteUpdate:
+    symbol: str
+    bid: Optional[float]
+    ask: Optional[float]
+    last: Optional[float]
+    timestamp: Optional[datetime] = None
+    leg: Optional[OptionLeg] = None
+
+    @property
+    def stream_key(self) -> str:
+        return self.leg.occ_symbol if self.leg else self.symbol
+
+
+UpdateHandler = Callable[[QuoteUpdate], None]
+
+
+class QuoteFeed(Protocol):
+    def subscribe(self, keys: Iterable[str], handler: UpdateHandler) -> None: ...
+
+    def unsubscribe(self, keys: Iterable[str]) -> None: ...
+
+
+class LocalQuoteFeed:
+    def __init__(self) -> None:
+        self._handlers: dict[str, UpdateHandler] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, keys: Iterable[str], handler: UpdateHandler) -> None:
+        with self._lock:
+            for key in keys:
+                self._handlers[key] = handler
+
+    def unsubscribe(self, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._handlers.pop(key, None)
+
+    def subscribed(self) -> set[str]:
+        with self._lock:
+            return set(self._handlers)
+
+    def publish(self, update: QuoteUpdate) -> bool:
+        with self._lock:
+            handler = self._handlers.get(update.stream_key)
+        if handler is None:
+            return False
+        handler(update)
+        return True
+
+
+class QuoteStreamManager:
+    def __init__(self, alpaca: AlpacaClient, feed: QuoteFeed) -> None:
+        self.alpaca = alpaca
+        self.feed = feed
+        self._legs: dict[str, OptionLeg] = {}
+        self._underlyings: set[str] = set()
+        self._lock = threading.Lock()
+        self.updates_applied = 0
+        self.updates_dropped = 0
+
+    def subscribe_positions(self, positions: Iterable[Position]) -> None:
+        legs: list[OptionLeg] = []
+        for position in positions:
+            expiration = position.expiration.isoformat()
+            legs.append(OptionLeg(position.symbol, expiration, position.short_strike, "put"))
+            legs.append(OptionLeg(position.symbol, expiration, position.long_strike, "put"))
+        self.subscribe_legs(legs)
+        self.subscribe_underlyings(position.symbol for position in positions)
+
+    def subscribe_legs(self, legs: Iterable[OptionLeg]) -> None:
+        with self._lock:
+            new = {leg.occ_symbol: leg for leg in legs if leg.occ_symbol not in self._legs}
+            self._legs.update(new)
+        if new:
+            self.feed.subscribe(new.keys(), self._on_update)
+
+    def subscribe_underlyings(self, symbols: Iterable[str]) -> None:
+        with self._lock:
+            new = {symbol for symbol in symbols if symbol not in self._underlyings}
+            self._underlyings.update(new)
+        if new:
+            self.feed.subscribe(sorted(new), self._on_update)
+
+    def sync_positions(self, positions: Iterable[Position], universe: Iterable[str] = ()) -> None:
+        position_list = list(positions)
+        wanted_legs = {
+            OptionLeg(p.symbol, p.expiration.isoformat(), strike, "put").occ_symbol
+            for p in position_list
+            for strike in (p.short_strike, p.long_strike)
+        }
+        wanted_symbols = {p.symbol for p in position_list} | set(universe)
+        with self._lock:
+            stale_legs = [self._legs.pop(key) for key in list(self._legs) if key not in wanted_legs]
+            stale_symbols = sorted(self._underlyings - wanted_symbols)
+            self._underlyings.difference_update(stale_symbols)
+        if stale_legs or stale_symbols:
+            self.feed.unsubscribe([leg.occ_symbol for leg in stale_legs] + stale_symbols)
+            self.alpaca.forget_streamed(stale_legs, stale_symbols)
+        self.subscribe_positions(position_list)
+        self.subscribe_underlyings(wanted_symbols)
+
+    def subscriptions(self) -> set[str]:
+        with self._lock:
+            return set(self._legs) | set(self._underlyings)
+
+    def close(self) -> None:
+        with self._lock:
+            legs = list(self._legs.values())
+            symbols = sorted(self._underlyings)
+            self._legs.clear()
+            self._underlyings.clear()
+        if legs or symbols:
+            self.feed.unsubscribe([leg.occ_symbol for leg in legs] + symbols)
+            self.alpaca.forget_streamed(legs, symbols)
+
+    def _on_update(self, update: QuoteUpdate) -> None:
+        # Real feeds deliver bare OCC symbols, so resolve the leg from our own map.
+        with self._lock:
+            leg = update.leg if update.leg is not None else self._legs.get(update.symbol)
+        try:
+            if leg is not None:
+                quote = Quote(
+                    bid=update.bid, ask=update.ask, last=update.last, timestamp=update.timestamp
+                )
+                applied = self.alpaca.apply_option_quote(leg, quote)
+            else:
+                price = update.last
+                if price is None and update.bid is not None and update.ask is not None:
+                    price = (update.bid + update.ask) / 2
+                applied = price is not None and self.alpaca.apply_underlying_price(
+                    update.symbol, price, update.timestamp
+                )
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed to apply streamed quote for %s: %s", update.stream_key, exc)
+            applied = False
+        with self._lock:
+            if applied:
+                self.updates_applied += 1
+            else:
+                self.updates_dropped += 1
@@ -1,6 +1,14 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
 from types import SimpleNamespace
 
-from credit_spread_system.alpaca_client import AlpacaClient
+from credit_spread_system.alpaca_client import AlpacaClient, OptionLeg
+from credit_spread_system.cache import MarketDataCache
+from credit_spread_system.history_store import PriceHistoryStore
+from credit_spread_system.option_chain import StrikeWindow
+from credit_spread_system.rate_limit import RateLimiter
 
 
 def test_get_option_quote_cached(monkeypatch):
@@ -14,7 +22,7 @@ def test_get_option_quote_cached(monkeypatch):
     client = AlpacaClient(options_client=FakeOptionsClient(), market_client=None, cache_ttl_seconds=60)
 
     times = iter([0.0, 10.0, 20.0])
-    monkeypatch.setattr("credit_spread_system.alpaca_client.time.monotonic", lambda: next(times))
+    monkeypatch.setattr("credit_spread_system.cache.time.monotonic", lambda: next(times))
 
     first = client.get_option_quote("SPY", "2026-02-20", 450.0, "put")
     second = client.get_option_quote("SPY", "2026-02-20", 450.0, "put")
@@ -73,7 +81,7 @@ def test_get_price_history_cached(monkeypatch):
 
     client = AlpacaClient(options_client=None, market_client=FakeMarketClient(), cache_ttl_seconds=60)
     times = iter([0.0, 10.0, 20.0])
-    monkeypatch.setattr("credit_spread_system.alpaca_client.time.monotonic", lambda: next(times))
+    monkeypatch.setattr("credit_spread_system.cache.time.monotonic", lambda: next(times))
 
     first = client.get_price_history("SPY", days=10)
     second = client.get_price_history("SPY", days=10)
@@ -103,3 +111,783 @@ def test_get_option_chain_normalizes_dicts():
 
     assert chain is not None
     assert chain[0].open_interest == 600
+
+
+def test_get_option_quotes_batches_and_fills_cache():
+    calls = []
+
+    class FakeOptionsClient:
+        def get_latest_option_quotes(self, legs):
+            calls.append(list(legs))
+            return [{"bid": 1.0 + idx, "ask": 1.2 + idx} for idx, _leg in enumerate(legs)]
+
+        def get_latest_option_quote(self, *_args):
+            raise AssertionError("per-leg quote should come from cache")
+
+    client = AlpacaClient(options_client=FakeOptionsClient(), market_client=None)
+    legs = [
+        OptionLeg("SPY", "2026-03-20", 450.0, "put"),
+        OptionLeg("SPY", "2026-03-20", 445.0, "put"),
+        OptionLeg("SPY", "2026-03-20", 450.0, "put"),
+    ]
+    quotes = client.get_option_quotes(legs)
+
+    assert len(calls) == 1
+    assert len(calls[0]) == 2
+    assert quotes[legs[1]] is not None
+    assert quotes[legs[1]].bid == 2.0
+    assert client.get_option_quote("SPY", "2026-03-20", 450.0, "put") == quotes[legs[0]]
+
+
+def test_get_option_quotes_mismatched_batch_leaves_legs_empty():
+    calls = {"count": 0}
+
+    class FakeOptionsClient:
+        def get_latest_option_quotes(self, legs):
+            calls["count"] += 1
+            return [{"bid": 1.0, "ask": 1.1}]
+
+    client = AlpacaClient(options_client=FakeOptionsClient(), market_client=None)
+    legs = [OptionLeg("SPY", "2026-03-20", 450.0), OptionLeg("SPY", "2026-03-20", 445.0)]
+
+    assert client.get_option_quotes(legs) == {legs[0]: None, legs[1]: None}
+    assert client.get_option_quotes(legs) == {legs[0]: None, legs[1]: None}
+    assert calls["count"] == 1
+
+
+def test_get_option_quotes_falls_back_to_single_leg_calls():
+    class FakeOptionsClient:
+        def get_latest_option_quote(self, _symbol, _expiration, strike, _option_type):
+            return {"bid": strike / 100, "ask": strike / 100}
+
+    client = AlpacaClient(options_client=FakeOptionsClient(), market_client=None)
+    leg = OptionLeg("QQQ", "2026-03-20", 400.0)
+    quotes = client.get_option_quotes([leg])
+
+    assert quotes[leg] is not None
+    assert quotes[leg].bid == 4.0
+
+
+def test_option_leg_occ_symbol():
+    assert OptionLeg("SPY", "2026-03-20", 450.5, "put").occ_symbol == "SPY260320P00450500"
+
+
+def test_cache_ttls_are_per_kind(monkeypatch):
+    calls = {"history": 0, "price": 0}
+
+    class FakeMarketClient:
+        def get_price_history(self, _symbol, _days):
+            calls["history"] += 1
+            return [{"close": 100.0}]
+
+        def get_latest_trade(self, _symbol):
+            calls["price"] += 1
+            return {"price": 100.0}
+
+    client = AlpacaClient(
+        options_client=None,
+        market_client=FakeMarketClient(),
+        cache_ttls={"underlying": 5.0, "history": 86400.0},
+    )
+    now = {"value": 0.0}
+    monkeypatch.setattr("credit_spread_system.cache.time.monotonic", lambda: now["value"])
+
+    client.get_price_history("SPY")
+    client.get_underlying_price("SPY")
+    now["value"] = 3600.0
+    client.get_price_history("SPY")
+    client.get_underlying_price("SPY")
+
+    assert calls == {"history": 1, "price": 2}
+
+
+def test_explicit_cache_ttl_applies_to_every_kind():
+    flat = AlpacaClient(options_client=None, market_client=None, cache_ttl_seconds=120)
+    mixed = AlpacaClient(
+        options_client=None,
+        market_client=None,
+        cache_ttl_seconds=120,
+        cache_ttls={"history": 3600.0},
+    )
+    defaults = AlpacaClient(options_client=None, market_client=None)
+
+    assert flat.cache.ttl_for("option:SPY") == 120
+    assert flat.cache.ttl_for("history:SPY:260") == 120
+    assert mixed.cache.ttl_for("history:SPY:260") == 3600.0
+    assert mixed.cache.ttl_for("chain:SPY") == 120
+    assert defaults.cache.ttl_for("option:SPY") == 15.0
+    assert defaults.cache.ttl_for("history:SPY:260") == 86400.0
+
+
+def test_concurrent_chain_misses_share_one_fetch():
+    calls = {"count": 0}
+    release = threading.Event()
+
+    class FakeOptionsClient:
+        def get_option_chain(self, _symbol, expiration, option_type):
+            calls["count"] += 1
+            release.wait(timeout=2.0)
+            return [{"strike": 100.0, "expiration": expiration, "option_type": option_type}]
+
+    client = AlpacaClient(options_client=FakeOptionsClient(), market_client=None)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [
+            pool.submit(client.get_option_chain, "SPY", "2026-03-20", "put") for _ in range(4)
+        ]
+        while calls["count"] == 0:
+            time.sleep(0.001)
+        time.sleep(0.05)
+        release.set()
+        chains = [future.result() for future in futures]
+
+    assert calls["count"] == 1
+    assert all(chain and chain[0].strike == 100.0 for chain in chains)
+
+
+def test_provider_calls_retry_through_rate_limiter():
+    attempts = {"count": 0}
+
+    class FakeMarketClient:
+        def get_latest_trade(self, _symbol):
+            attempts["count"] += 1
+            if attempts["count"] == 1:
+                raise RuntimeError("429 Too Many Requests")
+            return {"price": 101.0}
+
+    limiter = RateLimiter(limits={}, sleep=lambda _seconds: None)
+    client = AlpacaClient(options_client=None, market_client=FakeMarketClient(), rate_limiter=limiter)
+
+    assert client.get_underlying_price("SPY") == 101.0
+    assert client.rate_limit_stats()["stocks"]["retries"] == 1
+
+
+def test_price_history_store_fetches_only_missing_tail(tmp_path, monkeypatch):
+    requested = []
+
+    class FakeMarketClient:
+        def get_price_history(self, _symbol, days):
+            requested.append(days)
+            end = date(2026, 1, 9)
+            return [
+                {"date": (end - timedelta(days=offset)).isoformat(), "close": 100.0 - offset}
+                for offset in reversed(range(days))
+            ]
+
+    class FakeDate(date):
+        @classmethod
+        def today(cls):
+            return cls(2026, 1, 9)
+
+    monkeypatch.setattr("credit_spread_system.alpaca_client.date", FakeDate)
+    store = PriceHistoryStore(tmp_path / "bars.sqlite3")
+    stored = [
+        {"date": (date(2026, 1, 7) - timedelta(days=idx)).isoformat(), "close": 1.0}
+        for idx in range(30)
+    ]
+    store.upsert("SPY", stored)
+
+    client = AlpacaClient(options_client=None, market_client=FakeMarketClient(), history_store=store)
+    history = client.get_price_history("SPY", days=20)
+
+    assert requested == [3]
+    assert history is not None
+    assert len(history) == 20
+    assert history[-1] == {"date": "2026-01-09", "close": 100.0}
+
+
+def test_stale_while_revalidate_serves_expired_value_and_refreshes(monkeypatch):
+    prices = iter([100.0, 101.0])
+    refreshed = threading.Event()
+
+    class FakeMarketClient:
+        def get_latest_trade(self, _symbol):
+            price = next(prices)
+            if price == 101.0:
+                refreshed.set()
+            return {"price": price}
+
+    now = {"value": 0.0}
+    monkeypatch.setattr("credit_spread_system.cache.time.monotonic", lambda: now["value"])
+    client = AlpacaClient(
+        options_client=None,
+        market_client=FakeMarketClient(),
+        cache_ttls={"underlying": 5.0},
+        stale_while_revalidate_seconds=30.0,
+    )
+
+    assert client.get_underlying_price("SPY") == 100.0
+    now["value"] = 10.0
+    assert client.get_underlying_price("SPY") == 100.0
+    assert refreshed.wait(timeout=2.0)
+    client._refresh_pool.shutdown(wait=True)
+
+    assert client.get_underlying_price("SPY") == 101.0
+    assert client.stale_keys() == set()
+
+
+def test_stale_value_outside_grace_window_is_refetched(monkeypatch):
+    prices = iter([100.0, 102.0])
+
+    class FakeMarketClient:
+        def get_latest_trade(self, _symbol):
+            return {"price": next(prices)}
+
+    now = {"value": 0.0}
+    monkeypatch.setattr("credit_spread_system.cache.time.monotonic", lambda: now["value"])
+    client = AlpacaClient(
+        options_client=None,
+        market_client=FakeMarketClient(),
+        cache_ttls={"underlying": 5.0},
+        stale_while_revalidate_seconds=30.0,
+    )
+
+    client.get_underlying_price("SPY")
+    now["value"] = 60.0
+
+    assert client.get_underlying_price("SPY") == 102.0
+    assert not client.has_stale_quotes()
+
+
+def test_stale_keys_reported_while_refresh_is_pending(monkeypatch):
+    calls = {"count": 0}
+    release = threading.Event()
+
+    class FakeMarketClient:
+        def get_latest_trade(self, _symbol):
+            calls["count"] += 1
+            if calls["count"] > 1:
+                release.wait(timeout=5)
+                raise RuntimeError("down")
+            return {"price": 100.0}
+
+    now = {"value": 0.0}
+    monkeypatch.setattr("credit_spread_system.cache.time.monotonic", lambda: now["value"])
+    client = AlpacaClient(
+        options_client=None,
+        market_client=FakeMarketClient(),
+        cache_ttls={"underlying": 5.0},
+        stale_while_revalidate_seconds=30.0,
+    )
+
+    client.get_underlying_price("SPY")
+    now["value"] = 10.0
+    assert client.get_underlying_price("SPY") == 100.0
+
+    assert client.stale_keys() == {"underlying:SPY"}
+    assert client.has_stale_quotes()
+
+    release.set()
+    client._refresh_pool.shutdown(wait=True)
+
+    assert client.stale_keys() == set()
+
+
+def test_batch_only_provider_refreshes_stale_quotes_in_one_batch(monkeypatch):
+    batches = []
+
+    class SnapshotOnlyClient:
+        def get_option_snapshots(self, legs):
+            batches.append(list(legs))
+            return [{"bid": float(len(batches)), "ask": 1.2} for _leg in legs]
+
+    now = {"value": 0.0}
+    monkeypatch.setattr("credit_spread_system.cache.time.monotonic", lambda: now["value"])
+    client = AlpacaClient(
+        options_client=SnapshotOnlyClient(),
+        market_client=None,
+        cache_ttls={"option": 5.0},
+        stale_while_revalidate_seconds=30.0,
+    )
+    legs = [OptionLeg("SPY", "2026-03-20", 450.0), OptionLeg("SPY", "2026-03-20", 445.0)]
+    client.get_option_quotes(legs)
+
+    now["value"] = 10.0
+    stale = client.get_option_quotes(legs)
+    client._refresh_pool.shutdown(wait=True)
+
+    assert [quote.bid for quote in stale.values()] == [1.0, 1.0]
+    assert batches == [legs, legs]
+    assert len(client._negative_cache) == 0
+    assert [quote.bid for quote in client.get_option_quotes(legs).values()] == [2.0, 2.0]
+    assert client.stale_keys() == set()
+
+
+def test_unsupported_provider_method_is_not_negatively_cached():
+    client = AlpacaClient(options_client=object(), market_client=object())
+
+    assert client.get_underlying_price("SPY") is None
+    assert len(client._negative_cache) == 0
+
+
+def test_stale_key_dropped_when_cache_evicts_or_expires_it(monkeypatch):
+    class FakeMarketClient:
+        def get_latest_trade(self, _symbol):
+            return {"price": 100.0}
+
+    now = {"value": 0.0}
+    monkeypatch.setattr("credit_spread_system.cache.time.monotonic", lambda: now["value"])
+    client = AlpacaClient(
+        options_client=None,
+        market_client=FakeMarketClient(),
+        cache=MarketDataCache(ttl_by_kind={"underlying": 5.0}, max_entries=2),
+        stale_while_revalidate_seconds=30.0,
+    )
+    client._stale_keys.update({"underlying:SPY", "underlying:QQQ"})
+    client.cache.set("underlying:SPY", 1.0)
+    client.cache.set("underlying:QQQ", 1.0)
+    client.cache.set("underlying:IWM", 1.0)
+
+    assert client.stale_keys() == {"underlying:QQQ"}
+
+    now["value"] = 100.0
+    assert client.cache.lookup("underlying:QQQ") is None
+    assert client.stale_keys() == set()
+
+
+def _chain_rows(expiration, strikes):
+    return [
+        {
+            "symbol": "SPY",
+            "expiration": expiration,
+            "strike": strike,
+            "bid": strike / 100,
+            "ask": strike / 100 + 0.1,
+        }
+        for strike in strikes
+    ]
+
+
+def test_option_quote_served_from_fresh_chain_snapshot():
+    class FakeOptionsClient:
+        def get_option_chain(self, _symbol, expiration, _option_type):
+            return _chain_rows(expiration, [440.0, 445.0, 450.0])
+
+        def get_latest_option_quote(self, *_args):
+            raise AssertionError("quote should come from the chain snapshot")
+
+    client = AlpacaClient(options_client=FakeOptionsClient(), market_client=None)
+    client.get_option_chain("SPY", "2026-03-20", "put")
+
+    quote = client.get_option_quote("SPY", "2026-03-20", 445.0, "put")
+
+    assert quote is not None
+    assert quote.bid == 4.45
+    assert client.chain_version("SPY", "2026-03-20") == 1
+
+
+def test_option_quotes_fetch_one_chain_for_shared_expiration():
+    calls = {"chain": 0, "quotes": 0}
+
+    class FakeOptionsClient:
+        def get_option_chain(self, _symbol, expiration, _option_type):
+            calls["chain"] += 1
+            return _chain_rows(expiration, [430.0, 435.0, 440.0, 445.0, 450.0])
+
+        def get_latest_option_quotes(self, legs):
+            calls["quotes"] += 1
+            return [{"bid": 1.0, "ask": 1.1} for _leg in legs]
+
+    client = AlpacaClient(options_client=FakeOptionsClient(), market_client=None)
+    legs = [OptionLeg("SPY", "2026-03-20", strike) for strike in (430.0, 435.0, 445.0, 450.0)]
+    legs.append(OptionLeg("QQQ", "2026-03-20", 400.0))
+
+    quotes = client.get_option_quotes(legs)
+
+    assert calls == {"chain": 1, "quotes": 1}
+    assert quotes[legs[0]].bid == 4.3
+    assert quotes[legs[-1]].bid == 1.0
+
+
+def test_failed_key_is_negatively_cached():
+    calls = {"count": 0}
+
+    class FakeMarketClient:
+        def get_latest_trade(self, _symbol):
+            calls["count"] += 1
+            raise RuntimeError("down")
+
+    client = AlpacaClient(options_client=None, market_client=FakeMarketClient())
+
+    assert client.get_underlying_price("SPY") is None
+    assert client.get_underlying_price("SPY") is None
+    assert calls["count"] == 1
+
+
+def test_open_circuit_fails_fast_across_keys():
+    calls = {"count": 0}
+
+    class FakeMarketClient:
+        def get_latest_trade(self, _symbol):
+            calls["count"] += 1
+            raise RuntimeError("timeout")
+
+    client = AlpacaClient(
+        options_client=None, market_client=FakeMarketClient(), breaker_failure_threshold=2
+    )
+    for symbol in ("SPY", "QQQ", "IWM", "DIA", "XLF"):
+        assert client.get_underlying_price(symbol) is None
+
+    assert calls["count"] == 2
+    assert client.open_circuits() == ["get_latest_trade"]
+
+
+def test_invalid_symbols_do_not_open_the_circuit():
+    class FakeMarketClient:
+        def get_latest_trade(self, symbol):
+            if symbol.startswith("BAD"):
+                raise ValueError(f"invalid symbol {symbol}")
+            return {"price": 100.0}
+
+    client = AlpacaClient(
+        options_client=None, market_client=FakeMarketClient(), breaker_failure_threshold=2
+    )
+    for symbol in ("BAD1", "BAD2", "BAD3"):
+        assert client.get_underlying_price(symbol) is None
+
+    assert client.get_underlying_price("SPY") == 100.0
+    assert client.open_circuits() == []
+
+
+def test_circuit_closes_after_successful_probe():
+    state = {"down": True}
+
+    class FakeMarketClient:
+        def get_latest_trade(self, _symbol):
+            if state["down"]:
+                raise RuntimeError("timeout")
+            return {"price": 100.0}
+
+    client = AlpacaClient(
+        options_client=None,
+        market_client=FakeMarketClient(),
+        breaker_failure_threshold=1,
+        breaker_reset_seconds=0.0,
+        negative_ttl_seconds=0.0,
+    )
+    assert client.get_underlying_price("SPY") is None
+
+    state["down"] = False
+
+    assert client.get_underlying_price("SPY") == 100.0
+    assert client.circuit_states() == {"get_latest_trade": "CLOSED"}
+
+
+def test_metrics_track_cache_and_provider_calls(tmp_path):
+    class FakeMarketClient:
+        def get_latest_trade(self, symbol):
+            if symbol == "BAD":
+                raise RuntimeError("unknown symbol")
+            return {"price": 100.0}
+
+    client = AlpacaClient(options_client=None, market_client=FakeMarketClient())
+    client.get_underlying_price("SPY")
+    client.get_underlying_price("SPY")
+    client.get_underlying_price("BAD")
+
+    snapshot = client.metrics_snapshot()
+
+    assert snapshot["cache"]["underlying"]["hits"] == 1
+    assert snapshot["cache"]["underlying"]["misses"] == 2
+    provider = snapshot["provider"]["fetch_underlying_price"]
+    assert provider["calls"] == 2
+    assert provider["errors"] == 1
+    assert client.write_metrics(str(tmp_path / "alpaca.prom"))
+    assert not client.write_metrics()
+
+
+def test_clients_sharing_a_cache_each_record_expirations(monkeypatch):
+    now = {"value": 0.0}
+    monkeypatch.setattr("credit_spread_system.cache.time.monotonic", lambda: now["value"])
+    cache = MarketDataCache(ttl_by_kind={"underlying": 5.0})
+    first = AlpacaClient(options_client=None, market_client=None, cache=cache)
+    second = AlpacaClient(options_client=None, market_client=None, cache=cache)
+    cache.set("underlying:SPY", 100.0)
+
+    now["value"] = 10.0
+    assert cache.sweep() == 1
+
+    for client in (first, second):
+        assert client.metrics_snapshot()["cache"]["underlying"]["expirations"] == 1
+
+
+def test_single_leg_fallback_counts_one_miss_per_leg():
+    class FakeOptionsClient:
+        def get_latest_option_quote(self, *_args):
+            return {"bid": 1.0, "ask": 1.1}
+
+    client = AlpacaClient(options_client=FakeOptionsClient(), market_client=None)
+    client.get_option_quotes([OptionLeg("SPY", "2026-03-20", 450.0)])
+
+    assert client.metrics_snapshot()["cache"]["option"]["misses"] == 1
+
+
+def test_shared_client_survives_concurrent_callers():
+    class CountingMarketClient:
+        def __init__(self):
+            self.calls = 0
+            self.lock = threading.Lock()
+
+        def get_latest_trade(self, symbol):
+            with self.lock:
+                self.calls += 1
+            return {"price": float(len(symbol))}
+
+    market = CountingMarketClient()
+    client = AlpacaClient(options_client=None, market_client=market)
+    symbols = [f"S{index}" for index in range(50)]
+
+    def scan(_worker):
+        return [client.get_underlying_price(symbol) for symbol in symbols]
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(scan, range(32)))
+
+    assert all(prices == [float(len(s)) for s in symbols] for prices in results)
+    assert market.calls == len(symbols)
+
+
+def test_get_option_chains_uses_one_batch_call_and_caches():
+    batches = []
+
+    class FakeOptionsClient:
+        def get_option_chains(self, _symbol, expirations, option_type):
+            batches.append(list(expirations))
+            return {
+                expiration: [
+                    {"strike": 100.0, "expiration": expiration, "option_type": option_type}
+                ]
+                for expiration in expirations
+            }
+
+    client = AlpacaClient(options_client=FakeOptionsClient(), market_client=None)
+
+    first = client.get_option_chains("SPY", ["2026-03-20", "2026-03-27"])
+    second = client.get_option_chains("SPY", ["2026-03-27", "2026-04-02"])
+
+    assert batches == [["2026-03-20", "2026-03-27"], ["2026-04-02"]]
+    assert list(first) == ["2026-03-20", "2026-03-27"]
+    assert second["2026-03-27"] is first["2026-03-27"]
+    assert second["2026-04-02"][0].expiration == "2026-04-02"
+
+
+def test_get_option_chains_mismatched_batch_is_treated_as_failure():
+    calls = {"count": 0}
+
+    class FakeOptionsClient:
+        def get_option_chains(self, _symbol, expirations, option_type):
+            calls["count"] += 1
+            return [[{"strike": 100.0, "expiration": "2026-03-20", "option_type": option_type}]]
+
+    client = AlpacaClient(options_client=FakeOptionsClient(), market_client=None)
+    expirations = ["2026-03-20", "2026-03-27"]
+
+    assert client.get_option_chains("SPY", expirations) == dict.fromkeys(expirations)
+    assert client.get_option_chains("SPY", expirations) == dict.fromkeys(expirations)
+    assert calls["count"] == 1
+
+
+def test_get_option_chains_fetches_expirations_concurrently_without_batch_endpoint():
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    class FakeOptionsClient:
+        def get_option_chain(self, _symbol, expiration, option_type):
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.02)
+            with lock:
+                active["now"] -= 1
+            return [{"strike": 100.0, "expiration": expiration, "option_type": option_type}]
+
+    client = AlpacaClient(options_client=FakeOptionsClient(), market_client=None)
+    expirations = ["2026-03-20", "2026-03-27", "2026-04-02"]
+
+    chains = client.get_option_chains("SPY", expirations)
+
+    assert [chain[0].expiration for chain in chains.values()] == expirations
+    assert active["peak"] > 1
+
+
+def test_get_option_expirations_cached_for_the_day():
+    calls = {"count": 0}
+
+    class FakeOptionsClient:
+        def get_option_expirations(self, _symbol):
+            calls["count"] += 1
+            return [
+                {"expiration_date": "2026-03-27"},
+                SimpleNamespace(expiration_date=date(2026, 3, 20)),
+                "2026-03-27",
+            ]
+
+    client = AlpacaClient(options_client=FakeOptionsClient(), market_client=None)
+
+    assert client.get_option_expirations("SPY") == ["2026-03-20", "2026-03-27"]
+    assert client.get_option_expirations("SPY") == ["2026-03-20", "2026-03-27"]
+    assert calls["count"] == 1
+
+
+def test_get_option_expirations_unsupported_returns_none():
+    class FakeOptionsClient:
+        def get_option_chain(self, *_args):
+            return []
+
+    client = AlpacaClient(options_client=FakeOptionsClient(), market_client=None)
+
+    assert client.get_option_expirations("SPY") is None
+
+
+def _wide_chain(expiration, option_type):
+    return [
+        {"strike": float(strike), "expiration": expiration, "option_type": option_type}
+        for strike in range(300, 701)
+    ]
+
+
+def test_option_chain_window_is_pushed_to_provider():
+    requests = []
+
+    class FakeOptionsClient:
+        def get_option_chain(
+            self, _symbol, expiration, option_type, strike_price_gte=None, strike_price_lte=None
+        ):
+            requests.append((strike_price_gte, strike_price_lte))
+            return [
+                row
+                for row in _wide_chain(expiration, option_type)
+                if strike_price_gte <= row["strike"] <= strike_price_lte
+            ]
+
+    client = AlpacaClient(options_client=FakeOptionsClient(), market_client=None)
+
+    chain = client.get_option_chain("SPY", "2026-03-20", "put", strikes=StrikeWindow(480, 500))
+
+    assert requests == [(480, 500)]
+    assert chain.strikes.tolist() == [float(strike) for strike in range(480, 501)]
+
+
+def test_option_chain_window_filters_before_normalizing_and_serves_narrower():
+    calls = {"count": 0}
+
+    class FakeOptionsClient:
+        def get_option_chain(self, _symbol, expiration, option_type):
+            calls["count"] += 1
+            return _wide_chain(expiration, option_type)
+
+    class FakeMarketClient:
+        def get_latest_trade(self, _symbol):
+            return {"price": 500.0}
+
+    client = AlpacaClient(options_client=FakeOptionsClient(), market_client=FakeMarketClient())
+
+    wide = client.get_option_chain("SPY", "2026-03-20", "put", band_pct=0.10)
+    narrow = client.get_option_chain("SPY", "2026-03-20", "put", strikes=StrikeWindow(480, 490))
+    other = client.get_option_chain("SPY", "2026-04-17", "put", strikes=StrikeWindow(480, 490))
+
+    assert wide.strikes.tolist() == [float(strike) for strike in range(450, 551)]
+    assert narrow.strikes.tolist() == [float(strike) for strike in range(480, 491)]
+    assert other.strikes.tolist() == narrow.strikes.tolist()
+    assert calls["count"] == 2
+
+
+def test_full_chain_serves_windowed_requests():
+    calls = {"count": 0}
+
+    class FakeOptionsClient:
+        def get_option_chain(self, _symbol, expiration, option_type):
+            calls["count"] += 1
+            return _wide_chain(expiration, option_type)
+
+    client = AlpacaClient(options_client=FakeOptionsClient(), market_client=None)
+
+    client.get_option_chain("SPY", "2026-03-20", "put")
+    chains = client.get_option_chains(
+        "SPY", ["2026-03-20"], "put", strikes=StrikeWindow(high=305.0)
+    )
+
+    assert chains["2026-03-20"].strikes.tolist() == [300.0, 301.0, 302.0, 303.0, 304.0, 305.0]
+    assert calls["count"] == 1
+
+
+def test_get_price_histories_batches_uncached_symbols():
+    batches = []
+
+    class FakeMarketClient:
+        def get_price_histories(self, symbols, days):
+            batches.append(list(symbols))
+            return {
+                symbol: [{"close": 100.0, "volume": 1.0, "date": "2026-01-02"}]
+                for symbol in symbols
+                if symbol != "GONE"
+            }
+
+    client = AlpacaClient(options_client=None, market_client=FakeMarketClient())
+    symbols = [f"S{i}" for i in range(150)]
+
+    first = client.get_price_histories(symbols + ["GONE"], days=5)
+    second = client.get_price_histories(["S0", "S149"], days=5)
+
+    assert [len(batch) for batch in batches] == [100, 51]
+    assert first["GONE"] is None
+    assert second["S0"] == first["S0"]
+    assert client.get_price_history("S149", days=5) == first["S149"]
+
+
+def test_windowed_fetch_bumps_version_but_keeps_full_snapshot():
+    class FakeOptionsClient:
+        def get_option_chain(self, _symbol, expiration, _option_type):
+            return _chain_rows(expiration, [440.0, 445.0, 485.0, 490.0])
+
+        def get_latest_option_quote(self, *_args):
+            raise AssertionError("quote should come from the full chain snapshot")
+
+    client = AlpacaClient(options_client=FakeOptionsClient(), market_client=None)
+    client.get_option_chain("SPY", "2026-03-20", "put")
+    before = client.chain_version("SPY", "2026-03-20")
+    # The full chain left the cache, so the window is fetched while its snapshot lives on.
+    client.cache.clear()
+    client.get_option_chain("SPY", "2026-03-20", "put", strikes=StrikeWindow(480.5, 490.5))
+
+    assert client.chain_version("SPY", "2026-03-20") > before
+    assert client.get_option_quote("SPY", "2026-03-20", 445.0, "put").bid == 4.45
+
+
+def test_get_price_histories_batches_only_missing_tails(tmp_path, monkeypatch):
+    batches = []
+
+    class FakeMarketClient:
+        def get_price_histories(self, symbols, days):
+            batches.append((days, list(symbols)))
+            end = date(2026, 1, 9)
+            return {
+                symbol: [
+                    {"date": (end - timedelta(days=offset)).isoformat(), "close": 100.0}
+                    for offset in reversed(range(days))
+                ]
+                for symbol in symbols
+            }
+
+    class FakeDate(date):
+        @classmethod
+        def today(cls):
+            return cls(2026, 1, 9)
+
+    monkeypatch.setattr("credit_spread_system.alpaca_client.date", FakeDate)
+    store = PriceHistoryStore(tmp_path / "bars.sqlite3")
+    stored_until = {"SPY": date(2026, 1, 7), "DIA": date(2026, 1, 7), "QQQ": date(2026, 1, 8)}
+    for symbol, last in stored_until.items():
+        store.upsert(
+            symbol,
+            [{"date": (last - timedelta(days=idx)).isoformat(), "close": 1.0} for idx in range(30)],
+        )
+
+    client = AlpacaClient(
+        options_client=None, market_client=FakeMarketClient(), history_store=store
+    )
+    histories = client.get_price_histories(["SPY", "QQQ", "IWM", "DIA"], days=20)
+
+    assert sorted(batches) == [(2, ["QQQ"]), (3, ["SPY", "DIA"]), (20, ["IWM"])]
+    assert all(len(history) == 20 for history in histories.values())
+    assert histories["SPY"][-1] == {"date": "2026-01-09", "close": 100.0}
+    assert histories["SPY"][0] == {"date": "2025-12-21", "close": 1.0}
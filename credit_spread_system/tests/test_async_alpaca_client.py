@@ -0,0 +1,75 @@
+import asyncio
+import threading
+import time
+
+from credit_spread_system.alpaca_client import AlpacaClient
+from credit_spread_system.async_alpaca_client import AsyncAlpacaClient
+
+
+def test_async_client_bounds_concurrency():
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+
+    class FakeMarketClient:
+        def get_latest_trade(self, symbol):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return {"price": float(len(symbol))}
+
+    client = AsyncAlpacaClient(
+        AlpacaClient(options_client=None, market_client=FakeMarketClient()), max_concurrency=2
+    )
+
+    async def scan():
+        return await asyncio.gather(*(client.get_underlying_price(f"S{idx}") for idx in range(6)))
+
+    prices = asyncio.run(scan())
+
+    assert prices == [2.0] * 6
+    assert state["peak"] == 2
+
+
+def test_async_client_shares_sync_cache():
+    calls = {"count": 0}
+
+    class FakeMarketClient:
+        def get_price_history(self, _symbol, _days):
+            calls["count"] += 1
+            return [{"close": 100.0}]
+
+    sync_client = AlpacaClient(options_client=None, market_client=FakeMarketClient())
+    client = AsyncAlpacaClient(sync_client)
+
+    sync_client.get_price_history("SPY", 260)
+    history = asyncio.run(client.get_price_history("SPY", days=260))
+
+    assert history == [{"close": 100.0}]
+    assert calls["count"] == 1
+
+
+def test_async_client_forwards_chain_band():
+    requests = []
+
+    class FakeOptionsClient:
+        def get_option_chains(
+            self, _symbol, expirations, _option_type, strike_price_gte=None, strike_price_lte=None
+        ):
+            requests.append((strike_price_gte, strike_price_lte))
+            return {expiration: [{"strike": 100.0}] for expiration in expirations}
+
+    class FakeMarketClient:
+        def get_latest_trade(self, _symbol):
+            return {"price": 100.0}
+
+    client = AsyncAlpacaClient(
+        AlpacaClient(options_client=FakeOptionsClient(), market_client=FakeMarketClient())
+    )
+
+    chains = asyncio.run(client.get_option_chains("SPY", ["2026-03-20"], "put", band_pct=0.05))
+
+    assert chains["2026-03-20"].strikes.tolist() == [100.0]
+    assert requests == [(95.0, 105.0)]
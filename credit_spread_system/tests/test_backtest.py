@@ -0,0 +1,169 @@
+from datetime import date, timedelta
+
+import numpy as np
+
+from credit_spread_system.backtest import Backtester, ChainArchive, screen_series
+from credit_spread_system.exit_rules import Action, evaluate_position
+from credit_spread_system.features import SymbolFeatures
+from credit_spread_system.history_store import PriceHistoryStore
+from credit_spread_system.models import Position
+from credit_spread_system.option_chain import OptionChain
+
+
+def _sessions(start, count):
+    days = []
+    current = start
+    while len(days) < count:
+        if current.weekday() < 5:
+            days.append(current)
+        current += timedelta(days=1)
+    return days
+
+
+def _bars(days, seed=7):
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0.0008, 0.012, len(days))))
+    volumes = rng.uniform(1.0e6, 3.0e6, len(days))
+    return [
+        {"date": day.isoformat(), "close": float(close), "volume": float(volume)}
+        for day, close, volume in zip(days, closes, volumes)
+    ]
+
+
+def _put_chain(symbol, expiration, spot, day, strikes):
+    # Toy pricing: puts lose value as spot rises above the strike and with time.
+    dte = max((expiration - day).days, 0)
+    prices = [
+        max(strike - spot, 0.0) + 2.0 * np.exp(-(spot - strike) / 8.0) * (dte / 45) ** 0.5
+        for strike in strikes
+    ]
+    return OptionChain.from_columns(
+        symbols=[symbol] * len(strikes),
+        expirations=[expiration.isoformat()] * len(strikes),
+        strikes=strikes,
+        option_types=["put"] * len(strikes),
+        bids=[round(price - 0.02, 2) for price in prices],
+        asks=[round(price + 0.02, 2) for price in prices],
+        lasts=prices,
+        open_interest=[1000] * len(strikes),
+    )
+
+
+def _market(days, bars, symbol="SPY"):
+    store = PriceHistoryStore(":memory:")
+    store.upsert(symbol, bars)
+    archive = ChainArchive()
+    fridays = [day for day in days if day.weekday() == 4]
+    for day, bar in zip(days, bars):
+        spot = bar["close"]
+        strikes = [float(strike) for strike in range(int(spot * 0.7), int(spot) + 6)]
+        for expiration in fridays:
+            if 0 <= (expiration - day).days <= 50:
+                archive.save(symbol, day, _put_chain(symbol, expiration, spot, day, strikes))
+    return store, archive
+
+
+def test_screen_series_matches_symbol_features_at_every_bar():
+    days = _sessions(date(2024, 1, 2), 320)
+    bars = _bars(days)
+    closes = np.array([bar["close"] for bar in bars])
+    volumes = np.array([bar["volume"] for bar in bars])
+
+    screen = screen_series(closes, volumes)
+
+    for i in range(len(bars)):
+        features = SymbolFeatures.build("SPY", bars[: i + 1])
+        assert screen.liquid[i] == features.liquid, i
+        assert screen.trend_any[i] == features.trend.any, i
+        if features.support is None:
+            assert np.isnan(screen.support[i]), i
+        else:
+            assert screen.support[i] == features.support, i
+
+
+def test_backtest_exits_match_evaluate_position():
+    days = _sessions(date(2024, 1, 2), 420)
+    bars = _bars(days)
+    store, archive = _market(days, bars)
+    closes = {bar["date"]: bar["close"] for bar in bars}
+
+    result = Backtester(store, archive).run(["SPY"], days[0], days[-1])
+
+    assert result.closed
+    for trade in result.closed:
+        position = Position(
+            position_id="bt",
+            symbol="SPY",
+            short_strike=trade.short_strike,
+            long_strike=trade.long_strike,
+            expiration=trade.expiration,
+            entry_credit=trade.entry_credit,
+            contracts=1,
+            status="OPEN",
+        )
+        held = [day for day in days if trade.entry_date < day < trade.exit_date]
+        for day in held:
+            value = archive.spread_values(
+                "SPY",
+                trade.expiration.isoformat(),
+                trade.short_strike,
+                trade.long_strike,
+                np.array([day], dtype="datetime64[D]"),
+            )[0]
+            action, _ = evaluate_position(
+                position,
+                None if np.isnan(value) else value,
+                closes[day.isoformat()],
+                today=day,
+            )
+            assert action in (Action.HOLD, Action.EVALUATE)
+        if trade.action != "EXPIRED":
+            action, _ = evaluate_position(
+                position, trade.exit_value, closes[trade.exit_date.isoformat()], trade.exit_date
+            )
+            assert action.value == trade.action
+        assert trade.pl == (trade.entry_credit - trade.exit_value) * 100
+
+    summary = result.summary()
+    assert summary["closed"] == len(result.closed)
+    assert summary["total_pl"] == result.total_pl
+
+
+def test_backtest_skips_entries_below_iv_rank():
+    days = _sessions(date(2024, 1, 2), 300)
+    bars = _bars(days)
+    store, archive = _market(days, bars)
+
+    result = Backtester(store, archive, iv_rank=lambda _symbol, _day: 10.0).run(
+        ["SPY"], days[0], days[-1]
+    )
+
+    assert result.trades == ()
+
+
+def test_backtest_entries_search_the_live_strike_band():
+    day = date(2024, 3, 1)
+    expiration = date(2024, 4, 5)
+    prices = {65.0: 0.5, 70.0: 4.5, 85.0: 0.3, 90.0: 0.6, 95.0: 2.4}
+    archive = ChainArchive()
+    archive.save(
+        "SPY",
+        day,
+        OptionChain.from_columns(
+            symbols=["SPY"] * len(prices),
+            expirations=[expiration.isoformat()] * len(prices),
+            strikes=list(prices),
+            option_types=["put"] * len(prices),
+            bids=[price - 0.02 for price in prices.values()],
+            asks=[price + 0.02 for price in prices.values()],
+            lasts=list(prices.values()),
+            open_interest=[1000] * len(prices),
+        ),
+    )
+    store = PriceHistoryStore(":memory:")
+
+    _, unbanded = Backtester(store, archive, strike_band=None)._open("SPY", day, 100.0)
+    _, banded = Backtester(store, archive)._open("SPY", day, 100.0)
+
+    assert unbanded.short_strike == 70.0
+    assert (banded.short_strike, banded.long_strike) == (95.0, 90.0)
@@ -0,0 +1,186 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from credit_spread_system.cache import MarketDataCache, SingleFlight, cache_kind, estimate_size
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr("credit_spread_system.cache.time.monotonic", fake)
+    return fake
+
+
+def test_cache_expires_per_kind(clock):
+    cache = MarketDataCache(ttl_by_kind={"option": 5.0, "history": 86400.0})
+    cache.set("option:SPY:2026-03-20:450.0:put", 1.0)
+    cache.set("history:SPY:260", [1.0])
+
+    clock.now = 10.0
+
+    assert cache.get("option:SPY:2026-03-20:450.0:put") is None
+    assert cache.get("history:SPY:260") == [1.0]
+
+
+def test_cache_unknown_kind_uses_default_ttl(clock):
+    cache = MarketDataCache(default_ttl_seconds=30.0, ttl_by_kind={})
+    cache.set("iv:SPY", 42.0)
+
+    clock.now = 20.0
+    assert cache.get("iv:SPY") == 42.0
+    clock.now = 31.0
+    assert cache.get("iv:SPY") is None
+
+
+def test_cache_evicts_least_recently_used(clock):
+    cache = MarketDataCache(max_entries=2)
+    cache.set("option:a", 1)
+    cache.set("option:b", 2)
+    cache.get("option:a")
+    cache.set("option:c", 3)
+
+    assert "option:a" in cache
+    assert "option:b" not in cache
+    assert len(cache) == 2
+
+
+def test_cache_respects_byte_budget(clock):
+    payload = "x" * 1000
+    cache = MarketDataCache(max_bytes=estimate_size(payload) * 2 + 10)
+    cache.set("history:a", payload)
+    cache.set("history:b", "y" * 1000)
+    cache.set("history:c", "z" * 1000)
+
+    assert len(cache) == 2
+    assert "history:a" not in cache
+    assert cache.bytes_used <= estimate_size(payload) * 2 + 10
+
+
+def test_cache_skips_values_over_budget(clock):
+    cache = MarketDataCache(max_bytes=100)
+    cache.set("chain:SPY", ["x" * 500])
+
+    assert len(cache) == 0
+    assert cache.bytes_used == 0
+
+
+def test_cache_sweep_removes_expired_entries(clock):
+    cache = MarketDataCache(ttl_by_kind={"option": 5.0, "history": 100.0})
+    cache.set("option:a", 1)
+    cache.set("history:a", 2)
+
+    assert cache.sweep(now=10.0) == 1
+    assert "option:a" not in cache
+    assert "history:a" in cache
+
+
+def test_cache_kind():
+    assert cache_kind("chain:SPY:2026-03-20:put") == "chain"
+    assert cache_kind("plain") == "plain"
+
+
+def test_single_flight_shares_result_with_waiters():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = {"count": 0}
+
+    def fetch():
+        calls["count"] += 1
+        release.wait(timeout=2.0)
+        return "chain"
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        futures = [pool.submit(flight.do, "chain:SPY", fetch) for _ in range(5)]
+        while not flight.in_flight("chain:SPY"):
+            time.sleep(0.001)
+        time.sleep(0.05)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert results == ["chain"] * 5
+    assert calls["count"] == 1
+    assert not flight.in_flight("chain:SPY")
+
+
+def test_single_flight_propagates_errors_to_waiters():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fetch():
+        release.wait(timeout=2.0)
+        raise RuntimeError("down")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(flight.do, "history:SPY:260", fetch) for _ in range(3)]
+        while not flight.in_flight("history:SPY:260"):
+            time.sleep(0.001)
+        time.sleep(0.05)
+        release.set()
+        errors = [future.exception() for future in futures]
+
+    assert all(isinstance(error, RuntimeError) for error in errors)
+
+
+def test_cache_lookup_returns_stale_entries_within_grace(clock):
+    cache = MarketDataCache(ttl_by_kind={"option": 5.0}, stale_grace_seconds=10.0)
+    cache.set("option:a", 1)
+
+    clock.now = 8.0
+    assert cache.get("option:a") is None
+    assert cache.lookup("option:a") == (1, True)
+    assert cache.sweep() == 0
+
+    clock.now = 16.0
+    assert cache.lookup("option:a") is None
+    assert len(cache) == 0
+
+
+def test_large_cache_is_sharded_small_cache_is_not():
+    assert MarketDataCache().shard_count == 16
+    assert MarketDataCache(max_entries=2).shard_count == 1
+
+
+def test_sharded_cache_concurrent_writers_do_not_lose_updates():
+    cache = MarketDataCache(default_ttl_seconds=600, ttl_by_kind={})
+    threads, keys_per_thread = 16, 500
+
+    def hammer(worker):
+        for index in range(keys_per_thread):
+            key = f"underlying:W{worker}:{index}"
+            cache.set(key, index)
+            assert cache.get(key) == index
+            cache.get(f"underlying:W{(worker + 1) % threads}:{index}")
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(hammer, range(threads)))
+
+    assert len(cache) == threads * keys_per_thread
+    assert all(
+        cache.get(f"underlying:W{worker}:{index}") == index
+        for worker in range(threads)
+        for index in range(keys_per_thread)
+    )
+
+
+def test_sharded_cache_respects_entry_budget_under_contention():
+    cache = MarketDataCache(default_ttl_seconds=600, ttl_by_kind={}, max_entries=1024)
+
+    def hammer(worker):
+        for index in range(400):
+            cache.set(f"option:W{worker}:{index}", index)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(hammer, range(8)))
+
+    assert len(cache) <= 1024
@@ -0,0 +1,122 @@
+import pytest
+
+from credit_spread_system.circuit_breaker import (
+    BreakerState,
+    CircuitBreaker,
+    NegativeCache,
+    is_outage_error,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=10, clock=FakeClock())
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state is BreakerState.OPEN
+    assert not breaker.allow()
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2, clock=FakeClock())
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state is BreakerState.CLOSED
+
+
+def test_half_open_allows_single_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=10, clock=clock)
+    breaker.record_failure()
+
+    clock.now = 10.0
+    assert breaker.state is BreakerState.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state is BreakerState.CLOSED
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10.0
+    assert breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state is BreakerState.OPEN
+    clock.now = 15.0
+    assert not breaker.allow()
+
+
+def test_breaker_rejects_non_positive_threshold():
+    with pytest.raises(ValueError):
+        CircuitBreaker(failure_threshold=0)
+
+
+def test_negative_cache_expires():
+    clock = FakeClock()
+    cache = NegativeCache(ttl_seconds=5, clock=clock)
+    cache.add("underlying:SPY", "down")
+
+    assert cache.get("underlying:SPY") == "down"
+    clock.now = 6.0
+    assert cache.get("underlying:SPY") is None
+    assert len(cache) == 0
+
+
+def test_negative_cache_bounded():
+    cache = NegativeCache(ttl_seconds=5, max_entries=2, clock=FakeClock())
+    for key in ("a", "b", "c"):
+        cache.add(key, "down")
+
+    assert cache.get("a") is None
+    assert cache.get("c") == "down"
+
+
+def test_ignored_error_frees_half_open_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10.0
+
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_ignored()
+
+    assert breaker.allow()
+
+
+def test_is_outage_error():
+    class ApiError(Exception):
+        def __init__(self, status_code):
+            super().__init__(f"status {status_code}")
+            self.status_code = status_code
+
+    class ReadTimeout(Exception):
+        pass
+
+    assert is_outage_error(ConnectionError())
+    assert is_outage_error(TimeoutError())
+    assert is_outage_error(ReadTimeout())
+    assert is_outage_error(ApiError(429))
+    assert is_outage_error(ApiError(502))
+    assert not is_outage_error(ApiError(404))
+    assert not is_outage_error(ValueError("invalid symbol"))
@@ -1,4 +1,7 @@
+import asyncio
+
 from credit_spread_system.alpaca_client import AlpacaClient, Quote
+from credit_spread_system.cache import MarketDataCache
 from credit_spread_system.data_service import DataService
 from credit_spread_system.sheets_client import SheetsClient
 
@@ -19,6 +22,9 @@ class FakeAlpaca(AlpacaClient):
     def get_option_quote(self, symbol, expiration, strike, option_type):
         return Quote(bid=1.0, ask=1.2, last=1.1)
 
+    def get_option_quotes(self, legs):
+        return {leg: Quote(bid=1.0, ask=1.2, last=1.1) for leg in legs}
+
     def get_underlying_price(self, symbol):
         return 100.0
 
@@ -54,6 +60,36 @@ def test_get_enriched_positions():
     assert enriched[0].current_pl == 100.0
 
 
+def test_get_enriched_positions_batches_leg_quotes():
+    rows = [
+        {
+            "position_id": str(idx),
+            "symbol": "SPY",
+            "short_strike": str(100 - idx),
+            "long_strike": str(95 - idx),
+            "expiration": "2026-03-20",
+            "entry_credit": "1.0",
+            "contracts": "1",
+            "status": "OPEN",
+        }
+        for idx in range(3)
+    ]
+    calls = []
+
+    class BatchOptionsClient:
+        def get_option_snapshots(self, legs):
+            calls.append(list(legs))
+            return {leg.occ_symbol: {"latest_quote": {"bid": 1.0, "ask": 1.2}} for leg in legs}
+
+    alpaca = AlpacaClient(options_client=BatchOptionsClient(), market_client=None)
+    service = DataService(FakeSheets(rows), alpaca)
+    enriched = service.get_enriched_positions()
+
+    assert len(calls) == 1
+    assert len(calls[0]) == 6
+    assert [item.spread_value for item in enriched] == [0.0, 0.0, 0.0]
+
+
 def test_get_portfolio_summary():
     rows = [
         {
@@ -81,9 +117,83 @@ def test_get_market_context():
     context = service.get_market_context()
 
     assert "market_status" in context
+    assert context["quotes_stale"] is False
+    assert context["degraded_endpoints"] == []
 
 
 def test_get_daily_trade_suggestions_returns_list():
     service = DataService(FakeSheets([]), FakeAlpaca())
     suggestions = service.get_daily_trade_suggestions()
     assert isinstance(suggestions, list)
+
+
+def test_get_enriched_positions_async():
+    rows = [
+        {
+            "position_id": "1",
+            "symbol": "SPY",
+            "short_strike": "100",
+            "long_strike": "95",
+            "expiration": "2026-03-20",
+            "entry_credit": "1.0",
+            "contracts": "1",
+            "status": "OPEN",
+        }
+    ]
+
+    service = DataService(FakeSheets(rows), FakeAlpaca())
+    enriched = asyncio.run(service.get_enriched_positions_async())
+
+    assert len(enriched) == 1
+    assert enriched[0].current_pl == 100.0
+    assert enriched[0].underlying_price == 100.0
+
+
+def test_second_scan_reuses_results_for_chains_served_from_shared_cache():
+    class ChainOptionsClient:
+        def __init__(self):
+            self.calls = 0
+
+        def get_option_chains(
+            self, symbol, expirations, option_type, strike_price_gte=None, strike_price_lte=None
+        ):
+            self.calls += 1
+            return {
+                expiration: [
+                    {"symbol": symbol, "expiration": expiration, "strike": strike, "bid": 1.0}
+                    for strike in (strike_price_gte, strike_price_lte)
+                ]
+                for expiration in expirations
+            }
+
+    class ScanAlpaca(FakeAlpaca):
+        def __init__(self, options_client, cache):
+            AlpacaClient.__init__(
+                self, options_client=options_client, market_client=None, cache=cache
+            )
+            self.chain_requests = 0
+
+        def get_price_history(self, symbol, days=260):
+            history = super().get_price_history(symbol, days)
+            return history[:-1] + [{"close": 229.5, "volume": 3_000_000, "date": "2026-01-01"}]
+
+        def get_option_chains(self, *args, **kwargs):
+            self.chain_requests += 1
+            return AlpacaClient.get_option_chains(self, *args, **kwargs)
+
+    options = ChainOptionsClient()
+    shared = MarketDataCache(default_ttl_seconds=60)
+    DataService(FakeSheets([]), ScanAlpaca(options, shared)).get_daily_trade_suggestions()
+    fetched = options.calls
+
+    # A fresh client, as after a process restart, reads the chains another scan cached.
+    alpaca = ScanAlpaca(options, shared)
+    service = DataService(FakeSheets([]), alpaca)
+    first = service.get_daily_trade_suggestions()
+    requests = alpaca.chain_requests
+    second = service.get_daily_trade_suggestions()
+
+    assert requests > 0
+    assert options.calls == fetched
+    assert second == first
+    assert alpaca.chain_requests == requests
@@ -1,7 +1,10 @@
-from datetime import date
+from datetime import date, timedelta
 from typing import Optional
 
-from credit_spread_system.exit_rules import Action, evaluate_position
+import numpy as np
+import pytest
+
+from credit_spread_system.exit_rules import Action, evaluate_position, first_exit
 from credit_spread_system.models import Position
 
 
@@ -77,3 +80,55 @@ def test_missing_data_evaluate():
     )
 
     assert action == Action.EVALUATE
+
+
+def test_first_exit_finds_first_triggering_day_with_priority():
+    values = [0.9, float("nan"), 2.5, 0.4]
+    prices = [105.0, 99.0, 99.5, 110.0]
+    dte = [40, 39, 38, 37]
+
+    # Day 1 breaches but has no spread value, so day 2 is first; breach beats stop.
+    assert first_exit(1.0, 100.0, values, prices, dte) == (2, Action.CLOSE_BREACH)
+    assert first_exit(1.0, 90.0, values, prices, dte) == (2, Action.STOP_LOSS)
+    assert first_exit(1.0, 90.0, [0.9, 0.8], [105.0, 105.0], [40, 39]) == (-1, None)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_first_exit_matches_evaluate_position_bar_by_bar(seed):
+    rng = np.random.default_rng(seed)
+    position = make_position()
+    days = 45
+    values = rng.uniform(0.3, 2.2, days)
+    prices = rng.uniform(99.0, 112.0, days)
+    values[rng.random(days) < 0.1] = np.nan
+    prices[rng.random(days) < 0.1] = np.nan
+    dte = np.arange(days + 5, 5, -1)
+
+    actions = [
+        evaluate_position(
+            position,
+            None if np.isnan(values[idx]) else float(values[idx]),
+            None if np.isnan(prices[idx]) else float(prices[idx]),
+            today=position.expiration - timedelta(days=int(dte[idx])),
+        )[0]
+        for idx in range(days)
+    ]
+
+    # Entering on any bar, first_exit must stop where evaluate_position first closes.
+    for start in range(days):
+        expected = next(
+            (
+                (idx - start, action)
+                for idx, action in enumerate(actions)
+                if idx >= start and action not in (Action.HOLD, Action.EVALUATE)
+            ),
+            (-1, None),
+        )
+        found = first_exit(
+            position.entry_credit,
+            position.short_strike,
+            values[start:],
+            prices[start:],
+            dte[start:],
+        )
+        assert found == expected, (seed, start)
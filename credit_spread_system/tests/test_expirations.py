@@ -0,0 +1,47 @@
+from datetime import date
+
+import pytest
+
+from credit_spread_system.expirations import ExpirationService
+
+
+class ListingAlpaca:
+    def __init__(self, listed):
+        self.listed = listed
+
+    def get_option_expirations(self, _symbol):
+        return self.listed
+
+
+def test_select_keeps_listed_trading_days_inside_window():
+    alpaca = ListingAlpaca(
+        ["2026-03-13", "2026-03-20", "2026-03-21", "2026-04-03", "2026-04-17", "bad"]
+    )
+    service = ExpirationService(alpaca, today=lambda: date(2026, 2, 17))
+
+    # 2026-03-21 is a Saturday and 2026-04-03 is Good Friday.
+    assert service.select("SPY") == ["2026-03-20"]
+
+
+def test_select_returns_nothing_when_no_listing_falls_in_window():
+    service = ExpirationService(ListingAlpaca(["2026-06-19"]), today=lambda: date(2026, 2, 17))
+
+    assert service.select("SPY") == []
+
+
+def test_select_falls_back_to_fridays_without_listing_support():
+    service = ExpirationService(object(), today=lambda: date(2026, 2, 27))
+
+    # Good Friday (2026-04-03) rolls back to Thursday.
+    assert service.select("SPY") == ["2026-04-02", "2026-04-10"]
+
+
+def test_select_falls_back_when_listing_is_unavailable():
+    service = ExpirationService(ListingAlpaca(None), today=lambda: date(2026, 2, 17))
+
+    assert service.select("SPY") == ["2026-03-20", "2026-03-27", "2026-04-02"]
+
+
+def test_window_must_be_ordered():
+    with pytest.raises(ValueError):
+        ExpirationService(object(), min_dte=45, max_dte=30)
@@ -0,0 +1,63 @@
+from credit_spread_system.features import FeatureCache, SymbolFeatures
+
+
+def _history(count=260, last_volume=3_000_000, date="2026-01-02"):
+    bars = [{"close": 100 + i * 0.5, "volume": 2_000_000, "date": date} for i in range(count)]
+    bars[-1] = {**bars[-1], "volume": last_volume}
+    return bars
+
+
+def test_symbol_features_hold_all_screen_inputs():
+    features = SymbolFeatures.build("SPY", _history())
+
+    assert features.liquid
+    assert features.trend.score == 3
+    assert len(features.support_candidates) == 3
+    assert features.support in features.support_candidates
+    assert set(features.moving_averages) == {20, 50, 100, 200}
+    assert features.last_date.isoformat() == "2026-01-02"
+
+
+def test_support_requires_volume_confirmation():
+    features = SymbolFeatures.build("SPY", _history(last_volume=2_000_000))
+
+    assert features.support_candidates
+    assert features.support is None
+
+
+def test_short_history_is_not_liquid_and_has_no_trend():
+    features = SymbolFeatures.build("SPY", _history(count=10))
+
+    assert not features.liquid
+    assert not features.trend.any
+    assert features.support is None
+
+
+def test_feature_cache_reuses_unchanged_history():
+    cache = FeatureCache()
+    history = _history()
+
+    first = cache.get_or_build("SPY", history)
+    second = cache.get_or_build("SPY", list(history))
+
+    assert second is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_feature_cache_rebuilds_when_last_bar_changes():
+    cache = FeatureCache()
+    history = _history()
+    first = cache.get_or_build("SPY", history)
+
+    updated = history[:-1] + [{**history[-1], "close": 300.0}]
+
+    assert cache.get_or_build("SPY", updated) is not first
+    assert cache.get_or_build("QQQ", history) is not first
+
+
+def test_feature_cache_is_bounded():
+    cache = FeatureCache(max_entries=2)
+    for symbol in ("SPY", "QQQ", "IWM"):
+        cache.get_or_build(symbol, _history())
+
+    assert len(cache) == 2
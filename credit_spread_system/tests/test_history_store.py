@@ -0,0 +1,54 @@
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from credit_spread_system.history_store import PriceHistoryStore, normalize_bars, sessions_since
+
+
+def _bars(start, count):
+    return [
+        {"date": (start + timedelta(days=idx)).isoformat(), "close": 100.0 + idx, "volume": 1_000_000}
+        for idx in range(count)
+    ]
+
+
+def test_store_upsert_and_load_window(tmp_path):
+    store = PriceHistoryStore(tmp_path / "bars.sqlite3")
+    store.upsert("SPY", _bars(date(2026, 1, 1), 10))
+
+    window = store.load("SPY", 3)
+
+    assert [bar["date"] for bar in window] == ["2026-01-08", "2026-01-09", "2026-01-10"]
+    assert window[-1]["close"] == 109.0
+    assert store.last_date("SPY") == date(2026, 1, 10)
+    assert store.count("SPY") == 10
+
+
+def test_store_upsert_replaces_existing_bar(tmp_path):
+    store = PriceHistoryStore(tmp_path / "bars.sqlite3")
+    store.upsert("SPY", [{"date": "2026-01-02", "close": 100.0}])
+    store.upsert("SPY", [{"date": "2026-01-02", "close": 101.5}])
+
+    assert store.load("SPY", 5) == [{"date": "2026-01-02", "close": 101.5}]
+
+
+def test_store_persists_across_instances(tmp_path):
+    path = tmp_path / "bars.sqlite3"
+    PriceHistoryStore(path).upsert("QQQ", _bars(date(2026, 1, 1), 2))
+
+    assert PriceHistoryStore(path).count("QQQ") == 2
+
+
+def test_normalize_bars_handles_objects_and_timestamps():
+    raw = [SimpleNamespace(timestamp=datetime(2026, 1, 2, 5, 0), close=10, volume=5, open=None)]
+
+    assert normalize_bars(raw) == [{"date": "2026-01-02", "close": 10.0, "volume": 5.0}]
+
+
+def test_normalize_bars_requires_dates():
+    assert normalize_bars([{"close": 1.0}]) is None
+
+
+def test_sessions_since_skips_weekends():
+    # Friday -> following Tuesday is Monday and Tuesday.
+    assert sessions_since(date(2026, 1, 2), date(2026, 1, 6)) == 2
+    assert sessions_since(date(2026, 1, 6), date(2026, 1, 6)) == 0
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from credit_spread_system.indicators import compute_indicators, rolling_mean
+
+
+def _history(closes, volume=2_000_000):
+    return [{"close": close, "volume": volume, "date": "2026-01-02"} for close in closes]
+
+
+def test_rolling_mean_matches_naive_windows():
+    values = np.arange(1.0, 11.0)
+
+    result = rolling_mean(values, 3)
+
+    assert result.tolist() == pytest.approx([sum(values[i : i + 3]) / 3 for i in range(8)])
+    assert len(rolling_mean(values, 20)) == 0
+
+
+def test_indicators_match_slice_averages():
+    closes = [100 + (i % 7) * 0.5 + i * 0.1 for i in range(260)]
+    indicators = compute_indicators(_history(closes))
+
+    for window in (20, 50, 100, 200):
+        assert indicators.ma(window) == pytest.approx(sum(closes[-window:]) / window)
+    previous = sum(closes[-55:-5]) / 50
+    assert indicators.ma_slope(50) == pytest.approx(sum(closes[-50:]) / 50 - previous)
+    assert indicators.recent_low(20) == min(closes[-20:])
+    assert indicators.average_volume() == 2_000_000
+
+
+def test_indicators_skip_missing_closes_and_zero_missing_volume():
+    history = _history([1.0, 2.0, 3.0])
+    history[1] = {"close": None, "volume": None}
+    history[2]["close"] = "4.5"
+
+    indicators = compute_indicators(history)
+
+    assert indicators.closes.tolist() == [1.0, 4.5]
+    assert indicators.volumes.tolist() == [2_000_000, 0.0, 2_000_000]
+    assert indicators.bar_count == 3
+    assert indicators.ma(20) is None
+    assert indicators.ma_slope(50) is None
+
+
+def test_indicators_parse_last_bar_date():
+    indicators = compute_indicators(_history([1.0, 2.0]))
+
+    assert indicators.last_date.isoformat() == "2026-01-02"
+    assert indicators.closes_nondecreasing(2)
@@ -1,3 +1,7 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from credit_spread_system.iv_rank import IvRankService, compute_iv_rank
 
 
@@ -42,3 +46,26 @@ def test_iv_rank_blocked_when_unavailable():
 
     assert result.iv_rank is None
     assert result.blocked is True
+
+
+def test_iv_rank_concurrent_callers_share_one_fetch():
+    class SlowAlpaca:
+        def __init__(self):
+            self.calls = 0
+            self.lock = threading.Lock()
+
+        def get_iv_history(self, _symbol):
+            with self.lock:
+                self.calls += 1
+            time.sleep(0.05)
+            return [10.0, 12.0, 8.0, 15.0]
+
+    service = IvRankService(cache_ttl_seconds=3600)
+    alpaca = SlowAlpaca()
+    symbols = ["SPY", "QQQ", "IWM", "DIA"] * 16
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda symbol: service.get_iv_rank(symbol, alpaca), symbols))
+
+    assert all(result.iv_rank == 100.0 for result in results)
+    assert alpaca.calls == 4
@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, timedelta, timezone
 
 from credit_spread_system import market_state
 
@@ -35,3 +35,25 @@ def test_get_market_status_open():
     assert status["is_open"] is True
     assert status["is_after_hours"] is False
     assert status["message"] == "Market open"
+
+
+def test_trading_days_skips_weekends_and_holidays():
+    days = market_state.trading_days(date(2026, 11, 23), date(2026, 11, 29))
+
+    assert date(2026, 11, 26) not in days
+    assert date(2026, 11, 28) not in days
+    assert date(2026, 11, 27) in days
+
+
+def test_trading_days_does_not_cache_calendar_failures(monkeypatch):
+    start, end = date(2031, 11, 24), date(2031, 11, 30)
+    real_get_calendar = market_state.mcal.get_calendar
+
+    def broken_calendar(_name):
+        raise RuntimeError("calendar unavailable")
+
+    monkeypatch.setattr(market_state.mcal, "get_calendar", broken_calendar)
+    assert date(2031, 11, 27) in market_state.trading_days(start, end)
+
+    monkeypatch.setattr(market_state.mcal, "get_calendar", real_get_calendar)
+    assert date(2031, 11, 27) not in market_state.trading_days(start, end)
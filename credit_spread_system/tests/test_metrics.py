@@ -0,0 +1,49 @@
+import pytest
+
+from credit_spread_system.metrics import ClientMetrics, LatencyHistogram
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = LatencyHistogram(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(seconds)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot["buckets"] == {"0.1": 1, "1": 3, "+Inf": 4}
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == 4.25
+
+
+def test_snapshot_hit_ratio_and_provider_counts():
+    metrics = ClientMetrics()
+    metrics.record_cache("option", "hits")
+    metrics.record_cache("option", "stale_hits")
+    metrics.record_cache("option", "misses")
+    metrics.record_cache("option", "misses")
+    metrics.record_call("fetch_option_quote", 0.2)
+    metrics.record_call("fetch_option_quote", 0.4, error=True)
+    metrics.record_rejected("fetch_option_quote")
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot["cache"]["option"]["hit_ratio"] == 0.5
+    provider = snapshot["provider"]["fetch_option_quote"]
+    assert (provider["calls"], provider["errors"], provider["rejected"]) == (2, 1, 1)
+    assert provider["latency_seconds"]["mean"] == pytest.approx(0.3)
+
+
+def test_prometheus_text_written_atomically(tmp_path):
+    metrics = ClientMetrics()
+    metrics.record_cache("chain", "hits")
+    metrics.record_call("fetch_option_chain", 0.02)
+    path = tmp_path / "metrics" / "alpaca.prom"
+
+    metrics.write_prometheus(path)
+    text = path.read_text()
+
+    assert 'alpaca_cache_hits_total{kind="chain"} 1' in text
+    assert 'alpaca_provider_calls_total{method="fetch_option_chain"} 1' in text
+    assert 'alpaca_provider_latency_seconds_bucket{method="fetch_option_chain",le="+Inf"} 1' in text
+    assert 'alpaca_provider_latency_seconds_count{method="fetch_option_chain"} 1' in text
+    assert list(path.parent.iterdir()) == [path]
@@ -0,0 +1,140 @@
+import math
+
+import pytest
+
+from credit_spread_system.cache import estimate_size
+from credit_spread_system.option_chain import (
+    ChainSnapshotIndex,
+    OptionChain,
+    OptionContract,
+    StrikeWindow,
+)
+
+
+def _raw_chain():
+    return [
+        {"symbol": "SPY", "expiration": "2026-03-20", "strike": 105.0, "bid": 3.0, "ask": 3.2},
+        {"symbol": "SPY", "strike": 95.0, "bid_price": 1.0, "ask_price": 1.2},
+        {"symbol": "SPY", "strike": 100.0, "last": 2.1, "open_interest": 700},
+    ]
+
+
+def test_from_raw_sorts_by_strike():
+    chain = OptionChain.from_raw(_raw_chain())
+
+    assert chain is not None
+    assert chain.strikes.tolist() == [95.0, 100.0, 105.0]
+    assert chain[0].bid == 1.0
+    assert chain[1].bid is None
+    assert chain[1].open_interest == 700
+    assert chain[2].option_type == "put"
+
+
+def test_from_raw_none_returns_none():
+    assert OptionChain.from_raw(None) is None
+
+
+def test_iteration_round_trips_contracts():
+    contract = OptionContract("SPY", "2026-03-20", 95.0, "put", 1.0, 1.2, 1.1, 600)
+    chain = OptionChain.from_contracts([contract])
+
+    assert list(chain) == [contract]
+    assert len(chain) == 1
+
+
+def test_find_uses_exact_strike():
+    chain = OptionChain.from_raw(_raw_chain())
+
+    assert chain.find(100.0).strike == 100.0
+    assert chain.find(101.0) is None
+    assert chain.index_of([95.0, 110.0]).tolist() == [0, -1]
+    assert OptionChain.empty().find(100.0) is None
+
+
+def test_prices_fall_back_to_last():
+    chain = OptionChain.from_raw(_raw_chain())
+    prices = chain.prices()
+
+    assert prices[0] == 1.1
+    assert prices[1] == 2.1
+    assert math.isclose(prices[2], 3.1)
+
+
+def test_of_type_filters_rows():
+    raw = _raw_chain() + [{"symbol": "SPY", "strike": 110.0, "option_type": "CALL"}]
+    chain = OptionChain.from_raw(raw)
+
+    assert len(chain.of_type("put")) == 3
+    assert chain.of_type("call").strikes.tolist() == [110.0]
+
+
+def test_columnar_chain_is_smaller_than_contract_list():
+    raw = [
+        {
+            "symbol": "SPY",
+            "expiration": "2026-03-20",
+            "strike": float(strike),
+            "bid": 1.0,
+            "ask": 1.1,
+            "last": 1.05,
+            "open_interest": 100,
+        }
+        for strike in range(300)
+    ]
+    chain = OptionChain.from_raw(raw)
+
+    assert chain.nbytes * 3 < estimate_size(list(chain))
+
+
+def test_snapshot_index_expires_and_versions_snapshots():
+    now = {"value": 0.0}
+    index = ChainSnapshotIndex(max_age_seconds=60.0, clock=lambda: now["value"])
+    chain = OptionChain.from_raw(_raw_chain())
+
+    first = index.put("SPY", "2026-03-20", "put", chain)
+    second = index.put("SPY", "2026-03-20", "put", chain)
+
+    assert second > first
+    assert index.version("SPY", "2026-03-20", "put") == second
+    assert index.find("SPY", "2026-03-20", 95.0, "put").bid == 1.0
+    assert index.find("SPY", "2026-03-20", 95.0, "put", max_age_seconds=0.0) is not None
+
+    now["value"] = 30.0
+    assert index.find("SPY", "2026-03-20", 95.0, "put", max_age_seconds=10.0) is None
+
+    now["value"] = 61.0
+    assert index.version("SPY", "2026-03-20", "put") is None
+
+
+def test_from_raw_drops_rows_outside_window_before_parsing():
+    raw = _raw_chain() + [{"symbol": "SPY", "strike": 150.0, "bid": "not a number"}]
+
+    chain = OptionChain.from_raw(raw, StrikeWindow(low=96.0, high=110.0))
+
+    assert chain is not None
+    assert chain.strikes.tolist() == [100.0, 105.0]
+
+
+def test_within_slices_sorted_strikes():
+    chain = OptionChain.from_raw(_raw_chain())
+
+    assert chain.within(StrikeWindow(high=100.0)).strikes.tolist() == [95.0, 100.0]
+    assert chain.within(StrikeWindow(low=101.0)).strikes.tolist() == [105.0]
+    assert chain.within(StrikeWindow()) is chain
+
+
+def test_strike_window_containment_and_band():
+    wide = StrikeWindow.around(100.0, 0.10)
+
+    assert wide.low == pytest.approx(90.0) and wide.high == pytest.approx(110.0)
+    assert wide.contains(StrikeWindow(95.0, 105.0))
+    assert not wide.contains(StrikeWindow(85.0, 105.0))
+    assert not wide.contains(StrikeWindow(low=95.0))
+    assert StrikeWindow().contains(wide)
+    with pytest.raises(ValueError):
+        StrikeWindow(low=110.0, high=90.0)
+
+
+def test_strike_window_keys_keep_full_precision():
+    assert StrikeWindow(1234.561, 1300.0).key != StrikeWindow(1234.562, 1300.0).key
+    assert StrikeWindow(low=95.0).key == StrikeWindow(low=95).key
@@ -0,0 +1,127 @@
+import pytest
+
+from credit_spread_system.rate_limit import RateLimit, RateLimiter, TokenBucket, is_throttling_error
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class ThrottledError(Exception):
+    status_code = 429
+
+
+def test_token_bucket_allows_burst_then_waits():
+    clock = FakeClock()
+    bucket = TokenBucket(RateLimit(requests_per_second=2.0, burst=2), clock=clock, sleep=clock.sleep)
+
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+
+def test_token_bucket_halves_rate_when_throttled_and_recovers():
+    clock = FakeClock()
+    bucket = TokenBucket(RateLimit(requests_per_second=10.0, burst=1), clock=clock, sleep=clock.sleep)
+
+    bucket.on_throttled()
+    assert bucket.rate == 5.0
+    for _ in range(10):
+        bucket.on_success()
+    assert bucket.rate == 10.0
+
+
+def test_rate_limiter_retries_throttled_calls_with_backoff():
+    clock = FakeClock()
+    limiter = RateLimiter(
+        limits={"options": RateLimit(requests_per_second=100.0, burst=10)},
+        base_delay_seconds=1.0,
+        clock=clock,
+        sleep=clock.sleep,
+        jitter=lambda: 1.0,
+    )
+    attempts = {"count": 0}
+
+    def fetch(symbol):
+        attempts["count"] += 1
+        if attempts["count"] < 3:
+            raise ThrottledError("too many requests")
+        return symbol
+
+    assert limiter.call("options", fetch, "SPY") == "SPY"
+    assert attempts["count"] == 3
+    assert clock.sleeps[:2] == [1.0, 2.0]
+    stats = limiter.stats()["options"]
+    assert stats["retries"] == 2
+    assert stats["calls"] == 3
+
+
+def test_rate_limiter_does_not_retry_other_errors():
+    limiter = RateLimiter(limits={}, sleep=lambda _seconds: None)
+
+    def fetch():
+        raise ValueError("bad symbol")
+
+    with pytest.raises(ValueError):
+        limiter.call("stocks", fetch)
+    assert limiter.stats()["stocks"]["retries"] == 0
+
+
+def test_rate_limiter_gives_up_after_max_retries():
+    limiter = RateLimiter(limits={}, max_retries=2, sleep=lambda _seconds: None)
+    attempts = {"count": 0}
+
+    def fetch():
+        attempts["count"] += 1
+        raise ThrottledError()
+
+    with pytest.raises(ThrottledError):
+        limiter.call("stocks", fetch)
+    assert attempts["count"] == 3
+
+
+def test_rate_limiter_does_not_retry_timeouts():
+    limiter = RateLimiter(limits={}, sleep=lambda _seconds: None)
+    attempts = {"count": 0}
+
+    def fetch():
+        attempts["count"] += 1
+        raise TimeoutError("read timed out")
+
+    with pytest.raises(TimeoutError):
+        limiter.call("stocks", fetch)
+    assert attempts["count"] == 1
+    assert limiter.stats()["stocks"]["retries"] == 0
+
+
+def test_rate_limiter_records_wait_time():
+    clock = FakeClock()
+    limiter = RateLimiter(
+        limits={"stocks": RateLimit(requests_per_second=1.0, burst=1)},
+        clock=clock,
+        sleep=clock.sleep,
+    )
+
+    limiter.call("stocks", lambda: 1)
+    limiter.call("stocks", lambda: 2)
+
+    stats = limiter.stats()["stocks"]
+    assert stats["waits"] == 1
+    assert stats["wait_seconds"] == pytest.approx(1.0)
+
+
+def test_is_throttling_error():
+    assert is_throttling_error(ThrottledError())
+    assert is_throttling_error(RuntimeError("HTTP 429: rate limit exceeded"))
+    assert not is_throttling_error(TimeoutError())
+    assert not is_throttling_error(ValueError("invalid"))
@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+
+import pytest
+
+from credit_spread_system.alpaca_client import AlpacaClient, OptionLeg
+from credit_spread_system.recording import ReplayError, ReplaySession, SessionRecorder
+
+
+class LiveOptionsClient:
+    def __init__(self):
+        self.calls = 0
+
+    def get_option_chain(self, symbol, expiration, option_type):
+        self.calls += 1
+        return [
+            SimpleNamespace(
+                symbol=symbol,
+                expiration=expiration,
+                strike=100.0,
+                option_type=option_type,
+                bid_price=1.0,
+                ask_price=1.1,
+                last_price=1.05,
+                open_interest=900,
+            )
+        ]
+
+    def get_latest_option_quotes(self, legs):
+        self.calls += 1
+        return {leg: {"bid": 2.0, "ask": 2.2} for leg in legs}
+
+
+class LiveMarketClient:
+    def get_latest_trade(self, symbol):
+        if symbol == "BAD":
+            raise RuntimeError("unknown symbol")
+        return {"price": 500.0}
+
+
+@pytest.mark.parametrize("filename", ["session.jsonl", "session.jsonl.gz"])
+def test_record_then_replay_round_trip(tmp_path, filename):
+    path = tmp_path / filename
+    live_options = LiveOptionsClient()
+    with SessionRecorder(path) as recorder:
+        client = AlpacaClient(
+            options_client=recorder.wrap(live_options, "options"),
+            market_client=recorder.wrap(LiveMarketClient(), "market"),
+        )
+        live_chain = client.get_option_chain("SPY", "2026-03-20", "put")
+        live_price = client.get_underlying_price("SPY")
+        leg = OptionLeg("SPY", "2026-03-20", 95.0)
+        live_quotes = client.get_option_quotes([leg])
+        assert client.get_underlying_price("BAD") is None
+
+    session = ReplaySession.load(path)
+    replay = AlpacaClient(
+        options_client=session.provider("options"), market_client=session.provider("market")
+    )
+
+    assert len(session) == 4
+    assert list(replay.get_option_chain("SPY", "2026-03-20", "put")) == list(live_chain)
+    assert replay.get_underlying_price("SPY") == live_price
+    assert replay.get_option_quotes([leg]) == live_quotes
+    assert replay.get_underlying_price("BAD") is None
+
+
+def test_replay_only_exposes_recorded_methods(tmp_path):
+    path = tmp_path / "session.jsonl"
+    with SessionRecorder(path) as recorder:
+        recorder.wrap(LiveMarketClient(), "market").get_latest_trade("SPY")
+
+    provider = ReplaySession.load(path).provider("market")
+
+    assert hasattr(provider, "get_latest_trade")
+    assert not hasattr(provider, "get_price_history")
+    with pytest.raises(ReplayError):
+        provider.get_latest_trade("QQQ")
+
+
+def test_replay_honors_recorded_latency(tmp_path):
+    path = tmp_path / "session.jsonl"
+    with SessionRecorder(path) as recorder:
+        recorder.record("market", "get_latest_trade", ("SPY",), {"price": 1.0}, latency=0.25)
+
+    sleeps = []
+    provider = ReplaySession.load(path, honor_latency=True, sleep=sleeps.append).provider("market")
+
+    assert provider.get_latest_trade("SPY") == {"price": 1.0}
+    assert provider.get_latest_trade("SPY") == {"price": 1.0}
+    assert sleeps == [0.25, 0.25]
+
+
+def test_keyword_arguments_are_forwarded_and_part_of_the_replay_key(tmp_path):
+    class KeywordMarketClient:
+        def get_price_history(self, symbol, days=30):
+            return {"symbol": symbol, "days": days}
+
+    path = tmp_path / "session.jsonl"
+    with SessionRecorder(path) as recorder:
+        live = recorder.wrap(KeywordMarketClient(), "market")
+        assert live.get_price_history("SPY", days=5) == {"symbol": "SPY", "days": 5}
+        assert live.get_price_history("SPY", days=10) == {"symbol": "SPY", "days": 10}
+
+    provider = ReplaySession.load(path).provider("market")
+
+    assert provider.get_price_history("SPY", days=10) == {"symbol": "SPY", "days": 10}
+    assert provider.get_price_history("SPY", days=5) == {"symbol": "SPY", "days": 5}
+    with pytest.raises(ReplayError):
+        provider.get_price_history("SPY")
@@ -0,0 +1,150 @@
+import threading
+
+from credit_spread_system.alpaca_client import AlpacaClient, Quote
+from credit_spread_system.iv_rank import IvRankService
+from credit_spread_system.shared_cache import SharedMarketDataCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_visible_across_instances(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    first = SharedMarketDataCache(path)
+    second = SharedMarketDataCache(path)
+
+    first.set("option:SPY:2026-03-20:100.0:put", Quote(bid=1.0, ask=1.2, last=1.1))
+
+    assert second.get("option:SPY:2026-03-20:100.0:put") == Quote(bid=1.0, ask=1.2, last=1.1)
+    assert "option:SPY:2026-03-20:100.0:put" in second
+    assert len(second) == 1
+
+
+def test_ttl_and_stale_grace(tmp_path):
+    clock = FakeClock()
+    cache = SharedMarketDataCache(
+        tmp_path / "cache.sqlite3", ttl_by_kind={"underlying": 5.0}, clock=clock
+    )
+    cache.stale_grace_seconds = 10.0
+    cache.set("underlying:SPY", 100.0)
+
+    clock.now += 6.0
+    assert cache.get("underlying:SPY") is None
+    assert cache.lookup("underlying:SPY") == (100.0, True)
+
+    clock.now += 10.0
+    assert cache.lookup("underlying:SPY") is None
+    assert len(cache) == 0
+
+
+def test_sweep_removes_expired(tmp_path):
+    clock = FakeClock()
+    cache = SharedMarketDataCache(tmp_path / "cache.sqlite3", clock=clock)
+    cache.set("underlying:OLD", 1.0, ttl_seconds=1.0)
+    cache.set("underlying:A", 2.0, ttl_seconds=100.0)
+
+    clock.now += 2.0
+    removed = cache.sweep()
+
+    assert removed == 1
+    assert cache.get("underlying:OLD") is None
+    assert cache.get("underlying:A") == 2.0
+
+
+def test_set_evicts_least_recently_used(tmp_path):
+    clock = FakeClock()
+    cache = SharedMarketDataCache(tmp_path / "cache.sqlite3", max_entries=2, clock=clock)
+    evicted = []
+    cache.subscribe(on_evict=evicted.append)
+    cache.set("underlying:A", 1.0, ttl_seconds=50.0)
+    clock.now += 1.0
+    cache.set("underlying:B", 2.0, ttl_seconds=100.0)
+    clock.now += 1.0
+    assert cache.get("underlying:A") == 1.0
+    clock.now += 1.0
+
+    cache.set("underlying:C", 3.0)
+
+    assert evicted == ["underlying:B"]
+    assert len(cache) == 2
+    assert "underlying:A" in cache
+
+
+def test_lease_is_exclusive_until_released(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    first = SharedMarketDataCache(path)
+    second = SharedMarketDataCache(path)
+
+    token = first.acquire_lease("underlying:SPY")
+    assert token is not None
+    assert second.acquire_lease("underlying:SPY") is None
+
+    first.release_lease("underlying:SPY", token)
+    assert second.acquire_lease("underlying:SPY") is not None
+
+
+def test_claim_returns_value_written_by_lease_holder(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    holder = SharedMarketDataCache(path)
+    waiter = SharedMarketDataCache(path, sleep=lambda _s: holder.set("underlying:SPY", 101.0))
+
+    assert holder.acquire_lease("underlying:SPY") is not None
+
+    assert waiter.claim("underlying:SPY") == (None, 101.0)
+
+
+def test_clients_sharing_cache_fetch_once(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    calls = {"count": 0}
+    release = threading.Event()
+
+    class SlowMarketClient:
+        def get_latest_trade(self, _symbol):
+            calls["count"] += 1
+            release.wait(timeout=5)
+            return {"price": 100.0}
+
+    clients = [
+        AlpacaClient(
+            options_client=None,
+            market_client=SlowMarketClient(),
+            cache=SharedMarketDataCache(path, poll_interval_seconds=0.01),
+        )
+        for _ in range(5)
+    ]
+    results = []
+    threads = [
+        threading.Thread(target=lambda c=c: results.append(c.get_underlying_price("SPY")))
+        for c in clients
+    ]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert results == [100.0] * 5
+    assert calls["count"] == 1
+
+
+def test_iv_rank_service_uses_shared_cache(tmp_path):
+    class FakeAlpaca:
+        def __init__(self):
+            self.calls = 0
+
+        def get_iv_history(self, _symbol):
+            self.calls += 1
+            return [10.0, 12.0, 8.0, 15.0]
+
+    path = tmp_path / "cache.sqlite3"
+    alpaca = FakeAlpaca()
+    IvRankService(cache=SharedMarketDataCache(path)).get_iv_rank("SPY", alpaca)
+    result = IvRankService(cache=SharedMarketDataCache(path)).get_iv_rank("SPY", alpaca)
+
+    assert result.iv_rank == 100.0
+    assert alpaca.calls == 1
@@ -0,0 +1,106 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+from credit_spread_system.option_chain import OptionChain, OptionContract
+from credit_spread_system.spread_search import search_spreads
+
+
+def _chain(strikes, mids, open_interest=1_000, spread=0.04):
+    return OptionChain.from_columns(
+        symbols=["SPY"] * len(strikes),
+        expirations=["2026-03-20"] * len(strikes),
+        strikes=strikes,
+        option_types=["put"] * len(strikes),
+        bids=[mid - spread / 2 for mid in mids],
+        asks=[mid + spread / 2 for mid in mids],
+        lasts=mids,
+        open_interest=[open_interest] * len(strikes),
+    )
+
+
+def _brute_force(chain, support, widths=(5.0, 10.0)):
+    contracts = {c.strike: c for c in chain}
+    found = []
+    for width in widths:
+        for strike, short in contracts.items():
+            long = contracts.get(strike - width)
+            if long is None or strike >= support:
+                continue
+            if round(short.ask - short.bid, 2) > 0.10 or short.open_interest < 500:
+                continue
+            credit = (short.bid + short.ask) / 2 - (long.bid + long.ask) / 2
+            if credit > width / 3:
+                found.append((strike, strike - width))
+    return set(found)
+
+
+def test_search_finds_every_acceptable_pair():
+    strikes = np.arange(50.0, 150.0, 1.0)
+    mids = np.maximum(0.05, (strikes - 80.0) * 0.45)
+    chain = _chain(strikes, mids)
+
+    candidates = search_spreads(chain, support=130.0, top_k=1_000)
+
+    assert {(c.short_strike, c.long_strike) for c in candidates} == _brute_force(chain, 130.0)
+    scores = [c.score for c in candidates]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_search_returns_best_not_first():
+    chain = [
+        OptionContract("SPY", "2026-03-20", 80.0, "put", 0.10, 0.12, None, 900),
+        OptionContract("SPY", "2026-03-20", 85.0, "put", 2.00, 2.04, None, 900),
+        OptionContract("SPY", "2026-03-20", 90.0, "put", 4.50, 4.54, None, 900),
+    ]
+
+    (best,) = search_spreads(chain, support=100.0)
+
+    assert (best.short_strike, best.long_strike) == (90.0, 85.0)
+    assert best.credit == pytest.approx(2.5)
+    assert best.width == 5.0
+
+
+def test_custom_score_and_top_k():
+    strikes = np.arange(80.0, 100.0, 5.0)
+    chain = _chain(strikes, [0.1, 2.0, 4.5, 7.5])
+
+    def widest_first(credits, widths, _shorts, _support):
+        return widths
+
+    candidates = search_spreads(chain, support=100.0, top_k=2, score=widest_first)
+
+    assert [c.width for c in candidates] == [10.0, 10.0]
+
+
+def test_search_handles_empty_inputs():
+    assert search_spreads([], support=100.0) == []
+    assert search_spreads(_chain([95.0], [1.0]), support=100.0) == []
+    assert search_spreads(_chain([90.0, 95.0], [0.1, 3.0]), support=100.0, top_k=0) == []
+
+
+def test_full_chain_matches_reference_search():
+    strikes = np.arange(100.0, 600.0, 1.0)
+    chain = _chain(strikes, np.maximum(0.05, (strikes - 300.0) * 0.4))
+
+    candidates = search_spreads(chain, support=450.0, top_k=100_000)
+    top = search_spreads(chain, support=450.0, top_k=5)
+
+    assert {(c.short_strike, c.long_strike) for c in candidates} == _brute_force(chain, 450.0)
+    assert top == candidates[:5]
+
+
+@pytest.mark.skipif(not os.environ.get("RUN_BENCHMARKS"), reason="set RUN_BENCHMARKS=1 to run")
+def test_full_chain_search_benchmark():
+    strikes = np.arange(100.0, 600.0, 1.0)
+    chain = _chain(strikes, np.maximum(0.05, (strikes - 300.0) * 0.4))
+    search_spreads(chain, support=450.0)
+
+    start = time.perf_counter()
+    for _ in range(100):
+        search_spreads(chain, support=450.0, top_k=5)
+    elapsed = (time.perf_counter() - start) / 100
+
+    assert elapsed < 0.005
@@ -0,0 +1,125 @@
+from datetime import date, datetime, timezone
+
+from credit_spread_system.alpaca_client import AlpacaClient, OptionLeg
+from credit_spread_system.models import Position
+from credit_spread_system.streaming import LocalQuoteFeed, QuoteStreamManager, QuoteUpdate
+
+
+class NoNetworkOptionsClient:
+    def get_latest_option_quote(self, *_args):
+        raise AssertionError("streamed quotes should be served from cache")
+
+
+class NoNetworkMarketClient:
+    def get_latest_trade(self, _symbol):
+        raise AssertionError("streamed prices should be served from cache")
+
+
+def _position(position_id="1", symbol="SPY", short_strike=450.0, long_strike=445.0):
+    return Position(
+        position_id=position_id,
+        symbol=symbol,
+        short_strike=short_strike,
+        long_strike=long_strike,
+        expiration=date(2026, 3, 20),
+        entry_credit=1.0,
+        contracts=1,
+        status="OPEN",
+    )
+
+
+def _client():
+    return AlpacaClient(
+        options_client=NoNetworkOptionsClient(), market_client=NoNetworkMarketClient()
+    )
+
+
+def test_streamed_updates_populate_client_cache():
+    client = _client()
+    feed = LocalQuoteFeed()
+    manager = QuoteStreamManager(client, feed)
+    manager.subscribe_positions([_position()])
+
+    leg = OptionLeg("SPY", "2026-03-20", 450.0, "put")
+    stamp = datetime(2026, 3, 2, 15, 0, tzinfo=timezone.utc)
+    assert feed.publish(QuoteUpdate("SPY", bid=1.0, ask=1.2, last=None, timestamp=stamp, leg=leg))
+    assert feed.publish(QuoteUpdate("SPY", bid=None, ask=None, last=451.5, timestamp=stamp))
+
+    quote = client.get_option_quote("SPY", "2026-03-20", 450.0, "put")
+    assert quote is not None
+    assert quote.bid == 1.0
+    assert quote.timestamp == stamp
+    assert client.get_underlying_price("SPY") == 451.5
+    assert manager.updates_applied == 2
+
+
+def test_out_of_order_updates_are_dropped():
+    client = _client()
+    feed = LocalQuoteFeed()
+    manager = QuoteStreamManager(client, feed)
+    manager.subscribe_underlyings(["QQQ"])
+
+    newer = datetime(2026, 3, 2, 15, 0, 5, tzinfo=timezone.utc)
+    older = datetime(2026, 3, 2, 15, 0, 0, tzinfo=timezone.utc)
+    feed.publish(QuoteUpdate("QQQ", bid=None, ask=None, last=400.0, timestamp=newer))
+    feed.publish(QuoteUpdate("QQQ", bid=None, ask=None, last=399.0, timestamp=older))
+
+    assert client.get_underlying_price("QQQ") == 400.0
+    assert manager.updates_dropped == 1
+
+
+def test_unsubscribed_symbols_are_not_delivered():
+    feed = LocalQuoteFeed()
+    QuoteStreamManager(_client(), feed).subscribe_underlyings(["SPY"])
+
+    assert not feed.publish(QuoteUpdate("IWM", bid=None, ask=None, last=200.0))
+
+
+def test_sync_positions_drops_closed_legs():
+    feed = LocalQuoteFeed()
+    manager = QuoteStreamManager(_client(), feed)
+    manager.subscribe_positions([_position("1"), _position("2", symbol="QQQ")])
+
+    manager.sync_positions([_position("1")], universe=["IWM"])
+
+    assert feed.subscribed() == {
+        "SPY",
+        "IWM",
+        OptionLeg("SPY", "2026-03-20", 450.0).occ_symbol,
+        OptionLeg("SPY", "2026-03-20", 445.0).occ_symbol,
+    }
+
+    manager.close()
+    assert feed.subscribed() == set()
+
+
+def test_bare_occ_updates_are_routed_to_their_leg():
+    client = _client()
+    feed = LocalQuoteFeed()
+    manager = QuoteStreamManager(client, feed)
+    manager.subscribe_positions([_position()])
+
+    leg = OptionLeg("SPY", "2026-03-20", 445.0, "put")
+    assert feed.publish(QuoteUpdate(leg.occ_symbol, bid=0.5, ask=0.6, last=None))
+
+    quote = client.get_option_quote("SPY", "2026-03-20", 445.0, "put")
+    assert quote is not None
+    assert quote.bid == 0.5
+    assert client.cache.get(f"underlying:{leg.occ_symbol}") is None
+
+
+def test_unsubscribing_forgets_stream_timestamps():
+    client = _client()
+    feed = LocalQuoteFeed()
+    manager = QuoteStreamManager(client, feed)
+    manager.subscribe_positions([_position("1"), _position("2", symbol="QQQ")])
+    stamp = datetime(2026, 3, 2, 15, 0, tzinfo=timezone.utc)
+    for key in feed.subscribed():
+        feed.publish(QuoteUpdate(key, bid=1.0, ask=1.1, last=1.05, timestamp=stamp))
+    assert len(client._stream_timestamps) == 6
+
+    manager.sync_positions([_position("1")])
+    assert len(client._stream_timestamps) == 3
+
+    manager.close()
+    assert client._stream_timestamps == {}
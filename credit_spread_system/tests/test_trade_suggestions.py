@@ -1,5 +1,21 @@
+import asyncio
+import threading
+import time
+from datetime import date
+
+import pytest
+
 from credit_spread_system.alpaca_client import OptionContract
-from credit_spread_system.trade_suggestions import SuggestionEngine
+from credit_spread_system.expirations import ExpirationService
+from credit_spread_system.features import FeatureCache, SymbolFeatures
+from credit_spread_system.trade_suggestions import (
+    SuggestionEngine,
+    TopSuggestions,
+    TradeSuggestion,
+    _risk_score,
+    _select_spread,
+)
+from credit_spread_system.universe_index import UniverseIndex
 
 
 class FakeAlpaca:
@@ -48,3 +64,262 @@ def test_generate_suggestions_returns_candidate():
     assert suggestions
     assert suggestions[0].symbol == "SPY"
     assert suggestions[0].credit > 0
+
+
+def test_generate_suggestions_async_matches_sync():
+    engine = SuggestionEngine(FakeAlpaca())
+
+    async_suggestions = asyncio.run(engine.generate_suggestions_async(["SPY", "QQQ"]))
+
+    assert async_suggestions == engine.generate_suggestions(["SPY", "QQQ"])
+
+
+def test_select_spread_skips_wide_and_illiquid_strikes():
+    chain = [
+        OptionContract("SPY", "2026-03-20", 90.0, "put", 0.3, 0.35, None, 600),
+        OptionContract("SPY", "2026-03-20", 95.0, "put", 2.0, 2.5, None, 600),
+        OptionContract("SPY", "2026-03-20", 100.0, "put", 3.0, 3.05, None, 100),
+        OptionContract("SPY", "2026-03-20", 105.0, "put", 5.0, 5.05, None, 600),
+    ]
+
+    assert _select_spread(chain, support=110.0) == (105.0, 100.0, pytest.approx(2.0))
+    assert _select_spread(chain, support=100.0) is None
+
+
+def test_parallel_scan_matches_serial_and_overlaps_symbols():
+    class SlowAlpaca(FakeAlpaca):
+        def __init__(self):
+            super().__init__()
+            self.active = 0
+            self.peak = 0
+            self.lock = threading.Lock()
+
+        def get_price_history(self, symbol, days=260):
+            with self.lock:
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+            time.sleep(0.02)
+            with self.lock:
+                self.active -= 1
+            return super().get_price_history(symbol, days)
+
+    universe = ["SPY", "QQQ", "IWM", "DIA", "XLF", "XLK"]
+    serial = SuggestionEngine(FakeAlpaca()).generate_suggestions(universe)
+    alpaca = SlowAlpaca()
+
+    parallel = SuggestionEngine(alpaca, max_workers=6).generate_suggestions(universe)
+
+    assert parallel == serial
+    assert alpaca.peak > 1
+
+
+def test_scan_isolates_failing_symbol():
+    class FlakyAlpaca(FakeAlpaca):
+        def get_price_history(self, symbol, days=260):
+            if symbol == "QQQ":
+                raise RuntimeError("boom")
+            return super().get_price_history(symbol, days)
+
+    for workers in (1, 4):
+        suggestions = SuggestionEngine(FlakyAlpaca(), max_workers=workers).generate_suggestions(
+            ["SPY", "QQQ"]
+        )
+        assert suggestions
+        assert {s.symbol for s in suggestions} == {"SPY"}
+
+
+def test_async_scan_propagates_cancellation():
+    class CancelledAlpaca(FakeAlpaca):
+        def get_price_history(self, symbol, days=260):
+            if symbol == "QQQ":
+                raise asyncio.CancelledError()
+            return super().get_price_history(symbol, days)
+
+    engine = SuggestionEngine(CancelledAlpaca())
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(engine.generate_suggestions_async(["SPY", "QQQ"]))
+
+
+def test_max_workers_must_be_positive():
+    with pytest.raises(ValueError):
+        SuggestionEngine(FakeAlpaca(), max_workers=0)
+
+
+def test_rerun_with_unchanged_bars_skips_feature_computation(monkeypatch):
+    builds = {"count": 0}
+    original = SymbolFeatures.build.__func__
+
+    def counting_build(cls, symbol, history):
+        builds["count"] += 1
+        return original(cls, symbol, history)
+
+    monkeypatch.setattr(SymbolFeatures, "build", classmethod(counting_build))
+    engine = SuggestionEngine(FakeAlpaca(), feature_cache=FeatureCache())
+
+    first = engine.generate_suggestions(["SPY", "QQQ"])
+    second = engine.generate_suggestions(["SPY", "QQQ"])
+
+    assert first == second
+    assert builds["count"] == 2
+
+
+def test_scan_fetches_only_listed_expirations_in_window_in_one_batch():
+    class ListingAlpaca(FakeAlpaca):
+        def __init__(self):
+            super().__init__()
+            self.batches = []
+
+        def get_option_expirations(self, _symbol):
+            return ["2026-03-06", "2026-03-20", "2026-03-27", "2026-04-03", "2026-05-15"]
+
+        def get_option_chain(self, *_args, **_kwargs):
+            raise AssertionError("chains should be fetched in one batch")
+
+        def get_option_chains(self, symbol, expirations, option_type="put"):
+            self.batches.append(list(expirations))
+            return {
+                expiration: FakeAlpaca.get_option_chain(self, symbol, expiration, option_type)
+                for expiration in expirations
+            }
+
+    alpaca = ListingAlpaca()
+    service = ExpirationService(alpaca, today=lambda: date(2026, 2, 17))
+    engine = SuggestionEngine(alpaca, feature_cache=FeatureCache(), expiration_service=service)
+
+    suggestions = engine.generate_suggestions(["SPY"])
+
+    assert alpaca.batches == [["2026-03-20", "2026-03-27"]]
+    assert sorted(s.expiration for s in suggestions) == ["2026-03-20", "2026-03-27"]
+    assert asyncio.run(engine.generate_suggestions_async(["SPY"])) == suggestions
+
+
+def test_strike_band_requests_window_below_support():
+    class WindowAlpaca(FakeAlpaca):
+        def __init__(self):
+            super().__init__()
+            self.windows = []
+
+        def get_option_chain(self, symbol, expiration, option_type="put", strikes=None):
+            self.windows.append(strikes)
+            return super().get_option_chain(symbol, expiration, option_type)
+
+    alpaca = WindowAlpaca()
+    engine = SuggestionEngine(alpaca, feature_cache=FeatureCache(), strike_band=0.15)
+
+    engine.generate_suggestions(["SPY"])
+
+    assert alpaca.windows
+    support = engine._features("SPY", alpaca.get_price_history("SPY")).support
+    window = alpaca.windows[0]
+    assert window.high == support
+    assert window.low == pytest.approx(support * 0.85 - 10.0)
+
+
+def test_rescan_reuses_symbols_whose_inputs_are_unchanged():
+    class VersionedAlpaca(FakeAlpaca):
+        def __init__(self):
+            super().__init__()
+            self.versions = {}
+            self.fetches = []
+
+        def get_option_chain(self, symbol, expiration, option_type="put"):
+            self.fetches.append(symbol)
+            self.versions[(symbol, expiration)] = self.versions.get((symbol, expiration), 0) + 1
+            return super().get_option_chain(symbol, expiration, option_type)
+
+        def chain_version(self, symbol, expiration, _option_type="put"):
+            return self.versions.get((symbol, expiration))
+
+    alpaca = VersionedAlpaca()
+    service = ExpirationService(alpaca, today=lambda: date(2026, 2, 17))
+    engine = SuggestionEngine(alpaca, feature_cache=FeatureCache(), expiration_service=service)
+
+    first = engine.generate_suggestions(["SPY", "QQQ"])
+    fetched = len(alpaca.fetches)
+    warm = engine.generate_suggestions(["SPY", "QQQ"])
+
+    assert warm == first
+    assert len(alpaca.fetches) == fetched
+
+    # An expired chain snapshot has no version, so only that symbol is rescanned.
+    del alpaca.versions[("QQQ", "2026-03-20")]
+    alpaca.fetches.clear()
+    assert engine.generate_suggestions(["SPY", "QQQ"]) == first
+    assert set(alpaca.fetches) == {"QQQ"}
+    assert asyncio.run(engine.generate_suggestions_async(["SPY", "QQQ"])) == first
+
+
+def test_universe_index_drops_symbols_before_per_symbol_requests():
+    class BulkAlpaca(FakeAlpaca):
+        def __init__(self):
+            super().__init__()
+            self.per_symbol = []
+
+        def get_price_history(self, symbol, days=260):
+            self.per_symbol.append(symbol)
+            return super().get_price_history(symbol, days)
+
+        def get_price_histories(self, symbols, days=260):
+            thin = [dict(bar, volume=1_000) for bar in self._history]
+            return {
+                symbol: thin if symbol.startswith("THIN") else self._history for symbol in symbols
+            }
+
+    alpaca = BulkAlpaca()
+    index = UniverseIndex(today=lambda: date(2026, 2, 17))
+    engine = SuggestionEngine(alpaca, feature_cache=FeatureCache(), universe_index=index)
+    universe = ["SPY"] + [f"THIN{i}" for i in range(50)]
+
+    suggestions = engine.generate_suggestions(universe)
+
+    assert {s.symbol for s in suggestions} == {"SPY"}
+    assert alpaca.per_symbol == ["SPY"]
+    assert asyncio.run(engine.generate_suggestions_async(universe)) == suggestions
+
+
+def _suggestion(symbol, risk_label):
+    return TradeSuggestion(symbol, "2026-03-20", 95.0, 90.0, 1.7, 100.0, 2, risk_label, "")
+
+
+def test_top_suggestions_keeps_best_k_like_a_stable_sort():
+    labels = ["Aggressive", "Moderate", "Conservative"]
+    suggestions = [_suggestion(f"S{i}", labels[(i * 7) % 3]) for i in range(40)]
+    top = TopSuggestions(k=5)
+
+    kept = [top.push(suggestion) for suggestion in suggestions]
+
+    assert len(top) == 5
+    assert top.items() == sorted(suggestions, key=_risk_score)[:5]
+    assert not all(kept)
+    with pytest.raises(ValueError):
+        TopSuggestions(k=0)
+
+
+def test_generate_suggestions_iter_yields_before_slow_symbols_finish():
+    release = threading.Event()
+
+    class SlowQqqAlpaca(FakeAlpaca):
+        def get_price_history(self, symbol, days=260):
+            if symbol == "QQQ":
+                release.wait(timeout=2.0)
+            return super().get_price_history(symbol, days)
+
+    engine = SuggestionEngine(SlowQqqAlpaca(), max_workers=2, feature_cache=FeatureCache())
+    stream = engine.generate_suggestions_iter(["QQQ", "SPY"])
+
+    rank, first = next(stream)
+    assert (rank, first.symbol) == (1, "SPY")
+    release.set()
+    assert {(rank, s.symbol) for rank, s in stream} == {(0, "QQQ"), (1, "SPY")}
+
+
+def test_streamed_ranks_reproduce_generate_suggestions_ties():
+    engine = SuggestionEngine(FakeAlpaca(), max_workers=4, feature_cache=FeatureCache())
+    universe = ["SPY", "QQQ", "IWM", "DIA", "XLF", "XLK"]
+
+    top = TopSuggestions(k=3)
+    for rank, suggestion in engine.generate_suggestions_iter(universe):
+        top.push(suggestion, rank=rank)
+
+    assert top.items() == engine.generate_suggestions(universe)[:3]
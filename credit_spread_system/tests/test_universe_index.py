@@ -0,0 +1,119 @@
+from datetime import date
+
+from credit_spread_system.alpaca_client import AlpacaClient
+from credit_spread_system.iv_rank import IvRankResult
+from credit_spread_system.universe_index import UniverseIndex
+
+
+def _history(volume=2_000_000, step=0.5):
+    return [
+        {"close": 100 + i * step, "volume": volume, "date": f"2026-01-{1 + i % 28:02d}"}
+        for i in range(260)
+    ]
+
+
+class FakeAlpaca:
+    def __init__(self, histories):
+        self.histories = histories
+        self.batches = []
+
+    def get_price_histories(self, symbols, days=260):
+        self.batches.append(list(symbols))
+        return {symbol: self.histories.get(symbol) for symbol in symbols}
+
+
+class FakeIvService:
+    def __init__(self, ranks):
+        self.ranks = ranks
+        self.calls = []
+
+    def get_iv_rank(self, symbol, _alpaca):
+        self.calls.append(symbol)
+        return IvRankResult(
+            symbol=symbol, iv_rank=self.ranks.get(symbol), blocked=False, reason=""
+        )
+
+
+def test_prefilter_discards_illiquid_downtrending_and_low_iv_symbols():
+    alpaca = FakeAlpaca(
+        {
+            "SPY": _history(),
+            "THIN": _history(volume=10_000),
+            "DOWN": _history(step=-0.2),
+            "CALM": _history(),
+        }
+    )
+    iv = FakeIvService({"SPY": 45.0, "CALM": 5.0})
+    index = UniverseIndex(today=lambda: date(2026, 2, 17))
+
+    kept = index.prefilter(["SPY", "THIN", "DOWN", "CALM", "GONE"], alpaca, iv)
+
+    # GONE has no row yet, so the full screen gets to decide.
+    assert kept == ["SPY", "GONE"]
+    assert alpaca.batches == [["SPY", "THIN", "DOWN", "CALM", "GONE"]]
+    assert iv.calls == ["SPY", "CALM"]
+
+
+def test_index_refreshes_once_a_day_and_persists(tmp_path):
+    path = tmp_path / "universe.sqlite3"
+    alpaca = FakeAlpaca({"SPY": _history(), "QQQ": _history()})
+    iv = FakeIvService({"SPY": 45.0, "QQQ": 50.0})
+    day = {"today": date(2026, 2, 17)}
+
+    index = UniverseIndex(path, today=lambda: day["today"])
+    assert index.prefilter(["SPY", "QQQ"], alpaca, iv) == ["SPY", "QQQ"]
+    index.close()
+
+    reopened = UniverseIndex(path, today=lambda: day["today"])
+    assert reopened.prefilter(["SPY", "QQQ"], alpaca, iv) == ["SPY", "QQQ"]
+    assert len(alpaca.batches) == 1
+
+    day["today"] = date(2026, 2, 18)
+    reopened.prefilter(["SPY", "QQQ", "IWM"], alpaca, iv)
+    assert alpaca.batches[1:] == [["SPY", "QQQ", "IWM"]]
+    assert reopened.load(["SPY"])["SPY"].as_of == date(2026, 2, 18)
+
+
+def test_missing_history_is_retried_on_next_scan():
+    alpaca = FakeAlpaca({"SPY": _history()})
+    iv = FakeIvService({"SPY": 45.0})
+    index = UniverseIndex(today=lambda: date(2026, 2, 17))
+
+    index.prefilter(["SPY", "QQQ"], alpaca, iv)
+    index.prefilter(["SPY", "QQQ"], alpaca, iv)
+
+    assert alpaca.batches == [["SPY", "QQQ"], ["QQQ"]]
+
+
+def test_prefilter_scans_everything_when_refresh_fails():
+    class BrokenAlpaca:
+        def get_price_histories(self, _symbols, days=260):
+            raise RuntimeError("boom")
+
+    index = UniverseIndex(today=lambda: date(2026, 2, 17))
+
+    assert index.prefilter(["SPY", "QQQ"], BrokenAlpaca(), FakeIvService({})) == ["SPY", "QQQ"]
+
+
+def test_prefilter_keeps_symbols_when_client_swallows_fetch_errors():
+    class BrokenMarketClient:
+        def get_price_histories(self, _symbols, _days):
+            raise RuntimeError("boom")
+
+    alpaca = AlpacaClient(options_client=None, market_client=BrokenMarketClient())
+    index = UniverseIndex(today=lambda: date(2026, 2, 17))
+
+    assert index.prefilter(["SPY", "QQQ"], alpaca, FakeIvService({})) == ["SPY", "QQQ"]
+
+
+def test_prefilter_falls_back_to_previous_rows_when_refresh_returns_nothing():
+    day = {"today": date(2026, 2, 17)}
+    alpaca = FakeAlpaca({"SPY": _history(), "THIN": _history(volume=10_000)})
+    iv = FakeIvService({"SPY": 45.0})
+    index = UniverseIndex(today=lambda: day["today"])
+    assert index.prefilter(["SPY", "THIN"], alpaca, iv) == ["SPY"]
+
+    day["today"] = date(2026, 2, 18)
+    alpaca.histories = {}
+
+    assert index.prefilter(["SPY", "THIN"], alpaca, iv) == ["SPY"]
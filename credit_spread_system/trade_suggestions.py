@@ -1,12 +1,31 @@
 from __future__ import annotations
 
+import asyncio
+import heapq
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from datetime import date, datetime
-from typing import Iterable, Optional, Sequence
-
-from credit_spread_system.alpaca_client import AlpacaClient, OptionContract
-from credit_spread_system.iv_rank import IvRankService
-from credit_spread_system.pricing import get_mid_price
+from typing import Any, Hashable, Iterable, Iterator, Optional, Sequence
+
+from credit_spread_system.alpaca_client import AlpacaClient
+from credit_spread_system.async_alpaca_client import AsyncAlpacaClient
+from credit_spread_system.expirations import ExpirationService
+from credit_spread_system.features import (
+    FeatureCache,
+    SymbolFeatures,
+    TrendSignals,
+    shared_feature_cache,
+)
+from credit_spread_system.iv_rank import IvRankResult, IvRankService
+from credit_spread_system.option_chain import OptionChain, OptionContract
+from credit_spread_system.spread_search import search_spreads, search_window
+from credit_spread_system.universe_index import UniverseIndex
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCAN_WORKERS = 8
+MAX_SUGGESTIONS = 5
 
 DEFAULT_ETF_UNIVERSE = [
     "SPY",
@@ -45,168 +64,377 @@ class TradeSuggestion:
     reasoning: str
 
 
+class TopSuggestions:
+    def __init__(self, k: int = MAX_SUGGESTIONS) -> None:
+        if k <= 0:
+            raise ValueError("k must be positive")
+        self.k = k
+        self._heap: list[tuple[float, int, int, TradeSuggestion]] = []
+        self._seq = 0
+
+    def push(self, suggestion: TradeSuggestion, rank: int | None = None) -> bool:
+        # Keys are negated so the heap root is the worst of the kept k. Ties go to
+        # the lower rank, then the earlier push, matching a stable sort.
+        seq = self._seq
+        self._seq += 1
+        entry = (-_risk_score(suggestion), -(seq if rank is None else rank), -seq, suggestion)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[:3] <= self._heap[0][:3]:
+            return False
+        heapq.heapreplace(self._heap, entry)
+        return True
+
+    def items(self) -> list[TradeSuggestion]:
+        ordered = sorted(self._heap, key=lambda entry: entry[:3], reverse=True)
+        return [entry[3] for entry in ordered]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
 @dataclass(frozen=True)
-class TrendSignals:
-    above_50_and_rising: bool
-    above_20_and_50: bool
-    higher_lows: bool
+class _SymbolScreen:
+    trend: TrendSignals
+    support: float
+    iv_rank: float
 
 
 class SuggestionEngine:
-    def __init__(self, alpaca: AlpacaClient, iv_service: IvRankService | None = None) -> None:
+    def __init__(
+        self,
+        alpaca: AlpacaClient,
+        iv_service: IvRankService | None = None,
+        max_workers: int = 1,
+        feature_cache: FeatureCache | None = None,
+        expiration_service: ExpirationService | None = None,
+        strike_band: float | None = None,
+        universe_index: UniverseIndex | None = None,
+    ) -> None:
+        if max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+        if strike_band is not None and not 0 <= strike_band < 1:
+            raise ValueError("strike_band must be in [0, 1)")
         self.alpaca = alpaca
-        self.iv_service = iv_service or IvRankService()
-
-    def generate_suggestions(self, universe: Iterable[str] | None = None) -> list[TradeSuggestion]:
-        symbols = list(universe or DEFAULT_ETF_UNIVERSE)
-        suggestions: list[TradeSuggestion] = []
-
-        for symbol in symbols:
-            history = self.alpaca.get_price_history(symbol, days=260)
-            history_list = list(history) if history else []
-            if not history_list:
-                continue
-
-            if not _liquid_underlying(history_list):
-                continue
-
-            iv_result = self.iv_service.get_iv_rank(symbol, self.alpaca)
-            if iv_result.iv_rank is None or iv_result.iv_rank < 30:
-                continue
-
-            trend = _compute_trend(history_list)
-            if not (trend.above_50_and_rising or trend.above_20_and_50 or trend.higher_lows):
-                continue
-
-            support = _find_support(history_list)
-            if support is None:
+        self.iv_service = iv_service or IvRankService(cache=getattr(alpaca, "cache", None))
+        self.max_workers = max_workers
+        self.feature_cache = feature_cache if feature_cache is not None else shared_feature_cache()
+        self.expiration_service = expiration_service or ExpirationService(alpaca)
+        self.strike_band = strike_band
+        self.universe_index = universe_index
+        self._results: dict[str, tuple[Hashable, list[TradeSuggestion]]] = {}
+        self._results_lock = threading.Lock()
+
+    def invalidate(self, symbol: str | None = None) -> None:
+        with self._results_lock:
+            if symbol is None:
+                self._results.clear()
+            else:
+                self._results.pop(symbol, None)
+
+    def generate_suggestions(
+        self,
+        universe: Iterable[str] | None = None,
+        max_workers: int | None = None,
+    ) -> list[TradeSuggestion]:
+        top = TopSuggestions()
+        for index, suggestions in self._scan_completed(universe, max_workers):
+            # Ranking by universe position keeps ties identical to the serial scan.
+            for suggestion in suggestions:
+                top.push(suggestion, rank=index)
+        return top.items()
+
+    def generate_suggestions_iter(
+        self,
+        universe: Iterable[str] | None = None,
+        max_workers: int | None = None,
+    ) -> Iterator[tuple[int, TradeSuggestion]]:
+        # Yields each suggestion with its symbol's universe position, the rank
+        # TopSuggestions needs to break ties the way generate_suggestions does.
+        for index, suggestions in self._scan_completed(universe, max_workers):
+            for suggestion in suggestions:
+                yield index, suggestion
+
+    def _scan_completed(
+        self,
+        universe: Iterable[str] | None,
+        max_workers: int | None,
+    ) -> Iterator[tuple[int, list[TradeSuggestion]]]:
+        symbols = self._prefilter(list(universe or DEFAULT_ETF_UNIVERSE))
+        workers = min(max_workers or self.max_workers, len(symbols))
+
+        if workers <= 1:
+            for index, symbol in enumerate(symbols):
+                yield index, self._scan_symbol_safe(symbol)
+            return
+
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scan")
+        try:
+            futures = {
+                pool.submit(self._scan_symbol_safe, symbol): index
+                for index, symbol in enumerate(symbols)
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # A consumer that stops early should not wait on the rest of the universe.
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def generate_suggestions_async(
+        self,
+        universe: Iterable[str] | None = None,
+        client: AsyncAlpacaClient | None = None,
+    ) -> list[TradeSuggestion]:
+        async_client = client or AsyncAlpacaClient(self.alpaca)
+        symbols = await async_client.run(self._prefilter, list(universe or DEFAULT_ETF_UNIVERSE))
+        results = await asyncio.gather(
+            *(self._scan_symbol_async(async_client, symbol) for symbol in symbols),
+            return_exceptions=True,
+        )
+        top = TopSuggestions()
+        for index, (symbol, result) in enumerate(zip(symbols, results)):
+            if isinstance(result, BaseException):
+                # Cancellation, KeyboardInterrupt and SystemExit must propagate.
+                if not isinstance(result, Exception):
+                    raise result
+                logger.warning("Failed to scan %s: %s", symbol, result)
                 continue
-
-            expirations = _select_expirations(history_list)
-            for expiration in expirations:
-                chain = self.alpaca.get_option_chain(symbol, expiration, option_type="put")
-                if not chain:
-                    continue
-
-                suggestion = _select_spread(chain, support)
-                if suggestion is None:
-                    continue
-
-                short_strike, long_strike, credit = suggestion
-                trend_score = int(trend.above_50_and_rising) + int(trend.above_20_and_50) + int(trend.higher_lows)
-                risk_label = _risk_label(
-                    support=support,
-                    short_strike=short_strike,
-                    trend_score=trend_score,
-                    iv_rank=iv_result.iv_rank,
-                    spread_width=short_strike - long_strike,
-                    credit=credit,
+            for suggestion in result:
+                top.push(suggestion, rank=index)
+        return top.items()
+
+    def _prefilter(self, symbols: list[str]) -> list[str]:
+        # The index is refreshed in bulk once a day, so most of a large universe is
+        # dropped here without any per-symbol request.
+        if self.universe_index is None:
+            return symbols
+        return self.universe_index.prefilter(
+            symbols, self.alpaca, self.iv_service, self.feature_cache.get_or_build
+        )
+
+    def _features(
+        self, symbol: str, history: Optional[Sequence[dict[str, object]]]
+    ) -> Optional[SymbolFeatures]:
+        history_list = list(history) if history else []
+        if not history_list:
+            return None
+        features = self.feature_cache.get_or_build(symbol, history_list)
+        return features if features.liquid else None
+
+    def _fingerprint(
+        self,
+        alpaca: Any,
+        symbol: str,
+        features: SymbolFeatures,
+        screen: _SymbolScreen,
+        expirations: Sequence[str],
+    ) -> Optional[Hashable]:
+        # A symbol's suggestions depend only on its bars, IV rank and chains. Chain
+        # snapshots carry a version that changes on every fetch; without one for
+        # every expiration there is nothing safe to compare against.
+        if not hasattr(alpaca, "chain_version"):
+            return None
+        versions = tuple(
+            alpaca.chain_version(symbol, expiration, "put") for expiration in expirations
+        )
+        if None in versions:
+            return None
+        return (
+            features.last_date,
+            features.indicators.last_close,
+            screen.iv_rank,
+            tuple(expirations),
+            versions,
+            self.strike_band,
+        )
+
+    def _reuse(
+        self, symbol: str, fingerprint: Optional[Hashable]
+    ) -> Optional[list[TradeSuggestion]]:
+        if fingerprint is None:
+            return None
+        with self._results_lock:
+            stored = self._results.get(symbol)
+        if stored is None or stored[0] != fingerprint:
+            return None
+        return list(stored[1])
+
+    def _remember(
+        self,
+        symbol: str,
+        fingerprint: Optional[Hashable],
+        suggestions: list[TradeSuggestion],
+    ) -> list[TradeSuggestion]:
+        with self._results_lock:
+            if fingerprint is None:
+                self._results.pop(symbol, None)
+            else:
+                self._results[symbol] = (fingerprint, list(suggestions))
+        return suggestions
+
+    def _chain_options(self, screen: _SymbolScreen) -> dict[str, Any]:
+        # Without a band the whole put chain is fetched, which any client supports.
+        if self.strike_band is None:
+            return {}
+        return {"strikes": search_window(screen.support, self.strike_band)}
+
+    def _scan_symbol_safe(self, symbol: str) -> list[TradeSuggestion]:
+        try:
+            return self._scan_symbol(symbol)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed to scan %s: %s", symbol, exc)
+            return []
+
+    def _scan_symbol(self, symbol: str) -> list[TradeSuggestion]:
+        history = self.alpaca.get_price_history(symbol, days=260)
+        features = self._features(symbol, history)
+        if features is None:
+            return []
+
+        iv_result = self.iv_service.get_iv_rank(symbol, self.alpaca)
+        screen = _screen_symbol(features, iv_result)
+        if screen is None:
+            return []
+
+        expirations = self.expiration_service.select(symbol)
+        if not expirations:
+            return []
+        reused = self._reuse(
+            symbol, self._fingerprint(self.alpaca, symbol, features, screen, expirations)
+        )
+        if reused is not None:
+            return reused
+
+        options = self._chain_options(screen)
+        if hasattr(self.alpaca, "get_option_chains"):
+            chains = self.alpaca.get_option_chains(
+                symbol, expirations, option_type="put", **options
+            )
+        else:
+            chains = {
+                expiration: self.alpaca.get_option_chain(
+                    symbol, expiration, option_type="put", **options
                 )
-                reasoning = _build_reasoning(trend, support, iv_result.iv_rank, credit, short_strike)
-
-                suggestions.append(
-                    TradeSuggestion(
-                        symbol=symbol,
-                        expiration=expiration,
-                        short_strike=short_strike,
-                        long_strike=long_strike,
-                        credit=credit,
-                        support_level=support,
-                        trend_score=trend_score,
-                        risk_label=risk_label,
-                        reasoning=reasoning,
-                    )
+                for expiration in expirations
+            }
+        return self._remember(
+            symbol,
+            self._fingerprint(self.alpaca, symbol, features, screen, expirations),
+            _build_suggestions(symbol, screen, chains.items()),
+        )
+
+    async def _scan_symbol_async(
+        self, client: AsyncAlpacaClient, symbol: str
+    ) -> list[TradeSuggestion]:
+        history = await client.get_price_history(symbol, days=260)
+        features = self._features(symbol, history)
+        if features is None:
+            return []
+
+        iv_result = await client.run(self.iv_service.get_iv_rank, symbol, client.sync_client)
+        screen = _screen_symbol(features, iv_result)
+        if screen is None:
+            return []
+
+        expirations = await client.run(self.expiration_service.select, symbol)
+        if not expirations:
+            return []
+        sync_client = client.sync_client
+        reused = self._reuse(
+            symbol, self._fingerprint(sync_client, symbol, features, screen, expirations)
+        )
+        if reused is not None:
+            return reused
+
+        options = self._chain_options(screen)
+        if hasattr(sync_client, "get_option_chains"):
+            chains = await client.get_option_chains(
+                symbol, expirations, option_type="put", **options
+            )
+            suggestions = _build_suggestions(symbol, screen, chains.items())
+        else:
+            fetched = await asyncio.gather(
+                *(
+                    client.get_option_chain(symbol, expiration, option_type="put", **options)
+                    for expiration in expirations
                 )
+            )
+            suggestions = _build_suggestions(symbol, screen, zip(expirations, fetched))
+        return self._remember(
+            symbol,
+            self._fingerprint(sync_client, symbol, features, screen, expirations),
+            suggestions,
+        )
 
-        suggestions.sort(key=lambda s: _risk_score(s))
-        return suggestions[:5]
-
-
-def _liquid_underlying(history: Sequence[dict[str, object]]) -> bool:
-    if len(history) < 20:
-        return False
-    volumes = [_to_float(bar.get("volume")) or 0.0 for bar in history[-20:]]
-    avg_volume = sum(volumes) / 20
-    return avg_volume >= 1_000_000
-
-
-def _compute_trend(history: Sequence[dict[str, object]]) -> TrendSignals:
-    raw_closes = [_to_float(bar.get("close")) for bar in history]
-    closes: list[float] = [value for value in raw_closes if value is not None]
-    if len(closes) < 50:
-        return TrendSignals(False, False, False)
-
-    ma20 = sum(closes[-20:]) / 20
-    ma50 = sum(closes[-50:]) / 50
-    above_20_and_50 = closes[-1] > ma20 and closes[-1] > ma50
-
-    ma50_prev = sum(closes[-55:-5]) / 50 if len(closes) >= 55 else ma50
-    above_50_and_rising = closes[-1] > ma50 and ma50 > ma50_prev
 
-    recent_lows = closes[-4:]
-    higher_lows = recent_lows == sorted(recent_lows)
-
-    return TrendSignals(above_50_and_rising, above_20_and_50, higher_lows)
-
-
-def _find_support(history: Sequence[dict[str, object]]) -> Optional[float]:
-    raw_closes = [_to_float(bar.get("close")) for bar in history]
-    closes: list[float] = [value for value in raw_closes if value is not None]
-    if len(closes) < 50:
+def _screen_symbol(features: SymbolFeatures, iv_result: IvRankResult) -> Optional[_SymbolScreen]:
+    if iv_result.iv_rank is None or iv_result.iv_rank < 30:
         return None
 
-    ma50 = sum(closes[-50:]) / 50
-    ma100 = sum(closes[-100:]) / 100 if len(closes) >= 100 else None
-    ma200 = sum(closes[-200:]) / 200 if len(closes) >= 200 else None
-    recent_low = min(closes[-20:])
-
-    candidates = [ma for ma in [ma50, ma100, ma200] if ma is not None]
-    support = min(candidates, key=lambda ma: abs(ma - recent_low), default=None)
-    if support is None:
+    if not features.trend.any:
         return None
 
-    volume = _to_float(history[-1].get("volume")) or 0.0
-    avg_volume = sum((_to_float(bar.get("volume")) or 0.0) for bar in history[-20:]) / 20
-    if volume < avg_volume * 1.2:
+    if features.support is None:
         return None
 
-    return support
-
-
-def _select_expirations(history: Sequence[dict[str, object]]) -> list[str]:
-    # Placeholder: assume the most recent bar date is today and target 30-45 DTE
-    today = _parse_history_date(history[-1].get("date")) or date.today()
-    return [(today.replace(day=1) + _days(35)).isoformat()]
-
-
-def _select_spread(chain: list[OptionContract], support: float) -> Optional[tuple[float, float, float]]:
-    chain = [c for c in chain if c.option_type.lower() == "put"]
-    chain.sort(key=lambda c: c.strike)
+    return _SymbolScreen(
+        trend=features.trend,
+        support=features.support,
+        iv_rank=iv_result.iv_rank,
+    )
 
-    for width in (5.0, 10.0):
-        for contract in chain:
-            if contract.strike >= support:
-                continue
-            short_strike = contract.strike
-            long_strike = short_strike - width
-            long_contract = next((c for c in chain if c.strike == long_strike), None)
-            if not long_contract:
-                continue
-            short_mid = get_mid_price(contract.bid, contract.ask) or contract.last
-            long_mid = get_mid_price(long_contract.bid, long_contract.ask) or long_contract.last
-            if short_mid is None or long_mid is None:
-                continue
-            credit = short_mid - long_mid
-            if credit <= width / 3:
-                continue
-            if contract.bid is not None and contract.ask is not None:
-                if round(contract.ask - contract.bid, 2) > 0.10:
-                    continue
-            if contract.open_interest is not None and contract.open_interest < 500:
-                continue
-            return short_strike, long_strike, credit
 
-    return None
+def _build_suggestions(
+    symbol: str,
+    screen: _SymbolScreen,
+    chains: Iterable[tuple[str, Optional[OptionChain | Sequence[OptionContract]]]],
+) -> list[TradeSuggestion]:
+    suggestions: list[TradeSuggestion] = []
+    trend = screen.trend
+    for expiration, chain in chains:
+        if not chain:
+            continue
+
+        suggestion = _select_spread(chain, screen.support)
+        if suggestion is None:
+            continue
+
+        short_strike, long_strike, credit = suggestion
+        trend_score = trend.score
+        risk_label = _risk_label(
+            support=screen.support,
+            short_strike=short_strike,
+            trend_score=trend_score,
+            iv_rank=screen.iv_rank,
+            spread_width=short_strike - long_strike,
+            credit=credit,
+        )
+        reasoning = _build_reasoning(trend, screen.support, screen.iv_rank, credit, short_strike)
+
+        suggestions.append(
+            TradeSuggestion(
+                symbol=symbol,
+                expiration=expiration,
+                short_strike=short_strike,
+                long_strike=long_strike,
+                credit=credit,
+                support_level=screen.support,
+                trend_score=trend_score,
+                risk_label=risk_label,
+                reasoning=reasoning,
+            )
+        )
+    return suggestions
+
+
+def _select_spread(
+    chain: OptionChain | Sequence[OptionContract], support: float
+) -> Optional[tuple[float, float, float]]:
+    best = search_spreads(chain, support, top_k=1)
+    if not best:
+        return None
+    return best[0].short_strike, best[0].long_strike, best[0].credit
 
 
 def _risk_label(
@@ -255,33 +483,3 @@ def _build_reasoning(
         f"Support near {support:.2f}; {trend_text}; IV Rank {iv_rank:.1f}; "
         f"credit {credit:.2f} for short strike {short_strike:.2f}"
     )
-
-
-def _parse_history_date(value: object) -> Optional[date]:
-    if isinstance(value, date):
-        return value
-    if isinstance(value, str):
-        try:
-            return datetime.fromisoformat(value).date()
-        except ValueError:
-            return None
-    return None
-
-
-def _days(count: int):
-    from datetime import timedelta
-
-    return timedelta(days=count)
-
-
-def _to_float(value: object) -> Optional[float]:
-    if value is None:
-        return None
-    if isinstance(value, (int, float)):
-        return float(value)
-    if isinstance(value, str):
-        try:
-            return float(value)
-        except ValueError:
-            return None
-    return None
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+from credit_spread_system.config import MIN_IV_RANK, load_config
+from credit_spread_system.features import SymbolFeatures
+
+logger = logging.getLogger(__name__)
+
+HISTORY_DAYS = 260
+# IV rank moves intraday, so yesterday's value only rules out symbols well below
+# the screen's threshold.
+IV_RANK_SLACK = 10.0
+
+FeatureBuilder = Callable[[str, list], SymbolFeatures]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS universe (
+    symbol TEXT PRIMARY KEY,
+    as_of TEXT NOT NULL,
+    avg_volume REAL,
+    last_close REAL,
+    iv_rank REAL,
+    liquid INTEGER NOT NULL,
+    above_50_and_rising INTEGER NOT NULL,
+    above_20_and_50 INTEGER NOT NULL,
+    higher_lows INTEGER NOT NULL
+) WITHOUT ROWID
+"""
+
+
+@dataclass(frozen=True)
+class UniverseRow:
+    symbol: str
+    as_of: date
+    avg_volume: Optional[float]
+    last_close: Optional[float]
+    iv_rank: Optional[float]
+    liquid: bool
+    above_50_and_rising: bool
+    above_20_and_50: bool
+    higher_lows: bool
+
+    @property
+    def trending(self) -> bool:
+        return self.above_50_and_rising or self.above_20_and_50 or self.higher_lows
+
+    def passes(self, min_iv_rank: float = MIN_IV_RANK - IV_RANK_SLACK) -> bool:
+        # Unknown IV rank is kept: the full screen makes the final call.
+        if not (self.liquid and self.trending):
+            return False
+        return self.iv_rank is None or self.iv_rank >= min_iv_rank
+
+    @classmethod
+    def from_features(
+        cls, features: SymbolFeatures, as_of: date, iv_rank: Optional[float]
+    ) -> "UniverseRow":
+        trend = features.trend
+        return cls(
+            symbol=features.symbol,
+            as_of=as_of,
+            avg_volume=features.indicators.average_volume(),
+            last_close=features.indicators.last_close,
+            iv_rank=iv_rank,
+            liquid=features.liquid,
+            above_50_and_rising=trend.above_50_and_rising,
+            above_20_and_50=trend.above_20_and_50,
+            higher_lows=trend.higher_lows,
+        )
+
+
+class UniverseIndex:
+    def __init__(
+        self, path: str | Path = ":memory:", today: Callable[[], date] = date.today
+    ) -> None:
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._today = today
+        with self._lock, self._conn:
+            self._conn.execute(_SCHEMA)
+
+    @classmethod
+    def from_env(cls) -> "UniverseIndex":
+        config = load_config()
+        if not config.market_data_dir:
+            return cls()
+        return cls(os.path.join(config.market_data_dir, "universe_index.sqlite3"))
+
+    def upsert(self, rows: Iterable[UniverseRow]) -> int:
+        values = [
+            (
+                row.symbol,
+                row.as_of.isoformat(),
+                row.avg_volume,
+                row.last_close,
+                row.iv_rank,
+                int(row.liquid),
+                int(row.above_50_and_rising),
+                int(row.above_20_and_50),
+                int(row.higher_lows),
+            )
+            for row in rows
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO universe VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", values
+            )
+        return len(values)
+
+    def load(self, symbols: Iterable[str]) -> dict[str, UniverseRow]:
+        wanted = list(dict.fromkeys(symbols))
+        rows: dict[str, UniverseRow] = {}
+        with self._lock:
+            # Chunked to stay under SQLite's bound-parameter limit.
+            for start in range(0, len(wanted), 500):
+                chunk = wanted[start : start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                for record in self._conn.execute(
+                    f"SELECT * FROM universe WHERE symbol IN ({placeholders})", chunk
+                ):
+                    row = _row(record)
+                    rows[row.symbol] = row
+        return rows
+
+    def stale(self, symbols: Iterable[str], as_of: Optional[date] = None) -> list[str]:
+        current = as_of or self._today()
+        rows = self.load(symbols)
+        return [
+            symbol
+            for symbol in dict.fromkeys(symbols)
+            if symbol not in rows or rows[symbol].as_of < current
+        ]
+
+    def refresh(
+        self,
+        symbols: Sequence[str],
+        alpaca: Any,
+        iv_service: Any,
+        as_of: Optional[date] = None,
+        build: FeatureBuilder = SymbolFeatures.build,
+    ) -> int:
+        current = as_of or self._today()
+        histories = _load_histories(alpaca, symbols)
+        rows = []
+        for symbol in symbols:
+            history = histories.get(symbol)
+            if not history:
+                # Left stale so the next scan retries it.
+                continue
+            features = build(symbol, list(history))
+            iv_rank = None
+            if features.liquid and features.trend.any:
+                # Only survivors of the bar-based checks cost an IV lookup.
+                iv_rank = _iv_rank(iv_service, alpaca, symbol)
+            rows.append(UniverseRow.from_features(features, current, iv_rank))
+        return self.upsert(rows)
+
+    def prefilter(
+        self,
+        symbols: Sequence[str],
+        alpaca: Any,
+        iv_service: Any,
+        build: FeatureBuilder = SymbolFeatures.build,
+    ) -> list[str]:
+        current = self._today()
+        try:
+            with self._refresh_lock:
+                stale = self.stale(symbols, current)
+                if stale:
+                    self.refresh(stale, alpaca, iv_service, current, build)
+            rows = self.load(symbols)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Universe prefilter failed; scanning every symbol: %s", exc)
+            return list(symbols)
+        # Clients that swallow provider errors leave failed symbols unrefreshed, so
+        # judge those on their last known row and pass never-indexed ones through
+        # to the full screen.
+        outdated = [
+            symbol for symbol in symbols if symbol not in rows or rows[symbol].as_of < current
+        ]
+        if outdated:
+            logger.warning("Universe index has no current row for %d symbols", len(outdated))
+        return [symbol for symbol in symbols if symbol not in rows or rows[symbol].passes()]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT COUNT(*) FROM universe").fetchone()
+        return int(row[0])
+
+
+def _load_histories(alpaca: Any, symbols: Sequence[str]) -> dict[str, Any]:
+    if hasattr(alpaca, "get_price_histories"):
+        return alpaca.get_price_histories(symbols, days=HISTORY_DAYS)
+    return {symbol: alpaca.get_price_history(symbol, days=HISTORY_DAYS) for symbol in symbols}
+
+
+def _iv_rank(iv_service: Any, alpaca: Any, symbol: str) -> Optional[float]:
+    try:
+        return iv_service.get_iv_rank(symbol, alpaca).iv_rank
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Failed to compute IV rank for %s: %s", symbol, exc)
+        return None
+
+
+def _row(record: Sequence[Any]) -> UniverseRow:
+    return UniverseRow(
+        symbol=record[0],
+        as_of=date.fromisoformat(record[1]),
+        avg_volume=record[2],
+        last_close=record[3],
+        iv_rank=record[4],
+        liquid=bool(record[5]),
+        above_50_and_rising=bool(record[6]),
+        above_20_and_50=bool(record[7]),
+        higher_lows=bool(record[8]),
+    )